@@ -0,0 +1,352 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import platform
+import shutil
+import tempfile
+import subprocess
+
+####################################################
+#
+# SMALLEST L5X FILE WITH A SINGLE RUNG
+#
+###################################################
+one_rung_l5x = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<RSLogix5000Content SchemaRevision="1.0" SoftwareRevision="20.01">
+<Controller Name="Benchmark">
+<DataTypes>
+</DataTypes>
+<Tags>
+<Tag Name="A" TagType="Base" DataType="BOOL" Radix="Decimal">
+<Data Format="Decorated">
+<DataValue DataType="BOOL" Radix="Decimal" Value="0"/>
+</Data>
+</Tag>
+<Tag Name="B" TagType="Base" DataType="BOOL" Radix="Decimal">
+<Data Format="Decorated">
+<DataValue DataType="BOOL" Radix="Decimal" Value="0"/>
+</Data>
+</Tag>
+</Tags>
+<Programs>
+<Program Name="MainProgram">
+<Routines>
+<Routine Name="MainRoutine" Type="RLL">
+<RLLContent>
+<Rung Number="0" Type="N">
+<Text>
+<![CDATA[XIC(A)OTE(B);]]>
+</Text>
+</Rung>
+</RLLContent>
+</Routine>
+</Routines>
+</Program>
+</Programs>
+</Controller>
+</RSLogix5000Content>
+'''
+
+####################################################
+#
+# RUN A COMMAND SEVERAL TIMES
+# obs: returns the wall time of each run in ms
+###################################################
+def time_command(command, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return times
+
+####################################################
+#
+# SUMMARIZE A LIST OF TIMES
+#
+###################################################
+def summarize(times):
+    ordered = sorted(times)
+    return {
+        'runs': len(ordered),
+        'min_ms': ordered[0],
+        'median_ms': ordered[len(ordered) // 2],
+        'max_ms': ordered[-1],
+    }
+
+####################################################
+#
+# COLD START OF THE COMMAND LINE TOOL
+#
+###################################################
+def coldstart(repeat):
+    here = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(here, 'l5x2c.py')
+    results = {}
+    results['help'] = summarize(time_command([sys.executable, script, '--help'], repeat))
+    with tempfile.TemporaryDirectory() as tmp:
+        l5x = os.path.join(tmp, 'one_rung.L5X')
+        with open(l5x, 'w') as f:
+            f.write(one_rung_l5x)
+        command = [sys.executable, script, l5x, os.path.join(tmp, 'one_rung.c')]
+        results['one_rung'] = summarize(time_command(command, repeat))
+    return results
+
+####################################################
+#
+# STAGES OF THE TRANSLATION
+# obs: each stage runs in its own process, started
+#      with --stage, so its peak memory is not mixed
+#      with the other stages. The input of a stage is
+#      prepared before the clock starts. MB/s is over
+#      the L5X file for parse and stream and over the
+#      rung text for the others
+###################################################
+stages = ['parse', 'dict2c', 'stream', 'lexer', 'parser', 'fast_parser']
+
+def all_rungs(programs):
+    rungs = []
+    for program in programs.values():
+        for routine in program['routines'].values():
+            rungs += routine['rungs']
+    return rungs
+
+def run_stage(stage, filename):
+    import rungfast
+    from l5xparser import l5xparser
+    from rungyacc import get_translator
+    from l5x2c import dict2c
+    from l5x2c import stream2c
+    
+    translator = get_translator()
+    parameters = {'stack_size': 1000, 'scan_time': 100, 'codegen': 'stack'}
+    output = os.devnull
+    rungs = []
+    if stage == 'dict2c':
+        l5x_data = l5xparser().parse(filename)
+        rungs = all_rungs(l5x_data['programs'])
+    elif stage in ('lexer', 'parser', 'fast_parser'):
+        rungs = all_rungs(l5xparser().index_programs(filename))
+    
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if stage == 'parse':
+        rungs = all_rungs(l5xparser().parse(filename)['programs'])
+    elif stage == 'dict2c':
+        dict2c(l5x_data, output, parameters, translator)
+    elif stage == 'stream':
+        count = stream2c(l5xparser(), filename, output, parameters, translator)['rungs']
+    elif stage == 'lexer':
+        lexer = translator.lexer
+        for rung in rungs:
+            lexer.input(rung)
+            while lexer.token() is not None:
+                pass
+    elif stage == 'parser':
+        for rung in rungs:
+            translator.parser.parse(rung, lexer=translator.lexer)
+    elif stage == 'fast_parser':
+        for rung in rungs:
+            rungfast.parse(rung)
+    seconds = time.perf_counter() - start
+    
+    if stage in ('parse', 'stream'):
+        size = os.path.getsize(filename)
+    else:
+        size = sum(len(rung) for rung in rungs)
+    if stage == 'stream':
+        rungs = [None] * count
+    return {
+        'seconds': seconds,
+        'rungs': len(rungs),
+        'rungs_per_second': len(rungs) / seconds if seconds > 0 else 0.0,
+        'mb_per_second': size / 1e6 / seconds if seconds > 0 else 0.0,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'rss_growth_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+    }
+
+####################################################
+#
+# THROUGHPUT AND MEMORY OF EACH STAGE BY SIZE
+# obs: each size is a synthetic export generated by
+#      l5xgen.py with 4 programs of 10 routines
+###################################################
+def scaling(sizes, seed):
+    from l5xgen import L5XGenerator
+    here = os.path.dirname(os.path.abspath(__file__))
+    script = os.path.join(here, 'benchmark.py')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            l5x = os.path.join(tmp, 'synthetic_%d.L5X' % (size))
+            generator = L5XGenerator(seed, programs=4, routines=10,
+                                     rungs=max(1, size // 40), depth=2,
+                                     controller_tags=200, program_tags=20,
+                                     arrays=4, array_size=10000, udts=8)
+            with open(l5x, 'w') as f:
+                generator.write(f)
+            result = {'rungs': 40 * max(1, size // 40),
+                      'file_bytes': os.path.getsize(l5x), 'stages': {}}
+            for stage in stages:
+                command = [sys.executable, script, '--stage', stage, l5x]
+                output = subprocess.run(command, check=True, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL).stdout
+                result['stages'][stage] = json.loads(output)
+            os.remove(l5x)
+            results.append(result)
+    return results
+
+####################################################
+#
+# SIMULATION SPEED AND CBMC TIME OF EACH STACK MODEL
+# obs: the simulation is the scan harness of a
+#      synthetic export compiled with cc -O2. The
+#      CBMC time is the run of the testgen.py tests,
+#      one at a time and without the verdict cache
+###################################################
+def stack_models(scans, seed, cbmc, cc, timeout):
+    from l5xgen import L5XGenerator
+    from l5x2c import stack_models
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        l5x = os.path.join(tmp, 'synthetic.L5X')
+        generator = L5XGenerator(seed, programs=4, routines=10, rungs=10, depth=3,
+                                 controller_tags=200, program_tags=20)
+        with open(l5x, 'w') as f:
+            generator.write(f)
+        for model in sorted(stack_models):
+            result = {}
+            source = os.path.join(tmp, model + '.c')
+            program = os.path.join(tmp, model)
+            subprocess.run([sys.executable, os.path.join(here, 'l5x2c.py'), l5x, source,
+                            '--stack-model', model, '--emit-harness'], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run([cc, '-O2', '-w', '-o', program, source, '-lm'], check=True)
+            output = subprocess.run([program, '-n', str(scans)], check=True,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    universal_newlines=True).stderr
+            measures = {'scans/s': 'scans_per_second', 'ns/scan': 'ns_per_scan'}
+            for line in output.splitlines():
+                name, value = line.split(':')
+                if name in measures:
+                    result[measures[name]] = float(value)
+            
+            if shutil.which(cbmc) is not None:
+                report = os.path.join(tmp, model + '.json')
+                subprocess.run([sys.executable, os.path.join(here, 'testgen.py'),
+                                '--stack-model', model, '--run', '--no-cache', '-j', '1',
+                                '--cbmc', cbmc, '--timeout', str(timeout),
+                                '--report', report], cwd=tmp,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                with open(report, 'r') as f:
+                    tests = json.load(f)['results']
+                result['cbmc_seconds'] = sum(test['time'] for test in tests)
+                result['solver_seconds'] = sum(test['solver_time'] or 0 for test in tests)
+                result['verdicts'] = [test['verdict'] for test in tests]
+            results[model] = result
+    return results
+
+####################################################
+#
+# MAIN SCRIPT FOR COMMAND LINE EXECUTION
+#
+###################################################
+def main():
+    description = "Measures the performance of l5x2c"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-n', '--repeat', type=int, default=10,
+                            help="number of runs of each measurement")
+    parser.add_argument('-o', '--output',
+                            help="write the results to this JSON file")
+    parser.add_argument('--scaling', metavar='SIZES',
+                            help="comma separated numbers of rungs of the synthetic "
+                                 "exports used to measure each stage")
+    parser.add_argument('--seed', type=int, default=0,
+                            help="seed of the synthetic exports")
+    parser.add_argument('--stack-models', action='store_true',
+                            help="compare the simulation speed and CBMC time of the "
+                                 "stack models")
+    parser.add_argument('--scans', type=int, default=100000,
+                            help="number of scans of the simulation with --stack-models")
+    parser.add_argument('--cbmc', default='cbmc',
+                            help="cbmc executable used with --stack-models")
+    parser.add_argument('--timeout', type=float, default=600,
+                            help="time limit of each cbmc run with --stack-models")
+    parser.add_argument('--cc', default='cc',
+                            help="C compiler used with --stack-models")
+    parser.add_argument('--stage', nargs=2, metavar=('STAGE', 'L5X'),
+                            help=argparse.SUPPRESS)
+    
+    args = vars(parser.parse_args())
+    if args['stage']:
+        print(json.dumps(run_stage(*args['stage'])))
+        return
+    
+    from rungyacc import translator_version
+    results = {
+        'version': translator_version,
+        'python': platform.python_version(),
+        'coldstart': coldstart(args['repeat']),
+    }
+    
+    for name, result in results['coldstart'].items():
+        print('coldstart %-10s min %8.1f ms   median %8.1f ms' %
+              (name, result['min_ms'], result['median_ms']))
+    
+    if args['scaling']:
+        sizes = [int(size) for size in args['scaling'].split(',')]
+        results['scaling'] = scaling(sizes, args['seed'])
+        for result in results['scaling']:
+            for stage, measure in result['stages'].items():
+                print('%8d rungs %-12s %10.0f rungs/s %8.2f MB/s %10d KB peak' %
+                      (result['rungs'], stage, measure['rungs_per_second'],
+                       measure['mb_per_second'], measure['peak_rss_kb']))
+    
+    if args['stack_models']:
+        results['stack_models'] = stack_models(args['scans'], args['seed'],
+                                               args['cbmc'], args['cc'], args['timeout'])
+        for model, result in results['stack_models'].items():
+            line = 'stack %-6s %10.1f ns/scan' % (model, result['ns_per_scan'])
+            if 'cbmc_seconds' in result:
+                line += ' %8.2f s cbmc %8.2f s solver' % (result['cbmc_seconds'],
+                                                         result['solver_seconds'])
+            print(line)
+    
+    if args['output']:
+        with open(args['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+    
+if __name__== "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import re
+import time
+import signal
+import subprocess
+import multiprocessing
+
+####################################################
+#
+# VERDICTS OF CBMC
+# obs: cbmc returns 0 when every property holds and
+#      10 when one of them fails. Anything else is an
+#      error of the harness or of cbmc itself
+###################################################
+verdicts = {0: 'pass', 10: 'fail'}
+
+solver_time_re = re.compile(r'Runtime (?:decision procedure|Solver): ([0-9.]+)s')
+
+####################################################
+#
+# COMMAND LINE OF CBMC FOR ONE HARNESS
+# obs: without an unwind bound cbmc unrolls the loops
+#      until their bounds are known
+###################################################
+def cbmc_command(cbmc, path, unwind=None):
+    command = [cbmc, path]
+    if unwind is not None:
+        command += ['--unwind', str(unwind), '--unwinding-assertions']
+    return command
+
+####################################################
+#
+# VERSION STRING OF CBMC
+# obs: part of the key of the cached verdicts
+###################################################
+def cbmc_version(cbmc):
+    try:
+        process = subprocess.run([cbmc, '--version'], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, universal_newlines=True)
+    except OSError:
+        return 'unknown'
+    return process.stdout.strip()
+
+####################################################
+#
+# KILL A CBMC RUN AND ITS CHILDREN
+# obs: cbmc runs in a session of its own, so the
+#      processes started by a wrapper script are
+#      killed with it
+###################################################
+def kill_session(process):
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    process.kill()
+
+####################################################
+#
+# VERIFY ONE HARNESS
+# obs: the counterexample of a failed harness is
+#      kept as its trace
+###################################################
+def run_cbmc(task):
+    name, command, timeout = task
+    start = time.perf_counter()
+    result = {'test': name, 'command': command, 'solver_time': None, 'trace': None}
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   universal_newlines=True, start_new_session=True)
+    except OSError as e:
+        result['verdict'] = 'error'
+        result['trace'] = str(e)
+        result['time'] = time.perf_counter() - start
+        return result
+    try:
+        output = process.communicate(timeout=timeout)[0]
+    except subprocess.TimeoutExpired:
+        kill_session(process)
+        process.communicate()
+        result['verdict'] = 'timeout'
+    else:
+        result['verdict'] = verdicts.get(process.returncode, 'error')
+        times = solver_time_re.findall(output)
+        if times:
+            result['solver_time'] = sum(float(t) for t in times)
+        if result['verdict'] != 'pass':
+            result['trace'] = output
+    result['time'] = time.perf_counter() - start
+    return result
+
+####################################################
+#
+# VERIFY THE HARNESSES ON A PROCESS POOL
+# obs: tasks are (name, command, timeout) and the
+#      results are returned in the order of the tasks
+###################################################
+def run_harnesses(tasks, jobs=1):
+    if jobs > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+            return pool.map(run_cbmc, tasks, chunksize=1)
+    return [run_cbmc(task) for task in tasks]
+
+####################################################
+#
+# REPORT OF A VERIFICATION RUN
+#
+###################################################
+def verification_summary(results, wall):
+    lines = ['%-12s %-8s %9s %9s' % ('test', 'verdict', 'time', 'solver')]
+    for result in results:
+        solver = result['solver_time']
+        lines.append('%-12s %-8s %9s %9s' % (
+            result['test'], result['verdict'],
+            'cached' if result.get('cached') else '%.2fs' % (result['time']),
+            '-' if solver is None else '%.2fs' % (solver)))
+    counts = {}
+    for result in results:
+        counts[result['verdict']] = counts.get(result['verdict'], 0) + 1
+    lines.append('%d tests in %.2fs: %s' % (len(results), wall,
+                 ', '.join('%d %s' % (counts[v], v) for v in sorted(counts))))
+    return '\n'.join(lines)
@@ -26,14 +26,40 @@
 #    https://github.com/alairjunior/l5x2c
 #
 ################################################################################
+import io
+import os
 import sys
+import re
+import json
+import hashlib
 import logging
+import itertools
+import glob
+import time
+import tempfile
 import argparse
+import multiprocessing
 import traceback
+from array import array
 from string import Template
-from runglex import runglex
-from rungyacc import rungyacc
+from rungyacc import get_translator
+from rungyacc import translator_version
+from rungyacc import codegens
+from rungcache import RungCache
+from manifest import Manifest
+from manifest import digest_text
+from profiler import Profiler
+from profiler import ProfiledTranslator
 from l5xparser import l5xparser
+from l5xparser import L5XProject
+from l5xparser import SelectionError
+from tagmodel import ValueNode
+from tagmodel import StructNode
+from tagmodel import ArrayNode
+from tagmodel import format_value
+from tagmodel import update_digest
+from typegraph import TypeGraph
+from tagimage import TagImage
 
 ####################################################
 #
@@ -49,8 +75,8 @@ datatype_translation_lut = {
     'REAL'   : 'float',
     'LINT'   : 'int64_t',
     'USINT'  : 'uint8_t',
-    'UINT'   : 'unt16_t',
-    'UDINT'  : 'unt32_t',
+    'UINT'   : 'uint16_t',
+    'UDINT'  : 'uint32_t',
     'LREAL'  : 'double',
     'ULINT'  : 'uint64_t',
     'TIMER'  : 'timer',
@@ -60,14 +86,86 @@ datatype_translation_lut = {
 
 ####################################################
 #
-# ADD TEMPLATES TO THE GENERATED FILE
+# TEMPLATES ARE READ FROM THE DIRECTORY OF THIS FILE
+#
+###################################################
+template_dir = os.path.dirname(os.path.abspath(__file__))
+
+####################################################
+#
+# READ A TEMPLATE
+# obs: templates are read once per process
+###################################################
+templates = {}
+
+def read_template(name):
+    if name not in templates:
+        with open(os.path.join(template_dir, name), 'r') as t:
+            templates[name] = t.read()
+    return templates[name]
+
+####################################################
 #
+# TEMPLATES OF THE STACK MACHINE
+# obs: the stack is an array of bool or a register
+#      of bits with inline functions. The register
+#      holds 63 rails in each of its words, so the
+#      bit stack is 63 rails deep by default
+###################################################
+stack_models = {
+    'array': 'stackmachine.template',
+    'bits': 'stackbits.template',
+}
+
+stack_sizes = {
+    'array': 1000,
+    'bits': 63,
+}
+
+####################################################
+#
+# SHIFTS OF THE BIT STACK
+# obs: every word is shifted on each push and pop,
+#      without branches, so the compiler can follow
+#      the rails of a rung. The sentinel bit leaves
+#      the last word, through overflow, when more
+#      than 64 * words - 1 rails are pushed
+###################################################
+def stack_words(stack_size):
+    return stack_size // 64 + 1
+
+def bit_stack(stack_size):
+    words = stack_words(stack_size)
+    push = ['    overflow |= stack[%d];' % (words - 1)]
+    for i in range(words - 1, 0, -1):
+        push.append('    stack[%d] = (stack[%d] << 1) | (stack[%d] >> 63);' % (i, i, i - 1))
+    push.append('    stack[0] = (stack[0] << 1) | x;')
+    pop = []
+    for i in range(words - 1):
+        pop.append('    stack[%d] = (stack[%d] >> 1) | (stack[%d] << 63);' % (i, i, i + 1))
+    pop.append('    stack[%d] >>= 1;' % (words - 1))
+    clear = ['    stack[0] = 1;'] + ['    stack[%d] = 0;' % (i) for i in range(1, words)]
+    return {
+        'stack_words': words,
+        'stack_push': '\n'.join(push),
+        'stack_pop': '\n'.join(pop),
+        'stack_clear': '\n'.join(clear),
+    }
+
+####################################################
+#
+# ADD TEMPLATES TO THE GENERATED FILE
+# obs: the stack machine is only needed by the
+#      stack code generator
 ###################################################
 def addTemplates(f, parameters):
-    with open('plcmodel.template', 'r') as t:
-        text = t.read()
-        template = Template(text)
-        f.write(template.substitute(parameters))
+    stack_machine = ''
+    if parameters.get('codegen', 'stack') == 'stack':
+        name = stack_models[parameters.get('stack_model', 'array')]
+        stack_machine = Template(read_template(name)).substitute(
+            parameters, **bit_stack(parameters['stack_size']))
+    template = Template(read_template('plcmodel.template'))
+    f.write(template.substitute(parameters, stack_machine=stack_machine))
 
 
 
@@ -80,12 +178,13 @@ def addDataType(f, name, datatype):
     if name not in datatype_translation_lut:
         f.write('\n/* DataType %s  */\n' % (name))
         f.write('typedef struct %s_t {\n' % (name))
-        for field in datatype['members']:
-            typename = datatype['members'][field]['type']
+        members = datatype.get('members', {})
+        for field in members:
+            typename = members[field]['type']
             dimension = 0
-            if 'dimension' in datatype['members'][field]:
-                dimension = int(datatype['members'][field]['dimension'])
-            field_type = datatype_translation_lut.get(typename, typename)
+            if members[field].get('dimension'):
+                dimension = int(members[field]['dimension'])
+            field_type = datatype_translation_lut.get(typename, typename + '_t')
             if dimension > 0:
                 f.write('\t%s %s[%d];\n' % (field_type, field, dimension))
             else:
@@ -95,7 +194,7 @@ def addDataType(f, name, datatype):
 ####################################################
 #
 # ADD DATATYPES TO THE GENERATED FILE
-#
+# obs: each type is written after the types it uses
 ###################################################
 def addDataTypes(f, datatypes):
     
@@ -103,119 +202,1015 @@ def addDataTypes(f, datatypes):
     f.write('*                DataType Definitions              *\n')
     f.write('***************************************************/\n')
     
-    unprocessed = list(datatypes.keys())
-    while len(unprocessed) > 0:
-        for name in unprocessed:
-            datatype = datatypes[name]
-            can_process = True
-            if 'dependencies' in datatype:
-                for dependency in datatype['dependencies']:
-                    if dependency in unprocessed:
-                        can_process = False
-                        break
-            if can_process:
-                addDataType(f, name, datatype)
-                unprocessed.remove(name)
-                break
+    graph = TypeGraph(datatypes, datatype_translation_lut)
+    for name in graph.order():
+        addDataType(f, name, datatypes[name])
 
 ####################################################
 #
 # GET INITIAL VALUE STRING
-#
+# obs: members and elements with the default value
+#      are left to the zero initialization of C, so
+#      a tag that is all zeros has no initializer
 ###################################################
 def get_initial_value(node):
-    if node['type'] == 'value':
-        return '=' + node['data']['data']
-    elif node['type'] == 'array':
-        result = " = { " 
-        for index in node['data']['data']:
-            ending = ', ' if int(index) != int(node['data']['dimensions']) - 1 else ''
-            result += get_initial_value(node['data']['data'][index]).replace('=','',1) + ending
-        return result + " }"
-    elif node['type'] == 'struct':
-        result = " = { "
+    if is_default(node):
+        return ''
+    if isinstance(node, ValueNode):
+        return '=' + format_value(node.type, node.value)
+    parts = [' = ']
+    write_initializer(parts, node)
+    return ''.join(parts)
+
+####################################################
+#
+# TRUE IF A NODE HOLDS ONLY ZEROS
+#
+###################################################
+def is_default(node):
+    if node is None:
+        return True
+    elif isinstance(node, ValueNode):
+        return not isinstance(node.value, str) and node.value == 0
+    elif isinstance(node, ArrayNode):
+        if isinstance(node.elements, array):
+            return not any(node.elements)
+        return all(is_default(element) for element in node.elements)
+    elif isinstance(node, StructNode):
+        return all(is_default(member) for member in node.members.values())
+    else:
+        logging.error("Undefined Tag major type: %s" %(type(node).__name__))
+        raise Exception("Undefined Tag major type: %s" %(type(node).__name__))
+
+####################################################
+#
+# WRITE THE INITIALIZER OF A NODE TO A LIST
+# obs: the parts are joined once, so the time is
+#      linear in the size of the initializer
+###################################################
+def write_initializer(parts, node):
+    if isinstance(node, ValueNode):
+        parts.append(format_value(node.type, node.value))
+    elif isinstance(node, ArrayNode):
+        write_array_initializer(parts, node)
+    elif isinstance(node, StructNode):
+        parts.append('{ ')
         ending = '.'
-        for field in node['data']['data']:
-            result += (ending + field + get_initial_value(node['data']['data'][field]))
+        for field in node.members:
+            member = node.members[field]
+            if is_default(member):
+                continue
+            parts.append(ending + field)
+            parts.append('=' if isinstance(member, ValueNode) else ' = ')
+            write_initializer(parts, member)
             ending = ', .'
-        return result + ' }'
+        parts.append(' }')
     else:
-        logging.error("Undefined Tag major type: %s" %(node['type']))
-        raise Exception("Undefined Tag major type: %s" %(node['type']))
+        logging.error("Undefined Tag major type: %s" %(type(node).__name__))
+        raise Exception("Undefined Tag major type: %s" %(type(node).__name__))
+
+####################################################
+#
+# WRITE THE INITIALIZER OF AN ARRAY
+# obs: runs of equal elements are found row by row.
+#      Default runs are skipped, long runs use GNU C
+#      index ranges ([a ... b] = v) and the others
+#      continue from the previous element, which
+#      needs a designator after a gap or a range
+###################################################
+min_range = 4
+
+def write_array_initializer(parts, node):
+    dimensions = node.dimensions or (len(node.elements),)
+    row_length = dimensions[-1]
+    elements = node.elements
+    atomic = isinstance(elements, array)
+    parts.append('{ ')
+    separator = ''
+    expected = 0 if len(dimensions) == 1 else None
+    for row in range(0, len(elements), row_length):
+        position = row
+        for value, run in itertools.groupby(elements[row:row + row_length]):
+            first = position
+            position += sum(1 for _ in run)
+            if (value == 0) if atomic else is_default(value):
+                continue
+            if atomic:
+                text = format_value(node.type, value)
+            else:
+                element = []
+                write_initializer(element, value)
+                text = ''.join(element)
+            if position - first >= min_range:
+                parts.append('%s%s = %s' % (separator, designator(dimensions, first, position - 1), text))
+                separator = ', '
+                expected = None
+                continue
+            for index in range(first, position):
+                if index == expected:
+                    parts.append(separator + text)
+                else:
+                    parts.append('%s%s = %s' % (separator, designator(dimensions, index), text))
+                separator = ', '
+                expected = index + 1
+        if len(dimensions) > 1:
+            expected = None
+    parts.append(' }')
+
+####################################################
+#
+# DESIGNATOR OF AN ARRAY ELEMENT
+# obs: last makes a range in the last dimension
+###################################################
+def designator(dimensions, first, last=None):
+    subscripts = []
+    for size in reversed(dimensions):
+        subscripts.insert(0, first % size)
+        first //= size
+    text = ''.join('[%d]' % (subscript) for subscript in subscripts[:-1])
+    if last is None:
+        return text + '[%d]' % (subscripts[-1])
+    return text + '[%d ... %d]' % (subscripts[-1], last % dimensions[-1])
 
 ####################################################
 #
 # ADD TAGS TO THE GENERATED FILE
 #
 ###################################################
-def addTags(f, tags):
+def addTags(f, tags, image=None):
     if len(tags) == 0: return
     
+    addTagsHeader(f)
+    for tag in tags:
+        addTag(f, tag, tags[tag], image)
+
+def addTagsHeader(f):
     f.write('\n/***************************************************\n')
     f.write('*                 Tags Definitions                 *\n')
     f.write('***************************************************/\n')
-    
-    for tag in tags:
-        content = tags[tag]
-        datatype = content['data']['type']
-        typename = datatype_translation_lut.get(datatype, datatype + '_t')
-        f.write('%s %s%s;\n\n' % (typename, tag, get_initial_value(content)))
+
+def addTag(f, tag, content, image=None):
+    if image is not None:
+        image.add(tag, content)
+        initial_value = ''
+    else:
+        initial_value = get_initial_value(content)
+    f.write('%s%s;\n\n' % (tag_declaration(tag, content), initial_value))
+
+def tag_declaration(tag, content):
+    datatype = content.type
+    typename = datatype_translation_lut.get(datatype, datatype + '_t')
+    dimensions = ''
+    if isinstance(content, ArrayNode):
+        dimensions = ''.join('[%d]' % (size) for size in content.dimensions)
+    return '%s %s%s' % (typename, tag, dimensions)
+
+####################################################
+#
+# ADD THE LOADER OF THE TAG IMAGE TO THE C FILE
+# obs: the tags of the image are listed in the order
+#      they were added
+###################################################
+def addTagImageLoader(f, image):
+    template = Template(read_template('tagimage.template'))
+    f.write(template.substitute({
+        'image': image.path,
+        'magic': image.magic.rstrip(b'\0').decode('ascii'),
+        'entries': ''.join('    {&%s, sizeof(%s), "%s"},\n' % (name, name, name)
+                           for name in image.names),
+    }))
 
 ####################################################
 #
 # PROCESS THE RUNGS
 #
 ###################################################
-def processRungs(f, routine):
-    # build the lexer
-    lexer = runglex()
-    # Build the parser
-    parser = rungyacc()
+def processRungs(f, routine, translator=None):
+    if translator is None:
+        translator = get_translator()
     for rung in routine:
         f.write("    // %s\n" % (rung))
         try:
-            f.write("    %s\n" % (parser.parse(rung)))
+            f.write("    %s\n" % (translator.translate(rung)))
         except SyntaxError as e:
             f.write("//    Syntax Error")
         finally:
             f.write("\n\n")
 
+####################################################
+#
+# ADD THE PROGRAMS HEADER TO THE C FILE
+#
+###################################################
+def addProgramsHeader(f):
+    f.write('\n/***************************************************\n')
+    f.write('*               Program Definitions                *\n')
+    f.write('***************************************************/\n')
+
 ####################################################
 #
 # ADD ROUTINE FUNCTION TO THE C FILE
 #
 ###################################################
-def addFunction(f, program, routine, rungs):
+def addFunction(f, program, routine, rungs, translator=None):
     f.write("\n/* Function for Routine %s of program %s */\n" % (routine,program))
     f.write("void %s() {\n" % (routine))
-    processRungs(f,rungs)
+    processRungs(f,rungs,translator)
     f.write("}\n\n")
 
 
 ####################################################
 #
-# TRANSLATE THE DICTIONARY TO A C FILE
+# RUN AN ADD FUNCTION INTO A STRING
+#
+###################################################
+def fragment(add, *args):
+    f = io.StringIO()
+    add(f, *args)
+    return f.getvalue()
+
+####################################################
+#
+# HASHES OF THE INPUTS OF EACH FRAGMENT
+#
+###################################################
+def templates_digest(parameters):
+    return digest_text(read_template('plcmodel.template'),
+                       *[read_template(name) for name in sorted(stack_models.values())],
+                       json.dumps(parameters, sort_keys=True))
+
+def datatypes_digest(datatypes):
+    return digest_text(*[name + json.dumps(datatypes[name], sort_keys=True)
+                         for name in datatypes])
+
+def tags_digest(tags):
+    digest = hashlib.sha1()
+    for tag in tags:
+        digest.update(tag.encode('utf-8'))
+        update_digest(digest, tags[tag])
+    return digest.hexdigest()
+
+def routine_digest(program, routine, rungs, version):
+    return digest_text(version, program, routine, *rungs)
+
+####################################################
+#
+# ROUTINE TRANSLATION IN WORKER PROCESSES
+# obs: each worker keeps a warm translator and its
+#      own in-memory rung cache
+###################################################
+worker_cache = None
+
+def init_worker(cache_size, version, optimize, codegen):
+    global worker_cache
+    worker_cache = RungCache(get_translator(optimize, codegen), cache_size, None, version)
+
+def translate_routine(task):
+    key, program, routine, rungs = task
+    hits = worker_cache.hits
+    misses = worker_cache.misses
+    code = fragment(addFunction, program, routine, rungs, worker_cache)
+    return key, code, worker_cache.hits - hits, worker_cache.misses - misses
+
+####################################################
+#
+# TRANSLATE ROUTINES ON A PROCESS POOL
+# obs: the largest routines are scheduled first so a
+#      big routine does not hold up the end of the run
+###################################################
+def translate_routines(tasks, jobs, translator, version):
+    cache_size = getattr(translator, 'size', 0)
+    rung_translator = translator
+    if isinstance(translator, RungCache):
+        rung_translator = translator.translator
+    optimize = getattr(rung_translator, 'optimize', False)
+    codegen = getattr(rung_translator, 'codegen', 'stack')
+    tasks = sorted(tasks, key=lambda task: len(task[3]), reverse=True)
+    results = {}
+    with multiprocessing.Pool(jobs, init_worker, (cache_size, version, optimize, codegen)) as pool:
+        for key, code, hits, misses in pool.imap_unordered(translate_routine, tasks):
+            results[key] = code
+            if isinstance(translator, RungCache):
+                translator.hits += hits
+                translator.misses += misses
+    return results
+
+####################################################
+#
+# MAIN ROUTINES CALLED BY THE SCAN HARNESS
+# obs: the configured main routine of each program,
+#      or MainRoutine if the export does not name
+#      one. Subroutines are reached through JSR
+###################################################
+def scan_routines(programs):
+    log = logging.getLogger('l5x2c')
+    routines = []
+    for program in programs:
+        routine = programs[program].get('main_routine') or 'MainRoutine'
+        if routine in programs[program]['routines']:
+            routines.append(routine)
+        else:
+            log.warning("Main routine %s of program %s was not translated. "
+                        "It is not called by the harness." % (routine, program))
+    return routines
+
+####################################################
+#
+# CHECK THE TAGS OF THE SCAN HARNESS
+# obs: the harness converts its tags from and to
+#      double, so they must be scalars: atomic tags,
+#      or members and elements that are atomic. Tags
+#      are C expressions like TM0.PRE or ARR0[3][1].
+#      Tags that are not found are left to the C
+#      compiler. Raises HarnessTagError otherwise
+###################################################
+class HarnessTagError(ValueError):
+    pass
+
+harness_tag_re = re.compile(r'\s*(\w+)')
+harness_step_re = re.compile(r'\s*(?:\.\s*(\w+)|\[[^\]]*\])')
+
+def harness_tag_names(harness):
+    return set(harness_tag_re.match(tag).group(1) for tag in harness['inputs'] + harness['outputs']
+               if harness_tag_re.match(tag))
+
+def non_scalar_tag(tag, nodes):
+    match = harness_tag_re.match(tag)
+    if match is None or match.group(1) not in nodes:
+        return None
+    node = nodes[match.group(1)]
+    subscripts = 0
+    position = match.end()
+    while position < len(tag.rstrip()):
+        step = harness_step_re.match(tag, position)
+        if step is None:
+            return None
+        position = step.end()
+        if step.group(1) is not None:
+            if not isinstance(node, StructNode) or step.group(1) not in node.members:
+                return None
+            node = node.members[step.group(1)]
+        elif isinstance(node, ArrayNode):
+            subscripts += 1
+            if subscripts == len(node.dimensions):
+                if isinstance(node.elements, list):
+                    node = next((element for element in node.elements if element is not None),
+                                None)
+                else:
+                    node = ValueNode(node.type, None)
+                subscripts = 0
+        else:
+            return None
+    if isinstance(node, ArrayNode):
+        return 'an array of %s' % (node.type)
+    if isinstance(node, StructNode):
+        return 'a structure of type %s' % (node.type)
+    return None
+
+def check_harness_tags(harness, nodes):
+    for option, tags in (('--harness-inputs', harness['inputs']),
+                         ('--harness-outputs', harness['outputs'])):
+        for tag in tags:
+            kind = non_scalar_tag(tag, nodes)
+            if kind is not None:
+                raise HarnessTagError("%s: %s is %s, not a scalar. Name its members or "
+                                 "elements instead, like TM0.PRE or ARR0[3]" %
+                                 (option, tag.strip(), kind))
+
+def tag_blocks(l5x):
+    return [l5x['tags'].get('Controller', {})] + list(l5x['tags'].get('Programs', {}).values())
+
+def harness_tag_nodes(blocks, harness):
+    names = harness_tag_names(harness)
+    return {tag: tags[tag] for tags in blocks for tag in tags if tag in names}
+
+####################################################
+#
+# ADD THE SCAN HARNESS TO THE C FILE
+# obs: inputs are the tags read from each line of the
+#      trace, in order, and outputs the tags dumped
+#      after each scan
+###################################################
+def addHarness(f, routines, inputs, outputs, tag_image=False):
+    template = Template(read_template('harness.template'))
+    
+    tag_image_load = ''
+    if tag_image:
+        tag_image_load = ('    if (load_tag_image(TAG_IMAGE) != 0) {\n'
+                          '        return 1;\n'
+                          '    }\n')
+    
+    scan_calls = ''.join('    %s();\n' % (routine) for routine in routines)
+    input_assignments = ''.join('    %s = values[%d];\n' % (tag, i)
+                                for i, tag in enumerate(inputs))
+    if len(inputs) == 0:
+        input_assignments = '    (void)values;\n'
+    output_values = ''.join('    fprintf(f, "%s%%.17g", (double)(%s));\n' %
+                            (',' if i > 0 else '', tag) for i, tag in enumerate(outputs))
+    
+    f.write(template.substitute({
+        'input_count': len(inputs),
+        'output_count': len(outputs),
+        'input_names': ''.join('"%s", ' % (tag) for tag in inputs),
+        'output_names': ''.join('"%s", ' % (tag) for tag in outputs),
+        'scan_calls': scan_calls,
+        'input_assignments': input_assignments,
+        'output_values': output_values,
+        'tag_image_load': tag_image_load,
+    }))
+
+def harness_digest(routines, harness):
+    return digest_text(read_template('harness.template'),
+                       json.dumps([routines, harness], sort_keys=True))
+
+####################################################
 #
+# TRANSLATE THE DICTIONARY TO A C FILE
+# obs: translator defaults to the process-wide one.
+#      With a manifest, fragments whose inputs did not
+#      change are reused instead of translated again.
+#      With jobs > 1, routines are translated on a
+#      process pool and written in the same order.
+#      harness is a dict with the 'inputs' and
+#      'outputs' tags of the scan harness, if any.
+#      profiler measures each part of the file. With
+#      a tag image, the initial values of the tags go
+#      to the image and are not kept in the manifest
 ###################################################
-def dict2c(l5x, output, parameters):
+def dict2c(l5x, output, parameters, translator=None, manifest=None,
+           version=translator_version, jobs=1, harness=None, profiler=None, image=None):
+    if manifest is None:
+        manifest = Manifest()
+    if profiler is None:
+        profiler = Profiler(False)
+    if harness is not None:
+        check_harness_tags(harness, harness_tag_nodes(tag_blocks(l5x), harness))
+    
+    programs = l5x['programs']
+    translated = {}
+    if jobs > 1:
+        tasks = []
+        for program in programs:
+            routines = programs[program]['routines']
+            for routine in routines:
+                rungs = routines[routine]['rungs']
+                key = 'routine/%s/%s' % (program, routine)
+                if not manifest.is_current(key, routine_digest(program, routine, rungs, version)):
+                    tasks.append((key, program, routine, rungs))
+        if len(tasks) > 0:
+            translated = translate_routines(tasks, jobs, translator, version)
+    
     with open(output, 'w') as f:
-        addTemplates(f, parameters)
-        addDataTypes(f, l5x['datatypes'])
-        addTags(f, l5x['tags']['Controller'])
-        f.write('\n/***************************************************\n')
-        f.write('*               Program Definitions                *\n')
-        f.write('***************************************************/\n')
-        programs = l5x['programs']
+        f.write(manifest.fragment('templates', templates_digest(parameters),
+            lambda: fragment(addTemplates, parameters)))
+        with profiler.phase('addDataTypes'):
+            f.write(manifest.fragment('datatypes', datatypes_digest(l5x['datatypes']),
+                lambda: fragment(addDataTypes, l5x['datatypes'])))
+        tags = l5x['tags']['Controller']
+        if image is not None:
+            image.datatypes = l5x['datatypes']
+        with profiler.phase('addTags'):
+            if image is not None:
+                addTags(f, tags, image)
+            else:
+                f.write(manifest.fragment('tags', tags_digest(tags),
+                    lambda: fragment(addTags, tags)))
+        addProgramsHeader(f)
         for program in programs:
             f.write("\n/* Program %s */\n" % (program))
             if 'Programs' in l5x['tags']:
                 if program in l5x['tags']['Programs']:
-                    addTags(f, l5x['tags']['Programs'][program])
+                    tags = l5x['tags']['Programs'][program]
+                    with profiler.phase('addTags'):
+                        if image is not None:
+                            addTags(f, tags, image)
+                        else:
+                            f.write(manifest.fragment('tags/%s' % (program), tags_digest(tags),
+                                lambda: fragment(addTags, tags)))
             routines = programs[program]['routines']
             for routine in routines:
-                addFunction(f, program, routine, routines[routine]['rungs'])
+                rungs = routines[routine]['rungs']
+                key = 'routine/%s/%s' % (program, routine)
+                if key in translated:
+                    build = lambda: translated.pop(key)
+                else:
+                    build = lambda: fragment(addFunction, program, routine, rungs, translator)
+                with profiler.routine(program, routine, len(rungs)):
+                    f.write(manifest.fragment(key, routine_digest(program, routine, rungs, version),
+                        build))
+        if image is not None:
+            addTagImageLoader(f, image)
+        if harness is not None:
+            routines = scan_routines(programs)
+            f.write(manifest.fragment('harness', harness_digest(routines, harness),
+                lambda: fragment(addHarness, routines, harness['inputs'], harness['outputs'],
+                                 image is not None)))
         
 
+####################################################
+#
+# STREAM THE C FRAGMENTS OF A L5X RECORD STREAM
+# obs: records come from l5xparser.iterparse_l5x in
+#      document order. Only the datatypes are kept
+#      until the first record of another kind, since
+#      they are sorted by their dependencies. Every
+#      tag and routine is yielded as soon as it is
+#      read, so memory does not grow with the project.
+#      stats counts the rungs of the routines
+###################################################
+def stream_fragments(records, parameters, translator=None, harness=None, stats=None,
+                     image=None):
+    log = logging.getLogger('l5x2c')
+    if stats is None:
+        stats = {}
+    stats['rungs'] = 0
+    datatypes = {}
+    programs = None
+    tags_header = False
+    harness_names = harness_tag_names(harness) if harness is not None else set()
+    harness_nodes = {}
+    for record in records:
+        kind = record[0]
+        if kind == 'datatype':
+            if datatypes is not None:
+                datatypes[record[1]] = record[2]
+            else:
+                log.warning("DataType %s comes after the tags. It is not sorted." % (record[1]))
+                yield fragment(addDataType, record[1], record[2])
+            continue
+        if datatypes is not None:
+            yield fragment(addTemplates, parameters)
+            yield fragment(addDataTypes, datatypes)
+            if image is not None:
+                image.datatypes = datatypes
+            datatypes = None
+        
+        if kind == 'tags':
+            tags_header = True
+        elif kind == 'tag':
+            if record[1] == 'Controller' and programs is not None:
+                log.warning("Controller tag %s comes after the programs." % (record[3]))
+            if tags_header:
+                yield fragment(addTagsHeader)
+                tags_header = False
+            if record[3] in harness_names:
+                harness_nodes[record[3]] = record[4]
+            yield fragment(addTag, record[3], record[4], image)
+        elif kind == 'program':
+            if programs is None:
+                yield fragment(addProgramsHeader)
+                programs = {}
+            programs[record[1]] = {'main_routine': record[2], 'routines': {}}
+            yield "\n/* Program %s */\n" % (record[1])
+        elif kind == 'routine':
+            program, routine, rungs = record[1], record[2], record[3]
+            programs[program]['routines'][routine] = None
+            stats['rungs'] += len(rungs)
+            yield fragment(addFunction, program, routine, rungs, translator)
+    
+    if datatypes is not None:
+        yield fragment(addTemplates, parameters)
+        yield fragment(addDataTypes, datatypes)
+    if programs is None:
+        yield fragment(addProgramsHeader)
+        programs = {}
+    if image is not None:
+        yield fragment(addTagImageLoader, image)
+    if harness is not None:
+        check_harness_tags(harness, harness_nodes)
+        yield fragment(addHarness, scan_routines(programs),
+                       harness['inputs'], harness['outputs'], image is not None)
+
+####################################################
+#
+# TRANSLATE A L5X FILE TO A C FILE AS A STREAM
+# obs: same output as dict2c, but each routine is
+#      written and freed before the next one is read.
+#      The C file is written to a temporary file that
+#      replaces the output only when the whole export
+#      was translated, so a failure leaves no partial
+#      output behind
+###################################################
+write_buffer_size = 1 << 16
+
+def stream2c(l5x, filename, output, parameters, translator=None, harness=None, image=None):
+    stats = {}
+    records = l5x.iterparse_l5x(filename)
+    directory, name = os.path.split(os.path.abspath(output))
+    fd, temporary = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+    try:
+        with open(fd, 'w', buffering=write_buffer_size) as f:
+            for text in stream_fragments(records, parameters, translator, harness, stats, image):
+                f.write(text)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary, 0o666 & ~umask)
+        os.replace(temporary, output)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return stats
+
+####################################################
+#
+# SPLIT THE MODEL TEMPLATE FOR A HEADER
+# obs: the includes, typedefs and inline functions
+#      of the template go to the header, with an
+#      extern declaration for each global and a
+#      prototype for each function. The definitions
+#      stay in the model file
+###################################################
+include_re = re.compile(r'^#include .*\n', re.M)
+typedef_re = re.compile(r'^typedef struct \w+ \{.*?\} \w+;\n', re.M | re.S)
+inline_re = re.compile(r'^static inline [^\n]*\{(?:[^\n]*\}\n|.*?\n\}\n)', re.M | re.S)
+function_re = re.compile(r'^(\w[\w ]*?[\w*]) ?(\w+)\(([^)]*)\) ?\{', re.M)
+global_re = re.compile(r'^(\w[\w ]*?) (\w+)(\[\w*\])? = .*;$', re.M)
+
+def split_template(text):
+    inline = inline_re.findall(text)
+    definitions = inline_re.sub('', typedef_re.sub('', include_re.sub('', text)))
+    declarations = ['extern %s %s%s;' % (kind, name, size or '')
+                    for kind, name, size in global_re.findall(definitions)]
+    declarations += ['%s %s(%s);' % match.groups() for match in function_re.finditer(definitions)]
+    return {
+        'includes': ''.join(include_re.findall(text)),
+        'typedefs': '\n'.join(typedef_re.findall(text)),
+        'declarations': '\n'.join(declarations) + '\n' + ''.join(inline),
+        'definitions': definitions,
+    }
+
+####################################################
+#
+# ADD THE SHARED HEADER OF A SPLIT MODEL
+# obs: everything a unit needs to use the model
+#      functions, the datatypes, the tags and the
+#      routines of any program
+###################################################
+def addHeader(f, name, template, l5x):
+    guard = re.sub(r'\W', '_', name).upper() + '_H'
+    f.write('/* This file was generated automatically by l5x2c */\n')
+    f.write('#ifndef %s\n#define %s\n\n' % (guard, guard))
+    f.write(template['includes'] + '\n')
+    f.write(template['typedefs'] + '\n')
+    f.write(template['declarations'])
+    addDataTypes(f, l5x['datatypes'])
+    
+    f.write('\n/***************************************************\n')
+    f.write('*                 Tags Declarations                *\n')
+    f.write('***************************************************/\n')
+    for tags in tag_blocks(l5x):
+        for tag in tags:
+            f.write('extern %s;\n' % (tag_declaration(tag, tags[tag])))
+    
+    f.write('\n/***************************************************\n')
+    f.write('*                Routine Prototypes                *\n')
+    f.write('***************************************************/\n')
+    for program in l5x['programs'].values():
+        for routine in program['routines']:
+            f.write('void %s();\n' % (routine))
+    f.write('\n#endif\n')
+
+####################################################
+#
+# ADD THE MAKEFILE OF A SPLIT MODEL
+# obs: the program is linked only if there is a
+#      harness with a main()
+###################################################
+def addMakefile(f, name, units, link):
+    objects = ' '.join(os.path.splitext(unit)[0] + '.o' for unit in units)
+    f.write('# Makefile generated by l5x2c\n')
+    f.write('CC ?= cc\nCFLAGS ?= -O2\nLDLIBS ?= -lm\n\n')
+    f.write('OBJECTS = %s\n\n' % (objects))
+    if link:
+        f.write('%s: $(OBJECTS)\n\t$(CC) $(CFLAGS) -o $@ $(OBJECTS) $(LDLIBS)\n\n' % (name))
+    else:
+        f.write('all: $(OBJECTS)\n\n')
+    f.write('%%.o: %%.c %s.h\n\t$(CC) $(CFLAGS) -c -o $@ $<\n\n' % (name))
+    f.write('clean:\n\trm -f %s $(OBJECTS)\n\n.PHONY: clean\n' % (name))
+
+####################################################
+#
+# WRITE A FILE ONLY IF ITS CONTENT CHANGED
+# obs: unchanged files keep their time stamp, so
+#      make does not compile them again
+###################################################
+def write_if_changed(path, text):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            if f.read() == text:
+                return False
+    with open(path, 'w') as f:
+        f.write(text)
+    return True
+
+####################################################
+#
+# TRANSLATE THE DICTIONARY TO SEVERAL C FILES
+# obs: a header shared by every unit, a model file
+#      with the model functions, the controller tags
+#      and the harness, one file for each program
+#      with its tags and routines, and one file for
+#      each routine with more than split_rungs rungs.
+#      Returns the number of files written and the
+#      number of files of the model
+###################################################
+split_rungs = 2000
+
+def split2c(l5x, directory, name, parameters, translator=None, version=translator_version,
+            jobs=1, harness=None, image=None, threshold=split_rungs):
+    if harness is not None:
+        check_harness_tags(harness, harness_tag_nodes(tag_blocks(l5x), harness))
+    programs = l5x['programs']
+    translated = {}
+    if jobs > 1:
+        tasks = []
+        for program in programs:
+            routines = programs[program]['routines']
+            for routine in routines:
+                key = 'routine/%s/%s' % (program, routine)
+                tasks.append((key, program, routine, routines[routine]['rungs']))
+        if len(tasks) > 0:
+            translated = translate_routines(tasks, jobs, translator, version)
+    if image is not None:
+        image.datatypes = l5x['datatypes']
+    
+    include = '#include "%s.h"\n' % (name)
+    files = {}
+    for program in programs:
+        unit = io.StringIO()
+        unit.write(include)
+        unit.write("\n/* Program %s */\n" % (program))
+        addTags(unit, l5x['tags'].get('Programs', {}).get(program, {}), image)
+        routines = programs[program]['routines']
+        for routine in routines:
+            rungs = routines[routine]['rungs']
+            key = 'routine/%s/%s' % (program, routine)
+            if key in translated:
+                code = translated.pop(key)
+            else:
+                code = fragment(addFunction, program, routine, rungs, translator)
+            if len(rungs) > threshold:
+                files['%s_%s_%s.c' % (name, program, routine)] = include + code
+            else:
+                unit.write(code)
+        files['%s_%s.c' % (name, program)] = unit.getvalue()
+    
+    template = split_template(fragment(addTemplates, parameters))
+    model = io.StringIO()
+    model.write(include)
+    model.write(template['definitions'])
+    addTags(model, l5x['tags'].get('Controller', {}), image)
+    if image is not None:
+        addTagImageLoader(model, image)
+    if harness is not None:
+        addHarness(model, scan_routines(programs), harness['inputs'], harness['outputs'],
+                   image is not None)
+    units = [name + '.c'] + sorted(files)
+    files[name + '.c'] = model.getvalue()
+    files[name + '.h'] = fragment(addHeader, name, template, l5x)
+    files['Makefile'] = fragment(addMakefile, name, units, harness is not None)
+    
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for file in files:
+        if write_if_changed(os.path.join(directory, file), files[file]):
+            written += 1
+    return written, len(files)
+
+####################################################
+#
+# TRANSLATE ONE L5X FILE
+# obs: returns the statistics of the file shown in
+#      the batch summary. A tag image is only kept
+#      when the whole file was translated
+###################################################
+def translate_file(input, output, args, cache, jobs=1, manifest_path=None):
+    start = time.perf_counter()
+    errors = cache.errors
+    parameters = {
+        'stack_size': args['stack_size'] or stack_sizes[args['stack_model']],
+        'scan_time': args['scan_time'],
+        'codegen': args['codegen'],
+        'stack_model': args['stack_model']
+    }
+    harness = None
+    if args['emit_harness']:
+        harness = {
+            'inputs': split_tags(args['harness_inputs']),
+            'outputs': split_tags(args['harness_outputs'])
+        }
+    image = None
+    if args['tag_image']:
+        image = TagImage(args['tag_image'])
+    try:
+        if args['profile']:
+            l5x_data = profile_file(input, output, args, cache, parameters, harness,
+                                    manifest_path, image)
+            rungs = count_rungs(l5x_data['programs'])
+        elif args['split']:
+            if args['program'] or args['routine']:
+                project = L5XProject(input, args['raw_data'])
+                l5x_data = project.parse(args['program'], args['routine'])
+            else:
+                l5x_data = l5xparser(args['raw_data']).parse(input)
+            name = os.path.splitext(os.path.basename(input))[0]
+            written, files = split2c(l5x_data, output, name, parameters, cache, cache.version,
+                                     jobs, harness, image, args['split_rungs'])
+            print('Split: %d of %d files written' % (written, files), file=sys.stderr)
+            rungs = count_rungs(l5x_data['programs'])
+        elif args['program'] or args['routine'] or manifest_path or jobs > 1:
+            if args['program'] or args['routine']:
+                project = L5XProject(input, args['raw_data'])
+                l5x_data = project.parse(args['program'], args['routine'])
+            else:
+                l5x = l5xparser(args['raw_data'])
+                l5x_data = l5x.parse(input)
+            manifest = Manifest(manifest_path)
+            dict2c(l5x_data, output, parameters, cache, manifest, cache.version, jobs, harness,
+                   image=image)
+            manifest.save()
+            if manifest_path:
+                print(manifest.report(), file=sys.stderr)
+            rungs = count_rungs(l5x_data['programs'])
+        else:
+            l5x = l5xparser(args['raw_data'])
+            rungs = stream2c(l5x, input, output, parameters, cache, harness, image)['rungs']
+    except BaseException:
+        if image is not None:
+            image.discard()
+        raise
+    if image is not None:
+        image.close()
+    return {
+        'file': input,
+        'status': 'translated',
+        'time': time.perf_counter() - start,
+        'rungs': rungs,
+        'errors': cache.errors - errors,
+        'size': output_size(output),
+    }
+
+####################################################
+#
+# TRANSLATE ONE L5X FILE MEASURING EACH PHASE
+# obs: tags, datatypes and programs are read in
+#      separate passes so each one can be measured.
+#      The rungs missing from the rung cache are
+#      timed by wrapping its rung translator. The
+#      report is written as JSON to the profile path
+###################################################
+def profile_file(input, output, args, cache, parameters, harness, manifest_path=None,
+                 image=None):
+    profiler = Profiler(slowest=args['profile_top'])
+    l5x = l5xparser(args['raw_data'])
+    with profiler.phase('parse_l5x_tags'):
+        tags = l5x.parse_l5x_tags(input)
+    with profiler.phase('parse_l5x_datatypes'):
+        datatypes = l5x.parse_l5x_datatypes(input)
+    with profiler.phase('index_programs'):
+        programs = l5x.index_programs(input)
+    l5x_data = {'tags': tags, 'datatypes': datatypes, 'programs': programs}
+    
+    manifest = Manifest(manifest_path)
+    rung_translator = cache.translator
+    hits = cache.hits + cache.disk_hits
+    cache.translator = ProfiledTranslator(rung_translator, profiler)
+    try:
+        dict2c(l5x_data, output, parameters, cache, manifest, cache.version, 1, harness,
+               profiler, image)
+    finally:
+        cache.translator = rung_translator
+    manifest.save()
+    profiler.counters['rungs'] = count_rungs(programs)
+    profiler.counters['cache_hits'] = cache.hits + cache.disk_hits - hits
+    profiler.counters['bytes'] = os.path.getsize(output)
+    profiler.save(args['profile'], file=input, output=output, version=cache.version)
+    return l5x_data
+
+def count_rungs(programs):
+    rungs = 0
+    for program in programs.values():
+        for routine in program['routines'].values():
+            rungs += len(routine['rungs'])
+    return rungs
+
+def output_size(output):
+    if os.path.isdir(output):
+        return sum(os.path.getsize(os.path.join(output, name)) for name in os.listdir(output))
+    return os.path.getsize(output)
+
+####################################################
+#
+# FILES OF A BATCH
+# obs: a directory gives its .L5X files, anything
+#      else is taken as a glob pattern
+###################################################
+def batch_files(pattern, out_dir):
+    if os.path.isdir(pattern):
+        inputs = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                  if name.lower().endswith('.l5x')]
+    else:
+        inputs = glob.glob(pattern, recursive=True)
+    files = []
+    for input in sorted(inputs):
+        name = os.path.splitext(os.path.basename(input))[0] + '.c'
+        files.append((input, os.path.join(out_dir, name)))
+    return files
+
+def is_up_to_date(input, output):
+    return (os.path.exists(output)
+            and os.path.getmtime(output) > os.path.getmtime(input))
+
+####################################################
+#
+# TRANSLATE A FILE OF A BATCH
+# obs: runs in the main process or in a worker with
+#      its own warm translator and rung cache. Errors
+#      are reported in the summary instead of stopping
+#      the batch. The cache counters of the file are
+#      returned, so the ones of the workers can be
+#      added to the cache of the main process
+###################################################
+cache_counters = ('hits', 'disk_hits', 'misses', 'errors')
+
+def batch_file(task, cache=None):
+    input, output, args = task
+    log = logging.getLogger('l5x2c')
+    if cache is None:
+        cache = worker_cache
+    before = [getattr(cache, counter) for counter in cache_counters]
+    try:
+        result = translate_file(input, output, args, cache)
+    except Exception as e:
+        log.error("%s: %s" % (input, e))
+        if os.path.exists(output):
+            os.remove(output)
+        result = {'file': input, 'status': 'failed'}
+    result['cache'] = {counter: getattr(cache, counter) - count
+                       for counter, count in zip(cache_counters, before)}
+    return result
+
+####################################################
+#
+# TRANSLATE ALL THE FILES OF A BATCH
+# obs: files whose output is newer than the input
+#      are skipped. With jobs > 1 the largest files
+#      are scheduled first on a process pool
+###################################################
+def translate_batch(args, cache):
+    os.makedirs(args['out_dir'], exist_ok=True)
+    results = {}
+    tasks = []
+    for input, output in batch_files(args['batch'], args['out_dir']):
+        if is_up_to_date(input, output):
+            results[input] = {'file': input, 'status': 'up to date'}
+        else:
+            tasks.append((input, output, args))
+    
+    if args['jobs'] > 1 and len(tasks) > 1:
+        tasks.sort(key=lambda task: os.path.getsize(task[0]), reverse=True)
+        initargs = (cache.size, cache.version, args['optimize'], args['codegen'])
+        with multiprocessing.Pool(args['jobs'], init_worker, initargs) as pool:
+            for result in pool.imap_unordered(batch_file, tasks):
+                results[result['file']] = result
+                for counter in cache_counters:
+                    setattr(cache, counter, getattr(cache, counter) + result['cache'][counter])
+    else:
+        for task in tasks:
+            result = batch_file(task, cache)
+            results[result['file']] = result
+    return [results[input] for input in sorted(results)]
+
+####################################################
+#
+# SUMMARY TABLE OF A BATCH
+#
+###################################################
+def batch_summary(results):
+    width = max([len('file')] + [len(result['file']) for result in results])
+    line = '%%-%ds %%10s %%8s %%8s %%10s' % (width)
+    lines = [line % ('file', 'time (s)', 'rungs', 'errors', 'size')]
+    total = {'time': 0.0, 'rungs': 0, 'errors': 0, 'size': 0}
+    for result in results:
+        if result['status'] == 'translated':
+            lines.append(line % (result['file'], '%.3f' % (result['time']), result['rungs'],
+                                 result['errors'], result['size']))
+            for key in total:
+                total[key] += result[key]
+        else:
+            lines.append(line % (result['file'], result['status'], '-', '-', '-'))
+    lines.append(line % ('total', '%.3f' % (total['time']), total['rungs'],
+                         total['errors'], total['size']))
+    return '\n'.join(lines)
+
+####################################################
+#
+# SPLIT THE COMMA SEPARATED TAG LISTS
+#
+###################################################
+def split_tags(lists):
+    return [tag.strip() for tags in lists for tag in tags.split(',') if tag.strip()]
+
 ####################################################
 #
 # MAIN SCRIPT FOR COMMAND LINE EXECUTION
@@ -225,25 +1220,96 @@ def main():
     log = logging.getLogger('l5x2c')
     description = "Converts a Rockwell's L5X file into a C program"
     parser = argparse.ArgumentParser(description=description)
-    parser.add_argument("input")
-    parser.add_argument("output")
-    parser.add_argument('-ss', '--stack_size', type=int, default=1000,
-                            help="Stack size for the stack machine")
+    parser.add_argument("input", nargs='?')
+    parser.add_argument("output", nargs='?')
+    parser.add_argument('-ss', '--stack_size', type=int, default=None,
+                            help="Stack size for the stack machine (default: 1000 for "
+                                 "the array and 63 for the bit stack)")
     parser.add_argument('-st', '--scan_time', type=int, default=100,
                             help="Scan time for the PLC model")
+    parser.add_argument('-p', '--program', action='append',
+                            help="translate only this program (can be repeated)")
+    parser.add_argument('-r', '--routine', action='append',
+                            help="translate only this routine (can be repeated)")
+    parser.add_argument('--raw-data', action='store_true',
+                            help="read atomic array tags from their raw hex data")
+    parser.add_argument('--cache-size', type=int, default=10000,
+                            help="number of rung translations kept in memory")
+    parser.add_argument('--cache-file',
+                            help="sqlite file that keeps rung translations between runs")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help="number of processes used to translate routines")
+    parser.add_argument('-i', '--incremental', metavar='MANIFEST',
+                            help="reuse the fragments of unchanged routines, tags and "
+                                 "datatypes recorded in this manifest")
+    parser.add_argument('-O', '--optimize', action='store_true',
+                            help="optimize the stack operations of the generated code")
+    parser.add_argument('--codegen', choices=codegens, default='stack',
+                            help="generate stack machine calls or plain C expressions "
+                                 "without a stack")
+    parser.add_argument('--stack-model', choices=sorted(stack_models), default='array',
+                            help="stack of the stack machine: an array of bool or "
+                                 "inline functions on a bit register")
+    parser.add_argument('--emit-harness', action='store_true',
+                            help="add a main() that runs the main routines in a scan loop")
+    parser.add_argument('--harness-inputs', action='append', default=[], metavar='TAGS',
+                            help="comma separated tags read from each line of the "
+                                 "trace (can be repeated)")
+    parser.add_argument('--harness-outputs', action='append', default=[], metavar='TAGS',
+                            help="comma separated tags dumped after each scan "
+                                 "(can be repeated)")
+    
+    parser.add_argument('--split', action='store_true',
+                            help="write a header, a model file, a file per program "
+                                 "and a Makefile to the output directory")
+    parser.add_argument('--split-rungs', type=int, default=split_rungs, metavar='N',
+                            help="routines with more rungs get their own file with --split")
+    parser.add_argument('--tag-image', metavar='IMAGE',
+                            help="write the initial values of the tags to this binary "
+                                 "image, loaded by the C program at startup")
+    parser.add_argument('--profile', metavar='JSON',
+                            help="write the time and memory of each phase of the "
+                                 "translation to this file")
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                            help="number of slowest rungs in the profile")
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB',
+                            help="translate every L5X file of a directory or glob pattern")
+    parser.add_argument('--out-dir',
+                            help="directory of the C files written by --batch")
     
     args = vars(parser.parse_args())
+    if args['batch'] is not None:
+        if args['input'] is not None or args['out_dir'] is None or args['incremental']:
+            parser.error("--batch takes --out-dir instead of input, output and --incremental")
+    elif args['input'] is None or args['output'] is None:
+        parser.error("the input and output files are required")
+    if args['split'] and (args['batch'] is not None or args['incremental'] or args['profile']):
+        parser.error("--split can not be used with --batch, -i or --profile")
+    if args['tag_image'] and (args['batch'] is not None or args['incremental']):
+        parser.error("--tag-image can not be used with --batch or -i")
+    if args['profile'] and (args['batch'] is not None or args['jobs'] > 1
+                            or args['program'] or args['routine']):
+        parser.error("--profile can not be used with --batch, -j, -p or -r")
+    
+    translator = get_translator(args['optimize'], args['codegen'])
+    cache = RungCache(translator, args['cache_size'], args['cache_file'],
+                      translator.version)
     try:
-        l5x = l5xparser()
-        l5x_data = l5x.parse(args['input'])
-        parameters = {
-            'stack_size': args['stack_size'],
-            'scan_time': args['scan_time']
-        }
-        dict2c(l5x_data, args['output'], parameters)
+        if args['batch'] is not None:
+            results = translate_batch(args, cache)
+            print(batch_summary(results))
+        else:
+            translate_file(args['input'], args['output'], args, cache, args['jobs'],
+                           args['incremental'])
+        print(cache.report(), file=sys.stderr)
     except KeyError as e:
         log.critical("Key Error: " + str(e))
         traceback.print_exc()
+    except (HarnessTagError, SelectionError) as e:
+        log.critical(str(e))
+        sys.exit(1)
+    finally:
+        cache.close()
         
 if __name__== "__main__":
     main()
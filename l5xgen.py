@@ -0,0 +1,399 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import random
+import argparse
+from runglex import reserved
+from rungfast import input_instructions
+from rungfast import output_instructions
+
+####################################################
+#
+# SYNTHETIC L5X EXPORTS
+# obs: the same options and seed always give the same
+#      file. Rungs only use tags of the export, with
+#      the types their instructions expect. Routines
+#      are named after their program, as their C
+#      functions share one scope, and JSR only calls
+#      routines defined before the caller.
+#      The file is written as it is generated, so
+#      exports with millions of rungs can be built
+###################################################
+class L5XGenerator():
+    def __init__(self, seed=0, programs=1, routines=1, rungs=10, depth=2, mix=None,
+                 controller_tags=50, program_tags=10, arrays=0, array_size=1000,
+                 udts=0, udt_depth=2):
+        self.rng = random.Random(seed)
+        self.programs = programs
+        self.routines = routines
+        self.rungs = rungs
+        self.depth = depth
+        self.controller_tags = controller_tags
+        self.program_tags = program_tags
+        self.arrays = arrays
+        self.array_size = array_size
+        self.udts = udts
+        self.udt_depth = max(1, udt_depth)
+        if mix is None:
+            mix = dict((name, 1) for name in reserved)
+        self.inputs = [name for name in input_instructions if mix.get(name, 0) > 0]
+        self.input_weights = [mix[name] for name in self.inputs]
+        self.outputs = [name for name in output_instructions if mix.get(name, 0) > 0]
+        self.output_weights = [mix[name] for name in self.outputs]
+        if len(self.outputs) == 0:
+            raise ValueError("the instruction mix has no output instruction")
+        
+        count = max(5, controller_tags)
+        self.bools = ['B%d' % (i) for i in range(max(1, count * 4 // 10))]
+        self.dints = ['N%d' % (i) for i in range(max(1, count * 3 // 10))]
+        self.reals = ['F%d' % (i) for i in range(max(1, count // 10))]
+        self.timers = ['TM%d' % (i) for i in range(max(1, count // 10))]
+        self.counters = ['CT%d' % (i) for i in range(max(1, count // 10))]
+
+    ####################################################
+    #
+    # NESTING OF THE USER DEFINED TYPES
+    # obs: each type contains the previous one, in
+    #      chains of udt_depth types
+    ###################################################
+    def udt_inner(self, index):
+        if index % self.udt_depth == 0:
+            return None
+        return index - 1
+
+    def udt_paths(self, index, member):
+        paths = []
+        path = 'U%d' % (index)
+        while index is not None:
+            paths.append('%s.%s' % (path, member))
+            path += '.inner'
+            index = self.udt_inner(index)
+        return paths
+
+    ####################################################
+    #
+    # OPERANDS OF A PROGRAM
+    #
+    ###################################################
+    def operands(self, program):
+        local = ['P%d_L%d' % (program, i) for i in range(self.program_tags)]
+        bools = self.bools + local[0::2]
+        dints = self.dints + local[1::2]
+        for i in range(self.udts):
+            bools += self.udt_paths(i, 'flag')
+            dints += self.udt_paths(i, 'count')
+        for i in range(self.arrays):
+            dints.append('ARR%d[%d]' % (i, self.rng.randrange(self.array_size)))
+        return {'bool': bools, 'dint': dints}
+
+    ####################################################
+    #
+    # RANDOM INSTRUCTIONS
+    #
+    ###################################################
+    def number(self):
+        return str(self.rng.randrange(1, 1000))
+
+    def value(self, operands):
+        if self.rng.random() < 0.3:
+            return self.number()
+        return self.rng.choice(operands['dint'])
+
+    def input_instruction(self, operands):
+        name = self.rng.choices(self.inputs, self.input_weights)[0]
+        rng = self.rng
+        if name in ('XIC', 'XIO', 'ONS'):
+            return '%s(%s)' % (name, rng.choice(operands['bool']))
+        if name == 'LIM':
+            return 'LIM(%s,%s,%s)' % (self.number(), rng.choice(operands['dint']),
+                                      self.number())
+        return '%s(%s,%s)' % (name, rng.choice(operands['dint']), self.value(operands))
+
+    def cpt_expression(self, operands, depth):
+        if depth > 0 and self.rng.random() < 0.3:
+            text = '(%s)' % (self.cpt_expression(operands, depth - 1))
+        else:
+            text = self.value(operands)
+        while self.rng.random() < 0.4:
+            operator = self.rng.choice(['+', '-', '*'])
+            text += operator + self.cpt_expression(operands, depth - 1)
+        return text
+
+    def output_instruction(self, operands, program, routine):
+        name = self.rng.choices(self.outputs, self.output_weights)[0]
+        rng = self.rng
+        dint = lambda: rng.choice(operands['dint'])
+        if name == 'JSR' and routine == 0:
+            name = 'OTE'
+        if name in ('OTE', 'OTU', 'OTL'):
+            return '%s(%s)' % (name, rng.choice(operands['bool']))
+        if name in ('TON', 'TOF'):
+            return '%s(%s,?,?)' % (name, rng.choice(self.timers))
+        if name == 'CTU':
+            return 'CTU(%s,?,?)' % (rng.choice(self.counters))
+        if name == 'RES':
+            return 'RES(%s)' % (rng.choice(self.timers + self.counters))
+        if name == 'JSR':
+            return 'JSR(P%d_R%d,0)' % (program, rng.randrange(routine))
+        if name == 'MOV':
+            return 'MOV(%s,%s)' % (self.value(operands), dint())
+        if name in ('ADD', 'SUB'):
+            return '%s(%s,%s,%s)' % (name, self.value(operands), self.value(operands), dint())
+        if name == 'DIV':
+            return 'DIV(%s,%s,%s)' % (self.value(operands), self.number(), dint())
+        if name == 'CLR':
+            return 'CLR(%s)' % (dint())
+        if name == 'CPT':
+            return 'CPT(%s,%s)' % (dint(), self.cpt_expression(operands, 2))
+        if name == 'COP':
+            return 'COP(%s,%s,1)' % (dint(), dint())
+        if name == 'BTD':
+            return 'BTD(%s,0,%s,0,1)' % (dint(), dint())
+        return 'MSG(%s)' % (dint())
+
+    ####################################################
+    #
+    # RANDOM RUNGS
+    # obs: depth is the nesting of the branches
+    ###################################################
+    def input_list(self, operands, depth):
+        text = ''
+        while text == '' or self.rng.random() < 0.4:
+            if depth > 0 and self.rng.random() < 0.3:
+                levels = [self.input_list(operands, depth - 1)
+                          for i in range(self.rng.randrange(2, 4))]
+                text += '[%s]' % (','.join(levels))
+            else:
+                text += self.input_instruction(operands)
+        return text
+
+    def output_list(self, operands, program, routine, depth):
+        if depth > 0 and self.rng.random() < 0.3:
+            levels = []
+            for i in range(self.rng.randrange(2, 4)):
+                level = ''
+                if len(self.inputs) > 0 and self.rng.random() < 0.5:
+                    level = self.input_list(operands, depth - 1)
+                levels.append(level + self.output_list(operands, program, routine, depth - 1))
+            return '[%s]' % (','.join(levels))
+        text = self.output_instruction(operands, program, routine)
+        while self.rng.random() < 0.3:
+            text += self.output_instruction(operands, program, routine)
+        return text
+
+    def rung(self, operands, program, routine):
+        text = ''
+        if len(self.inputs) > 0 and self.rng.random() < 0.9:
+            text = self.input_list(operands, self.depth)
+        return text + self.output_list(operands, program, routine, self.depth) + ';'
+
+    ####################################################
+    #
+    # WRITE THE EXPORT
+    #
+    ###################################################
+    def write(self, f):
+        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        f.write('<RSLogix5000Content SchemaRevision="1.0" SoftwareRevision="20.01" '
+                'ExportOptions="DecoratedData Dependencies">\n')
+        f.write('<Controller Name="Synthetic">\n<DataTypes>\n')
+        for i in reversed(range(self.udts)):
+            self.write_datatype(f, i)
+        f.write('</DataTypes>\n<Tags>\n')
+        for name in self.bools:
+            self.write_value_tag(f, name, 'BOOL', self.rng.randrange(2))
+        for name in self.dints:
+            self.write_value_tag(f, name, 'DINT', self.rng.randrange(100))
+        for name in self.reals:
+            self.write_value_tag(f, name, 'REAL', '%.1f' % (self.rng.random() * 100))
+        for name in self.timers:
+            self.write_structure_tag(f, name, 'TIMER', [('PRE', 'DINT', self.number()),
+                ('ACC', 'DINT', 0), ('EN', 'BOOL', 0), ('TT', 'BOOL', 0), ('DN', 'BOOL', 0)])
+        for name in self.counters:
+            self.write_structure_tag(f, name, 'COUNTER', [('PRE', 'DINT', self.number()),
+                ('ACC', 'DINT', 0), ('CU', 'BOOL', 0), ('CD', 'BOOL', 0), ('DN', 'BOOL', 0),
+                ('OV', 'BOOL', 0), ('UN', 'BOOL', 0)])
+        for i in range(self.arrays):
+            self.write_array_tag(f, 'ARR%d' % (i))
+        for i in range(self.udts):
+            f.write('<Tag Name="U%d" TagType="Base" DataType="UDT%d">\n' % (i, i))
+            f.write('<Data Format="Decorated">\n<Structure DataType="UDT%d">\n' % (i))
+            self.write_udt_members(f, i)
+            f.write('</Structure>\n</Data>\n</Tag>\n')
+        f.write('</Tags>\n<Programs>\n')
+        for program in range(self.programs):
+            self.write_program(f, program)
+        f.write('</Programs>\n</Controller>\n</RSLogix5000Content>\n')
+
+    def write_datatype(self, f, index):
+        f.write('<DataType Name="UDT%d" Family="NoFamily" Class="User">\n<Members>\n' % (index))
+        f.write('<Member Name="flag" DataType="BOOL" Dimension="0" Radix="Decimal"/>\n')
+        f.write('<Member Name="count" DataType="DINT" Dimension="0" Radix="Decimal"/>\n')
+        f.write('<Member Name="data" DataType="REAL" Dimension="4" Radix="Float"/>\n')
+        inner = self.udt_inner(index)
+        if inner is not None:
+            f.write('<Member Name="inner" DataType="UDT%d" Dimension="0" Radix="NullType"/>\n'
+                    % (inner))
+        f.write('</Members>\n')
+        if inner is not None:
+            f.write('<Dependencies>\n<Dependency Type="DataType" Name="UDT%d"/>\n'
+                    '</Dependencies>\n' % (inner))
+        f.write('</DataType>\n')
+
+    def write_udt_members(self, f, index):
+        f.write('<DataValueMember Name="flag" DataType="BOOL" Value="%d"/>\n'
+                % (self.rng.randrange(2)))
+        f.write('<DataValueMember Name="count" DataType="DINT" Radix="Decimal" Value="%d"/>\n'
+                % (self.rng.randrange(100)))
+        f.write('<ArrayMember Name="data" DataType="REAL" Dimensions="4" Radix="Float">\n')
+        for i in range(4):
+            f.write('<Element Index="[%d]" Value="0.0"/>\n' % (i))
+        f.write('</ArrayMember>\n')
+        inner = self.udt_inner(index)
+        if inner is not None:
+            f.write('<StructureMember Name="inner" DataType="UDT%d">\n' % (inner))
+            self.write_udt_members(f, inner)
+            f.write('</StructureMember>\n')
+
+    def write_value_tag(self, f, name, datatype, value):
+        f.write('<Tag Name="%s" TagType="Base" DataType="%s" Radix="Decimal">\n' % (name, datatype))
+        f.write('<Data Format="Decorated">\n<DataValue DataType="%s" Radix="Decimal" '
+                'Value="%s"/>\n</Data>\n</Tag>\n' % (datatype, value))
+
+    def write_structure_tag(self, f, name, datatype, members):
+        f.write('<Tag Name="%s" TagType="Base" DataType="%s">\n' % (name, datatype))
+        f.write('<Data Format="Decorated">\n<Structure DataType="%s">\n' % (datatype))
+        for member, member_type, value in members:
+            f.write('<DataValueMember Name="%s" DataType="%s" Value="%s"/>\n'
+                    % (member, member_type, value))
+        f.write('</Structure>\n</Data>\n</Tag>\n')
+
+    ####################################################
+    #
+    # WRITE A BIG DINT ARRAY TAG
+    # obs: mostly zeros with runs of repeated values,
+    #      as raw little endian data and as Decorated
+    #      elements
+    ###################################################
+    def write_array_tag(self, f, name):
+        values = []
+        while len(values) < self.array_size:
+            value = 0 if self.rng.random() < 0.7 else self.rng.randrange(-1000, 1000)
+            values += [value] * self.rng.randrange(1, 50)
+        values = values[:self.array_size]
+        f.write('<Tag Name="%s" TagType="Base" DataType="DINT" Dimensions="%d" Radix="Decimal">\n'
+                % (name, self.array_size))
+        f.write('<Data>%s</Data>\n' % (' '.join('%02X' % (byte) for value in values
+                for byte in (value & 0xFFFFFFFF).to_bytes(4, 'little'))))
+        f.write('<Data Format="Decorated">\n<Array DataType="DINT" Dimensions="%d" '
+                'Radix="Decimal">\n' % (self.array_size))
+        for i, value in enumerate(values):
+            f.write('<Element Index="[%d]" Value="%d"/>\n' % (i, value))
+        f.write('</Array>\n</Data>\n</Tag>\n')
+
+    def write_program(self, f, program):
+        f.write('<Program Name="P%d" MainRoutineName="P%d_R%d">\n<Tags>\n'
+                % (program, program, self.routines - 1))
+        for i in range(self.program_tags):
+            if i % 2 == 0:
+                self.write_value_tag(f, 'P%d_L%d' % (program, i), 'BOOL', 0)
+            else:
+                self.write_value_tag(f, 'P%d_L%d' % (program, i), 'DINT', 0)
+        f.write('</Tags>\n<Routines>\n')
+        operands = self.operands(program)
+        for routine in range(self.routines):
+            f.write('<Routine Name="P%d_R%d" Type="RLL">\n<RLLContent>\n' % (program, routine))
+            for number in range(self.rungs):
+                f.write('<Rung Number="%d" Type="N">\n<Text>\n<![CDATA[%s]]>\n</Text>\n</Rung>\n'
+                        % (number, self.rung(operands, program, routine)))
+            f.write('</RLLContent>\n</Routine>\n')
+        f.write('</Routines>\n</Program>\n')
+
+
+####################################################
+#
+# PARSE AN INSTRUCTION MIX
+# obs: NAME=WEIGHT pairs separated by commas.
+#      Instructions that are not listed are not used
+###################################################
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip().upper()
+        if name not in reserved:
+            raise ValueError("unknown instruction %s" % (name))
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+####################################################
+#
+# MAIN SCRIPT FOR COMMAND LINE EXECUTION
+#
+###################################################
+def main():
+    description = "Generates a synthetic L5X export"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("output")
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('--programs', type=int, default=1)
+    parser.add_argument('--routines', type=int, default=1,
+                            help="routines of each program")
+    parser.add_argument('--rungs', type=int, default=10,
+                            help="rungs of each routine")
+    parser.add_argument('--depth', type=int, default=2,
+                            help="nesting depth of the branches")
+    parser.add_argument('--mix',
+                            help="instruction weights as NAME=WEIGHT,... "
+                                 "(default: every instruction once)")
+    parser.add_argument('--controller-tags', type=int, default=50)
+    parser.add_argument('--program-tags', type=int, default=10,
+                            help="tags of each program")
+    parser.add_argument('--arrays', type=int, default=0,
+                            help="number of big DINT array tags")
+    parser.add_argument('--array-size', type=int, default=1000)
+    parser.add_argument('--udts', type=int, default=0,
+                            help="number of user defined types, each with a tag")
+    parser.add_argument('--udt-depth', type=int, default=2,
+                            help="nesting of the user defined types")
+    
+    args = vars(parser.parse_args())
+    try:
+        mix = parse_mix(args['mix']) if args['mix'] else None
+        generator = L5XGenerator(args['seed'], args['programs'], args['routines'],
+                                 args['rungs'], args['depth'], mix,
+                                 args['controller_tags'], args['program_tags'],
+                                 args['arrays'], args['array_size'],
+                                 args['udts'], args['udt_depth'])
+    except ValueError as e:
+        parser.error(str(e))
+    with open(args['output'], 'w') as f:
+        generator.write(f)
+    
+if __name__== "__main__":
+    main()
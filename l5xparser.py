@@ -30,7 +30,21 @@ import sys
 import logging
 import argparse
 import traceback
-from xml.dom.minidom import parse
+from io import BytesIO
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+from xml.etree.ElementTree import iterparse
+from tagmodel import ValueNode
+from tagmodel import StructNode
+from tagmodel import ArrayNode
+from tagmodel import atomic_typecodes
+from tagmodel import intern
+from tagmodel import parse_value
+from tagmodel import parse_dimensions
+from tagmodel import flat_index
+from tagmodel import build_atomic_elements
+from tagmodel import raw_datatypes
+from tagmodel import decode_raw
 
 class l5xparser():
     ####################################################
@@ -41,22 +55,158 @@ class l5xparser():
 
     constructs = ['tags', 'programs', 'routines', 'rungs']
 
+    ####################################################
+    #
+    # raw_data: decode the raw hex Data of atomic array
+    #           tags instead of their Decorated Elements
+    ###################################################
+    def __init__(self, raw_data=False):
+        self.raw_data = raw_data
+
+    ####################################################
+    #
+    # STREAM THE XML FILE USING ITERPARSE
+    # obs: yields one record for each Tag, DataType,
+    #      Program and Routine. Every subtree is freed
+    #      as soon as it has been converted, so memory
+    #      grows with the largest element, not the file.
+    #      'kinds' restricts the records that are built
+    ###################################################
+    record_kinds = ('tags', 'tag', 'datatype', 'program', 'routine')
+    def iterparse_l5x(self, filename, kinds=record_kinds):
+        path = []
+        program = None
+        scope = None
+        keep = None
+        rungs = None
+        rung_info = None
+        raw_array = None
+        raw_elements = None
+        for event, node in iterparse(filename, events=('start', 'end')):
+            if event == 'start':
+                parent = path[-1].tag if len(path) > 0 else None
+                grandparent = path[-2].tag if len(path) > 1 else None
+                path.append(node)
+                if keep is not None:
+                    continue
+                if node.tag == 'Program' and parent == 'Programs':
+                    program = node.get('Name')
+                    if 'program' in kinds:
+                        yield ('program', program, node.get('MainRoutineName'))
+                elif node.tag == 'Tags':
+                    if parent == 'Controller':
+                        scope = 'Controller'
+                        if 'tags' in kinds:
+                            yield ('tags', scope, None)
+                    elif parent == 'Program':
+                        scope = 'Program'
+                        if 'tags' in kinds:
+                            yield ('tags', scope, program)
+                    else:
+                        scope = None
+                        logging.warning("Unsupported parent tag: %s" % (parent))
+                elif (node.tag == 'Tag' and parent == 'Tags'
+                        and scope is not None and 'tag' in kinds):
+                    keep = node
+                    if self.raw_data:
+                        raw_array = self.raw_array_info(node)
+                elif (node.tag == 'DataType' and parent == 'DataTypes'
+                        and 'datatype' in kinds):
+                    keep = node
+                elif (node.tag == 'Routine' and parent == 'Routines'
+                        and grandparent == 'Program' and 'routine' in kinds):
+                    keep = node
+                    rungs = []
+                    rung_info = []
+            else:
+                path.pop()
+                if node is keep:
+                    keep = None
+                    if node.tag == 'Tag':
+                        if raw_elements is not None:
+                            tagname = node.get('Name')
+                            result = ArrayNode(raw_array[0], raw_array[1], raw_elements)
+                        else:
+                            tagname, result = self.build_tag(node)
+                        raw_array = None
+                        raw_elements = None
+                        if result is not None:
+                            yield ('tag', scope, program, tagname, result)
+                    elif node.tag == 'DataType':
+                        yield ('datatype', node.get('Name'), self.build_datatype(node))
+                    elif node.tag == 'Routine':
+                        yield ('routine', program, node.get('Name'), rungs, rung_info)
+                        rungs = None
+                        rung_info = None
+                elif rungs is not None and node.tag == 'Rung':
+                    if path[-1].tag == 'RLLContent':
+                        for text in self.build_rung(node):
+                            rungs.append(text)
+                            rung_info.append(self.build_rung_info(node))
+                elif raw_array is not None and node.tag == 'Data' and path[-1] is keep:
+                    if node.get('Format') is None:
+                        raw_elements = self.build_raw_elements(raw_array, node)
+                    elif raw_elements is None:
+                        continue
+                elif raw_elements is not None and node.tag == 'Element':
+                    pass
+                elif keep is not None:
+                    continue
+                elif node.tag == 'Program':
+                    program = None
+                elif node.tag == 'Tags':
+                    scope = None
+                node.clear()
+                if len(path) > 0:
+                    path[-1].remove(node)
+
 
     ####################################################
     #
-    # PARSE XML FILE USING DOM
-    # obs: avoids parsing again if already parsed
+    # INDEX PROGRAMS, ROUTINES AND RUNGS IN ONE PASS
+    # obs: avoids indexing again if already indexed
     ###################################################
     old_filename = None
-    old_dom = None
-    def parse_xml(self, filename):
+    old_index = None
+    def index_programs(self, filename):
         if filename == self.old_filename:
-            return self.old_dom
+            return self.old_index
         else:
+            index = {}
+            for record in self.iterparse_l5x(filename, ('program', 'routine')):
+                self.add_program_record(index, record)
             self.old_filename = filename
-            self.old_dom = parse(filename)
-            return self.old_dom
+            self.old_index = index
+            return self.old_index
 
+    ####################################################
+    #
+    # ADD A PROGRAM RECORD TO THE PROGRAMS INDEX
+    #
+    ###################################################
+    def add_program_record(self, index, record):
+        if record[0] == 'program':
+            index[record[1]] = {}
+            index[record[1]]['main_routine'] = record[2]
+            index[record[1]]['routines'] = {}
+        elif record[0] == 'routine':
+            routines = index[record[1]]['routines']
+            routines[record[2]] = {}
+            routines[record[2]]['rungs'] = record[3]
+            routines[record[2]]['rung_info'] = record[4]
+
+    ####################################################
+    #
+    # RETURNS THE LIST OF TAGS IN THE CONTROLLER
+    # OR IN THE PROGRAM
+    ###################################################
+    def list_tags(self, args):
+        tags = self.parse_l5x_tags(args['filename'])
+        program_name = args.get('program')
+        if (program_name is None):
+            return list(tags.get('Controller', {}).keys())
+        
+        return list(tags.get('Programs', {}).get(program_name, {}).keys())
 
     ####################################################
     #
@@ -64,13 +214,7 @@ class l5xparser():
     #
     ###################################################
     def list_programs(self, args):
-        dom = self.parse_xml(args['filename'])
-        program_list = []
-        for programs in dom.getElementsByTagName("Programs"):
-            for program in programs.getElementsByTagName("Program"):
-                program_list.append(program.getAttribute("Name"))
-        
-        return program_list
+        return list(self.index_programs(args['filename']).keys())
 
 
 
@@ -85,16 +229,11 @@ class l5xparser():
         if (program_name is None):
             raise Exception("Define the working program to list the routines")
         
-        dom = self.parse_xml(args['filename'])
-        routine_list = []
-        for programs in dom.getElementsByTagName("Programs"):
-            for program in programs.getElementsByTagName("Program"):
-                if (program.getAttribute("Name") == program_name):
-                    for routines in program.getElementsByTagName("Routines"):
-                        for routine in routines.getElementsByTagName("Routine"):
-                            routine_list.append(routine.getAttribute("Name"))
+        index = self.index_programs(args['filename'])
+        if program_name not in index:
+            return []
         
-        return routine_list
+        return list(index[program_name]['routines'].keys())
 
     ####################################################
     #
@@ -110,32 +249,47 @@ class l5xparser():
         if (routine_name is None):
             raise Exception("Define the working routine to list the rungs")
         
-        dom = self.parse_xml(args['filename'])
-        rung_list = []
-        for programs in dom.getElementsByTagName("Programs"):
-            for program in programs.getElementsByTagName("Program"):
-                if (program.getAttribute("Name") == program_name):
-                    for routines in program.getElementsByTagName("Routines"):
-                        for routine in routines.getElementsByTagName("Routine"):
-                            if (routine.getAttribute("Name") == routine_name):
-                                for rll in routine.getElementsByTagName("RLLContent"):
-                                    for rung in rll.getElementsByTagName("Rung"):
-                                        for text in rung.getElementsByTagName("Text"):
-                                            rung_list.append(text.firstChild.wholeText.strip())
+        index = self.index_programs(args['filename'])
+        if program_name not in index:
+            return []
+        
+        routines = index[program_name]['routines']
+        if routine_name not in routines:
+            return []
         
-        return rung_list
+        return list(routines[routine_name]['rungs'])
 
     ####################################################
     #
-    # BUILD A VALUE MEMBER
+    # BUILD THE TEXT LIST OF A RUNG
     #
     ###################################################
-    def build_value_member(self, member):
+    def build_rung(self, rung):
+        text_list = []
+        for text in rung.findall('Text'):
+            text_list.append(text.text.strip())
+        return text_list
+
+    ####################################################
+    #
+    # BUILD THE NUMBER AND TYPE OF A RUNG
+    #
+    ###################################################
+    def build_rung_info(self, rung):
         return {
-            'type': member.getAttribute('DataType'),
-            'data': member.getAttribute('Value')
+            'number': rung.get('Number'),
+            'type': rung.get('Type')
         }
 
+    ####################################################
+    #
+    # BUILD A VALUE MEMBER
+    #
+    ###################################################
+    def build_value_member(self, member):
+        datatype = intern(member.get('DataType'))
+        return ValueNode(datatype, parse_value(datatype, member.get('Value')))
+
     ####################################################
     #
     # PROCESS DATA STRUCTURE
@@ -143,58 +297,49 @@ class l5xparser():
     ###################################################
     def process_data_structure(self, node, tagtype):
         entry = None
-        for content in node.childNodes:
-            if content.nodeType == content.ELEMENT_NODE:                            
-                if content.getAttribute('DataType') == tagtype:
-                    if content.tagName == 'Structure':
-                        entry = {}
-                        entry['type'] = 'struct'
-                        entry['data'] = self.build_structure_member(content)
-                    elif content.tagName == 'DataValue':
-                        entry = {}
-                        entry['type'] = 'value'
-                        entry['data'] = self.build_value_member(content)
-                    elif content.tagName == 'Array':
-                        entry = {}
-                        entry['type'] = 'array'
-                        entry['data'] = self.build_array_member(content)
+        for content in node:
+            if content.get('DataType') == tagtype:
+                if content.tag == 'Structure':
+                    entry = self.build_structure_member(content)
+                elif content.tag == 'DataValue':
+                    entry = self.build_value_member(content)
+                elif content.tag == 'Array':
+                    entry = self.build_array_member(content)
         return entry
         
 
     ####################################################
     #
     # BUILD AN ARRAY MEMBER
-    #
+    # obs: atomic elements are kept in a typed buffer
     ###################################################
     def build_array_member(self, member):
         
-        data = {}
-        datatype = member.getAttribute('DataType')
-        for element in member.getElementsByTagName('Element'):
-            index = int(element.getAttribute('Index')[1:-1])
-            if element.hasAttribute('Value'):
-                data[index] = {
-                    'type': 'value',
-                    'data': {
-                        'type': datatype,
-                        'data': element.getAttribute('Value')
-                    }
-                }
-            else:
-                for structure in element.getElementsByTagName('Structure'):
-                    if structure.getAttribute('DataType') == datatype:
-                        data[index] = {
-                            'type': 'struct',
-                            'data': self.build_structure_member(structure)
-                        }
+        datatype = intern(member.get('DataType'))
+        dimensions = parse_dimensions(member.get('Dimensions'))
+        length = 1
+        for dimension in dimensions:
+            length *= dimension
         
-        array = {
-            'type': member.getAttribute('DataType'),
-            'dimensions': member.getAttribute('Dimensions'),
-            'data': data
-        }
+        if datatype in atomic_typecodes:
+            values = []
+            for element in member.findall('Element'):
+                index = flat_index(element.get('Index'), dimensions)
+                values.append((index, parse_value(datatype, element.get('Value'))))
+            elements = build_atomic_elements(datatype, length, values)
+            if elements is None:
+                elements = [None] * length
+                for index, value in values:
+                    elements[index] = ValueNode(datatype, value)
+        else:
+            elements = [None] * length
+            for element in member.findall('Element'):
+                index = flat_index(element.get('Index'), dimensions)
+                for structure in element.findall('Structure'):
+                    if structure.get('DataType') == datatype:
+                        elements[index] = self.build_structure_member(structure)
         
-        return array
+        return ArrayNode(datatype, dimensions, elements)
 
     ####################################################
     #
@@ -204,35 +349,118 @@ class l5xparser():
     def build_structure_member(self, member):
         
         data = {}
-        for field in member.childNodes:
-            if field.nodeType == field.ELEMENT_NODE:
-                fieldname = field.getAttribute('Name')
-                tagname = field.tagName
-                if tagname == 'DataValueMember':
-                    data[fieldname] = {
-                        'type': 'value',
-                        'data': self.build_value_member(field)
-                    }
-                elif tagname == 'ArrayMember':
-                    data[fieldname] = {
-                        'type': 'array',
-                        'data': self.build_array_member(field)
-                    }
-                elif tagname == 'StructureMember':
-                    data[fieldname] = {
-                        'type': 'struct',
-                        'data': self.build_structure_member(field)
-                    }
-                else:
-                    logging.warning("Unsupported field type %s. Field %s was ignored" % (tagname,fieldname))
+        for field in member:
+            fieldname = intern(field.get('Name'))
+            tagname = field.tag
+            if tagname == 'DataValueMember':
+                data[fieldname] = self.build_value_member(field)
+            elif tagname == 'ArrayMember':
+                data[fieldname] = self.build_array_member(field)
+            elif tagname == 'StructureMember':
+                data[fieldname] = self.build_structure_member(field)
+            else:
+                logging.warning("Unsupported field type %s. Field %s was ignored" % (tagname,fieldname))
         
+        return StructNode(intern(member.get('DataType')), data)
+
+    ####################################################
+    #
+    # DATATYPE AND DIMENSIONS OF A RAW ARRAY TAG
+    # obs: None if the tag can not use the raw data
+    ###################################################
+    def raw_array_info(self, tag):
+        datatype = tag.get('DataType')
+        dimensions = tag.get('Dimensions')
+        if datatype not in raw_datatypes or not dimensions:
+            return None
+        dimensions = parse_dimensions(dimensions)
+        length = 1
+        for dimension in dimensions:
+            length *= dimension
+        return (intern(datatype), dimensions, length)
+
+    ####################################################
+    #
+    # BUILD THE ELEMENTS OF A RAW ARRAY TAG
+    # obs: None if the raw data does not fit the tag
+    ###################################################
+    def build_raw_elements(self, raw_array, data):
+        elements = decode_raw(raw_array[0], raw_array[2], data.text)
+        if elements is None:
+            logging.warning("Raw data of a %s array does not fit. Using Decorated Data." % (raw_array[0]))
+        return elements
+
+    ####################################################
+    #
+    # BUILD A TAG ENTRY
+    # obs: returns None as the entry for ignored tags
+    ###################################################
+    def build_tag(self, tag):
+        tagname = tag.get('Name')
+        tagtype = tag.get('DataType')
+        tagdata = None
+        for data in tag.findall('Data'):
+            if data.get('Format') == 'Decorated':
+                tagdata = data
+                break
+                
+        if tagdata is None:
+            logging.warning("Tag %s has no Decorated Data. Ignored." % (tagname))
+            return tagname, None
+            
+        result = self.process_data_structure(tagdata, tagtype)
         
-        structure = {
-            'type': member.getAttribute('DataType'),
-            'data': data
-        }
+        if result is None:
+            logging.warning("Unsupported tag type %s. Tag %s was ignored." % (tagtype, tagname))
+        
+        return tagname, result
+
+    ####################################################
+    #
+    # BUILD A DATATYPE ENTRY
+    #
+    ###################################################
+    def build_datatype(self, datatype):
+        entry = {}
+        for members in datatype.findall('Members'):
+            entry['members'] = {}
+            members_dict = entry['members']
+            for member in members.findall('Member'):
+                members_dict[member.get('Name')] = {
+                    'type': member.get('DataType', ''),
+                    'dimension': member.get('Dimension', ''),
+                    'radix': member.get('Radix', ''),
+                }
+        
+        for dependencies in datatype.findall('Dependencies'):
+            entry['dependencies'] = {}
+            dependencies_dict = entry['dependencies']
+            for dependency in dependencies.findall('Dependency'):
+                dependencies_dict[dependency.get('Name')] = {
+                    'type': dependency.get('Type', ''),
+                }
+        
+        return entry
+
+    ####################################################
+    #
+    # ADD A TAG RECORD TO THE TAGS DICT
+    #
+    ###################################################
+    def add_tag_record(self, l5x_tags, record):
+        if record[1] == 'Controller':
+            if record[0] == 'tags':
+                l5x_tags['Controller'] = {}
+            entry = l5x_tags['Controller']
+        else:
+            if not 'Programs' in l5x_tags:
+                l5x_tags['Programs'] = {}
+            if record[0] == 'tags':
+                l5x_tags['Programs'][record[2]] = {}
+            entry = l5x_tags['Programs'][record[2]]
         
-        return structure
+        if record[0] == 'tag':
+            entry[record[3]] = record[4]
 
 
     ####################################################
@@ -241,43 +469,10 @@ class l5xparser():
     #
     ###################################################
     def parse_l5x_tags(self, filename):
-        dom = self.parse_xml(filename)
         l5x_tags = {}
-        
-        for tags in dom.getElementsByTagName("Tags"):
-            parent_tag = tags.parentNode.tagName
-            entry = None
-            if (parent_tag == 'Controller'):
-                l5x_tags['Controller'] = {}
-                entry = l5x_tags['Controller']
-            elif (parent_tag == 'Program'):
-                if not 'Programs' in l5x_tags:
-                    l5x_tags['Programs'] = {}
-                l5x_tags['Programs'][tags.parentNode.getAttribute('Name')] = {}
-                entry = l5x_tags['Programs'][tags.parentNode.getAttribute('Name')]
-            else:
-                loggin.warning("Unsupported parent tag: %s" % (parent_tag))
-            
-            for tag in tags.getElementsByTagName('Tag'):
-                tagname = tag.getAttribute('Name')
-                tagtype = tag.getAttribute('DataType')
-                tagdata = None
-                for data in tag.getElementsByTagName('Data'):
-                    if data.hasAttribute('Format'):
-                        if data.getAttribute('Format') == 'Decorated':
-                            tagdata = data
-                            break
-                        
-                if tagdata is None:
-                    logging.warning("Tag %s has no Decorated Data. Ignored." % (tagname))
-                    continue
-                    
-                result = self.process_data_structure(tagdata, tagtype)
-                
-                if result is None:
-                    logging.warning("Unsupported tag type %s. Tag %s was ignored." % (tagtype, tagname))
-                else:
-                    entry[tagname] = result
+        for record in self.iterparse_l5x(filename, ('tags', 'tag')):
+            if record[0] in ('tags', 'tag'):
+                self.add_tag_record(l5x_tags, record)
                     
         return l5x_tags
 
@@ -287,58 +482,273 @@ class l5xparser():
     #
     ###################################################
     def parse_l5x_datatypes(self, filename):
-        dom = self.parse_xml(filename)
         l5x_datatypes = {}
-        for datatypes in dom.getElementsByTagName('DataTypes'):
-            for datatype in datatypes.getElementsByTagName('DataType'):
-                datatype_name = datatype.getAttribute('Name')
-                l5x_datatypes[datatype_name] = {}
-                for members in datatype.getElementsByTagName('Members'):
-                    l5x_datatypes[datatype_name]['members'] = {}
-                    members_dict = l5x_datatypes[datatype_name]['members']
-                    for member in members.getElementsByTagName('Member'):
-                        members_dict[member.getAttribute('Name')] = {
-                            'type': member.getAttribute('DataType'),
-                            'dimension': member.getAttribute('Dimension'),
-                            'radix': member.getAttribute('Radix'),
-                        }
-                
-                for dependencies in datatype.getElementsByTagName('Dependencies'):
-                    l5x_datatypes[datatype_name]['dependencies'] = {}
-                    dependencies_dict = l5x_datatypes[datatype_name]['dependencies']
-                    for dependency in dependencies.getElementsByTagName('Dependency'):
-                        dependencies_dict[dependency.getAttribute('Name')] = {
-                            'type': dependency.getAttribute('Type'),
-                        }
+        for record in self.iterparse_l5x(filename, ('datatype',)):
+            if record[0] == 'datatype':
+                l5x_datatypes[record[1]] = record[2]
                         
         return l5x_datatypes
 
     ####################################################
     #
     # RETURNS A DICT CONTAINING ALL PROGRAMS
-    #
+    # obs: tags, datatypes and programs are collected
+    #      in a single pass over the file, which also
+    #      fills the programs index
     ###################################################
     def parse(self, filename):
         l5x_data = {}
-        args = {}
-        args['filename'] = filename
-        l5x_data['tags'] = self.parse_l5x_tags(filename)
-        l5x_data['datatypes'] = self.parse_l5x_datatypes(filename)
+        l5x_data['tags'] = {}
+        l5x_data['datatypes'] = {}
         l5x_data['programs'] = {}
-        for program_name in self.list_programs(args):
-            args['program'] = program_name
-            programs = l5x_data['programs']
-            programs[program_name] = {}
-            program = programs[program_name]
-            program['routines'] = {}
-            for routine_name in self.list_routines(args):
-                args['routine'] = routine_name
-                routines = program['routines']
-                routines[routine_name] = {}
-                routine = routines[routine_name]
-                routine['rungs'] = self.list_rungs(args)
+        for record in self.iterparse_l5x(filename):
+            kind = record[0]
+            if kind in ('tags', 'tag'):
+                self.add_tag_record(l5x_data['tags'], record)
+            elif kind == 'datatype':
+                l5x_data['datatypes'][record[1]] = record[2]
+            else:
+                self.add_program_record(l5x_data['programs'], record)
+        self.old_filename = filename
+        self.old_index = l5x_data['programs']
         return l5x_data
     
+####################################################
+#
+# LAZY ROUTINE OF A L5X PROJECT
+# obs: rungs are parsed when first accessed
+###################################################
+class L5XRoutine():
+    def __init__(self, project, program, name, block):
+        self.project = project
+        self.program = program
+        self.name = name
+        self.block = block
+        self._rungs = None
+        self._rung_info = None
+
+    def load(self):
+        self._rungs = []
+        self._rung_info = []
+        context = [('Programs', None), ('Program', self.program), ('Routines', None)]
+        for record in self.project.iterparse_block(self.block, context, ('routine',)):
+            self._rungs.extend(record[3])
+            self._rung_info.extend(record[4])
+
+    @property
+    def rungs(self):
+        if self._rungs is None:
+            self.load()
+        return self._rungs
+
+    @property
+    def rung_info(self):
+        if self._rung_info is None:
+            self.load()
+        return self._rung_info
+
+
+####################################################
+#
+# LAZY PROGRAM OF A L5X PROJECT
+# obs: program tags are parsed when first accessed
+###################################################
+class L5XProgram():
+    def __init__(self, project, name, block, main_routine=None):
+        self.project = project
+        self.name = name
+        self.block = block
+        self.main_routine = main_routine
+        self.tags_block = None
+        self.routines = {}
+        self._tags = None
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = {}
+            if self.tags_block is not None:
+                context = [('Programs', None), ('Program', self.name)]
+                for record in self.project.iterparse_block(self.tags_block, context, ('tag',)):
+                    self._tags[record[3]] = record[4]
+        return self._tags
+
+
+####################################################
+#
+# A PROGRAM OR ROUTINE SELECTED BY -p/-r THAT IS
+# NOT IN THE EXPORT
+###################################################
+class SelectionError(LookupError):
+    pass
+
+####################################################
+#
+# LAZY VIEW OF A L5X FILE
+# obs: a first scan only records the byte offsets of
+#      the DataTypes, Tags, Program and Routine blocks.
+#      Each block is parsed when it is first accessed
+###################################################
+class L5XProject():
+    def __init__(self, filename, raw_data=False):
+        self.filename = filename
+        self.parser = l5xparser(raw_data)
+        self.datatypes_block = None
+        self.tags_block = None
+        self.programs = {}
+        self._datatypes = None
+        self._tags = None
+        self.scan()
+
+    ####################################################
+    #
+    # RECORD THE BYTE OFFSETS OF EACH BLOCK
+    #
+    ###################################################
+    def scan(self):
+        path = []
+        starts = []
+        names = {'Program': None, 'Routine': None}
+        parser = expat.ParserCreate()
+
+        def start_element(name, attrs):
+            parent = path[-1] if len(path) > 0 else None
+            grandparent = path[-2] if len(path) > 1 else None
+            path.append(name)
+            starts.append(parser.CurrentByteIndex)
+            if name == 'Program' and parent == 'Programs':
+                names['Program'] = attrs.get('Name')
+                program = L5XProgram(self, names['Program'], None, attrs.get('MainRoutineName'))
+                self.programs[program.name] = program
+            elif name == 'Routine' and parent == 'Routines' and grandparent == 'Program':
+                names['Routine'] = attrs.get('Name')
+                program = self.programs[names['Program']]
+                routine = L5XRoutine(self, program.name, names['Routine'], None)
+                program.routines[routine.name] = routine
+
+        def end_element(name):
+            path.pop()
+            block = (starts.pop(), parser.CurrentByteIndex, name)
+            parent = path[-1] if len(path) > 0 else None
+            grandparent = path[-2] if len(path) > 1 else None
+            if name == 'DataTypes' and parent == 'Controller':
+                self.datatypes_block = block
+            elif name == 'Tags' and parent == 'Controller':
+                self.tags_block = block
+            elif name == 'Tags' and parent == 'Program':
+                self.programs[names['Program']].tags_block = block
+            elif name == 'Program' and parent == 'Programs':
+                self.programs[names['Program']].block = block
+            elif name == 'Routine' and parent == 'Routines' and grandparent == 'Program':
+                program = self.programs[names['Program']]
+                program.routines[names['Routine']].block = block
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        with open(self.filename, 'rb') as f:
+            parser.ParseFile(f)
+
+    ####################################################
+    #
+    # READ THE BYTES OF A BLOCK
+    # obs: the end offset points to the closing tag, or
+    #      just past the element if it is empty
+    ###################################################
+    def read_block(self, block):
+        closing = ('</%s' % (block[2])).encode('utf-8')
+        with open(self.filename, 'rb') as f:
+            f.seek(block[0])
+            data = f.read(block[1] - block[0])
+            tail = f.read(len(closing))
+            if tail != closing:
+                return data
+            while not tail.endswith(b'>'):
+                char = f.read(1)
+                if len(char) == 0:
+                    break
+                tail += char
+            return data + tail
+
+    ####################################################
+    #
+    # STREAM THE RECORDS OF A BLOCK
+    # obs: the block is wrapped in its enclosing elements
+    #      so l5xparser sees the same context as in the
+    #      whole file
+    ###################################################
+    def iterparse_block(self, block, context, kinds):
+        prefix = ''
+        suffix = ''
+        for tag, name in context:
+            if name is None:
+                prefix += '<%s>' % (tag)
+            else:
+                prefix += '<%s Name=%s>' % (tag, quoteattr(name))
+            suffix = '</%s>' % (tag) + suffix
+        data = prefix.encode('utf-8') + self.read_block(block) + suffix.encode('utf-8')
+        return self.parser.iterparse_l5x(BytesIO(data), kinds)
+
+    @property
+    def datatypes(self):
+        if self._datatypes is None:
+            self._datatypes = {}
+            if self.datatypes_block is not None:
+                context = [('Controller', None)]
+                for record in self.iterparse_block(self.datatypes_block, context, ('datatype',)):
+                    self._datatypes[record[1]] = record[2]
+        return self._datatypes
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = {}
+            if self.tags_block is not None:
+                context = [('Controller', None)]
+                for record in self.iterparse_block(self.tags_block, context, ('tag',)):
+                    self._tags[record[3]] = record[4]
+        return self._tags
+
+    ####################################################
+    #
+    # RETURNS A DICT WITH THE SELECTED PROGRAMS
+    # obs: same layout as l5xparser.parse; only the
+    #      selected blocks are parsed
+    ###################################################
+    def parse(self, program_names=None, routine_names=None):
+        if program_names is None:
+            program_names = list(self.programs.keys())
+        
+        l5x_data = {}
+        l5x_data['tags'] = {}
+        l5x_data['tags']['Controller'] = self.tags
+        l5x_data['tags']['Programs'] = {}
+        l5x_data['datatypes'] = self.datatypes
+        l5x_data['programs'] = {}
+        for program_name in program_names:
+            if program_name not in self.programs:
+                raise SelectionError("Program %s not found" % (program_name))
+            program = self.programs[program_name]
+            if program.tags_block is not None:
+                l5x_data['tags']['Programs'][program_name] = program.tags
+            l5x_data['programs'][program_name] = {}
+            l5x_data['programs'][program_name]['main_routine'] = program.main_routine
+            l5x_data['programs'][program_name]['routines'] = {}
+            routines = l5x_data['programs'][program_name]['routines']
+            for routine_name in program.routines:
+                if routine_names is not None and routine_name not in routine_names:
+                    continue
+                routine = program.routines[routine_name]
+                routines[routine_name] = {}
+                routines[routine_name]['rungs'] = routine.rungs
+                routines[routine_name]['rung_info'] = routine.rung_info
+        if routine_names is not None:
+            found = set(routine_name for program in l5x_data['programs'].values()
+                        for routine_name in program['routines'])
+            for routine_name in routine_names:
+                if routine_name not in found:
+                    raise SelectionError("Routine %s not found" % (routine_name))
+        return l5x_data
+
 ####################################################
 #
 # MAIN SCRIPT FOR COMMAND LINE EXECUTION
@@ -349,18 +759,18 @@ def main():
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument("filename")
     parser.add_argument('-p', '--program', help="define the working program")
-    parser.add_argument('-r', '--routine', help="define the working program")
+    parser.add_argument('-r', '--routine', help="define the working routine")
     parser.add_argument('-L', '--list', dest='construct',
                             help='print the selected program constructs',
-                            choices=constructs)
+                            choices=l5xparser.constructs)
   
     args = vars(parser.parse_args())
     try:
+        l5x = l5xparser()
         if (args['construct']):
-            print(globals()["list_"+args['construct']](args))
+            print(getattr(l5x, "list_"+args['construct'])(args))
         else:
-            l5xparser = l5xparser()
-            print(l5xparser.parse(args['filename'])['tags'])
+            print(l5x.parse(args['filename'])['tags'])
     except Exception as e:
         print(str(e))
         traceback.print_exc()
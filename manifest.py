@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import json
+import hashlib
+
+####################################################
+#
+# MANIFEST OF GENERATED C FRAGMENTS
+# obs: each fragment of the C file is stored with the
+#      hash of everything it was generated from. A
+#      fragment is only built again when that hash
+#      changes. Without a path every fragment is built
+###################################################
+class Manifest():
+    format_version = 1
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.old = {}
+        self.new = {}
+        self.built = 0
+        self.reused = 0
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                content = json.load(f)
+            if content.get('format') == self.format_version:
+                self.old = content['fragments']
+
+    ####################################################
+    #
+    # RETURN THE CODE OF A FRAGMENT
+    # obs: build is only called if the hash changed
+    ###################################################
+    def fragment(self, key, digest, build):
+        if self.is_current(key, digest):
+            self.reused += 1
+            code = self.old[key]['code']
+        else:
+            self.built += 1
+            code = build()
+        if self.path is not None:
+            self.new[key] = {'hash': digest, 'code': code}
+        return code
+
+    ####################################################
+    #
+    # TRUE IF THE STORED FRAGMENT CAN BE REUSED
+    #
+    ###################################################
+    def is_current(self, key, digest):
+        entry = self.old.get(key)
+        return entry is not None and entry['hash'] == digest
+
+    def save(self):
+        if self.path is None:
+            return
+        with open(self.path, 'w') as f:
+            json.dump({'format': self.format_version, 'fragments': self.new}, f)
+
+    def report(self):
+        return ('Incremental: %d fragments built, %d reused' %
+                (self.built, self.reused))
+
+
+####################################################
+#
+# HASH A SEQUENCE OF STRINGS
+#
+###################################################
+def digest_text(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
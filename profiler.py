@@ -0,0 +1,189 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import json
+import time
+import heapq
+import tracemalloc
+from contextlib import contextmanager
+from rungfast import tokenize
+
+####################################################
+#
+# PROFILE OF A TRANSLATION
+# obs: each phase records its wall time, CPU time and
+#      the peak memory allocated while it runs, traced
+#      by tracemalloc. Phases must not be nested. A
+#      disabled profiler measures nothing
+###################################################
+class Profiler():
+    def __init__(self, enabled=True, slowest=10):
+        self.enabled = enabled
+        self.slowest = slowest
+        self.phases = {}
+        self.routines = []
+        self.rungs = []
+        self.counters = {'rungs': 0, 'translated': 0, 'cache_hits': 0, 'tokens': 0, 'bytes': 0}
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    ####################################################
+    #
+    # MEASURE A PHASE
+    # obs: calls of the same phase are added together.
+    #      The measures of this call are also stored in
+    #      record, if given
+    ###################################################
+    @contextmanager
+    def phase(self, name, record=None):
+        if not self.enabled:
+            yield
+            return
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            measures = {
+                'wall': time.perf_counter() - wall,
+                'cpu': time.process_time() - cpu,
+                'peak_bytes': tracemalloc.get_traced_memory()[1] - base,
+            }
+            entry = self.entry(name)
+            entry['calls'] += 1
+            entry['wall'] += measures['wall']
+            entry['cpu'] += measures['cpu']
+            entry['peak_bytes'] = max(entry['peak_bytes'], measures['peak_bytes'])
+            if record is not None:
+                record.update(measures)
+
+    def entry(self, name):
+        return self.phases.setdefault(name,
+            {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_bytes': 0})
+
+    ####################################################
+    #
+    # MEASURE THE RUNGS OF A ROUTINE
+    # obs: a processRungs phase that is also reported
+    #      on its own
+    ###################################################
+    @contextmanager
+    def routine(self, program, routine, rungs):
+        record = {'program': program, 'routine': routine, 'rungs': rungs}
+        with self.phase('processRungs', record):
+            yield
+        if self.enabled:
+            self.routines.append(record)
+
+    ####################################################
+    #
+    # RECORD A TRANSLATED RUNG
+    # obs: only the slowest rungs are kept. Rungs
+    #      found in the rung cache are not recorded
+    ###################################################
+    def rung(self, text, seconds, tokens):
+        self.counters['translated'] += 1
+        self.counters['tokens'] += tokens
+        item = (seconds, self.counters['translated'], text, tokens)
+        if len(self.rungs) < self.slowest:
+            heapq.heappush(self.rungs, item)
+        elif seconds > self.rungs[0][0]:
+            heapq.heapreplace(self.rungs, item)
+
+    def report(self, **info):
+        return dict(info, **{
+            'wall': time.perf_counter() - self.start_wall,
+            'cpu': time.process_time() - self.start_cpu,
+            'peak_bytes': tracemalloc.get_traced_memory()[1] if self.enabled else 0,
+            'phases': self.phases,
+            'routines': self.routines,
+            'counters': self.counters,
+            'slowest_rungs': [{'rung': text, 'seconds': seconds, 'tokens': tokens}
+                              for seconds, _, text, tokens in sorted(self.rungs, reverse=True)],
+        })
+
+    def save(self, path, **info):
+        with open(path, 'w') as f:
+            json.dump(self.report(**info), f, indent=2)
+
+
+####################################################
+#
+# TRANSLATOR THAT TIMES EACH RUNG
+# obs: wraps the rung translator of a rung cache, so
+#      only the rungs that are really translated are
+#      timed. The fast lexer, the parser (the fast
+#      path, and PLY with its own lexer for the rungs
+#      the fast path gives up on) and the code
+#      generator are timed in 'lex', 'parse' and
+#      'codegen' phases. Memory is measured by the
+#      enclosing processRungs phase
+###################################################
+class ProfiledTranslator():
+    def __init__(self, translator, profiler):
+        self.translator = translator
+        self.profiler = profiler
+        self.phases = [profiler.phases.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+                       for name in ('lex', 'parse', 'codegen')]
+
+    def translate(self, rung):
+        lex, parse, codegen = self.phases
+        tokens = None
+        seconds = 0.0
+        try:
+            start = time.perf_counter()
+            cpu = time.process_time()
+            tokens = tokenize(rung)
+            seconds += self.add(lex, start, cpu)
+            
+            start = time.perf_counter()
+            cpu = time.process_time()
+            try:
+                tree = self.translator.parse(rung, tokens)
+            finally:
+                seconds += self.add(parse, start, cpu)
+            
+            start = time.perf_counter()
+            cpu = time.process_time()
+            try:
+                return self.translator.generate(tree)
+            finally:
+                seconds += self.add(codegen, start, cpu)
+        finally:
+            self.profiler.rung(rung, seconds, len(tokens) - 1 if tokens else 0)
+
+    def add(self, phase, start, cpu):
+        seconds = time.perf_counter() - start
+        phase['calls'] += 1
+        phase['wall'] += seconds
+        phase['cpu'] += time.process_time() - cpu
+        return seconds
@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+
+################################################################################
+#
+#   RUNG ABSTRACT SYNTAX TREE
+#
+#   The parsers (rungyacc.py and rungfast.py) build the tree below and the C
+#   code is generated from it in a single pass that appends to one buffer.
+#
+#   RUNG            :   inputs (list of input nodes), outputs (output list)
+#   INPUT_BRANCH    :   levels (list of lists of input nodes)
+#   OUTPUT_BRANCH   :   levels (list of (inputs, outputs) pairs)
+#   OUTPUT_LIST     :   list of instructions or a list with one OUTPUT_BRANCH
+#   INSTRUCTION     :   name and operands (strings or a CPT expression)
+#   OPERATION       :   CPT binary operation
+#   GROUP           :   CPT expression between parentheses
+#
+################################################################################
+
+
+####################################################
+#
+# RUNG
+#
+###################################################
+class Rung():
+    __slots__ = ('inputs', 'outputs')
+    
+    def __init__(self, inputs, outputs):
+        self.inputs = inputs
+        self.outputs = outputs
+    
+    def __eq__(self, other):
+        return (isinstance(other, Rung) and self.inputs == other.inputs
+                and self.outputs == other.outputs)
+    
+    def __repr__(self):
+        return 'Rung(%r, %r)' % (self.inputs, self.outputs)
+
+
+####################################################
+#
+# INPUT BRANCH
+# obs: a level is a list of input nodes and may be
+#      empty, as in [,XIC(A)]
+###################################################
+class InputBranch():
+    __slots__ = ('levels',)
+    
+    def __init__(self, levels):
+        self.levels = levels
+    
+    def __eq__(self, other):
+        return isinstance(other, InputBranch) and self.levels == other.levels
+    
+    def __repr__(self):
+        return 'InputBranch(%r)' % (self.levels)
+
+
+####################################################
+#
+# OUTPUT BRANCH
+# obs: a level is an (inputs, outputs) pair
+###################################################
+class OutputBranch():
+    __slots__ = ('levels',)
+    
+    def __init__(self, levels):
+        self.levels = levels
+    
+    def __eq__(self, other):
+        return isinstance(other, OutputBranch) and self.levels == other.levels
+    
+    def __repr__(self):
+        return 'OutputBranch(%r)' % (self.levels)
+
+
+####################################################
+#
+# INPUT OR OUTPUT INSTRUCTION
+# obs: operands keeps only the parameters used by the
+#      code, e.g. TON(T,?,?) -> ('T',)
+###################################################
+class Instruction():
+    __slots__ = ('name', 'operands')
+    
+    def __init__(self, name, operands):
+        self.name = name
+        self.operands = operands
+    
+    def __eq__(self, other):
+        return (isinstance(other, Instruction) and self.name == other.name
+                and self.operands == other.operands)
+    
+    def __repr__(self):
+        return 'Instruction(%r, %r)' % (self.name, self.operands)
+
+
+####################################################
+#
+# CPT BINARY OPERATION
+#
+###################################################
+class Operation():
+    __slots__ = ('operator', 'left', 'right')
+    
+    def __init__(self, operator, left, right):
+        self.operator = operator
+        self.left = left
+        self.right = right
+    
+    def __eq__(self, other):
+        return (isinstance(other, Operation) and self.operator == other.operator
+                and self.left == other.left and self.right == other.right)
+    
+    def __repr__(self):
+        return 'Operation(%r, %r, %r)' % (self.operator, self.left, self.right)
+
+
+####################################################
+#
+# CPT EXPRESSION BETWEEN PARENTHESES
+#
+###################################################
+class Group():
+    __slots__ = ('expression',)
+    
+    def __init__(self, expression):
+        self.expression = expression
+    
+    def __eq__(self, other):
+        return isinstance(other, Group) and self.expression == other.expression
+    
+    def __repr__(self):
+        return 'Group(%r)' % (self.expression)
+
+
+####################################################
+#
+# CONDITIONS OF THE INPUT INSTRUCTIONS THAT ARE
+# PUSHED AND ANDED WITH THE TOP OF THE STACK
+# obs: {0}, {1}... are the operands
+###################################################
+conditions = {
+    'XIC' : '{0}',
+    'XIO' : '!{0}',
+    'EQU' : '{0}=={1}',
+    'GEQ' : '{0}>={1}',
+    'NEQ' : '{0}!={1}',
+    'LEQ' : '{0}<{1}',
+    'GRT' : '{0}>{1}',
+}
+
+####################################################
+#
+# C TEMPLATES OF THE OTHER INSTRUCTIONS
+# obs: {0}, {1}... are the operands. Unsupported
+#      instructions generate no code
+###################################################
+templates = {
+    'ONS' : 'if({0}==acc()){{if(acc()){{pop();push(false);}}}}else{{{0}=acc();}}',
+    'LIM' : 'if(acc()){{if({0}<={2}){{if({0}>={1}||{1}>={2}){{pop();push(false);}}}}'
+            'else{{if({0}<={1}||{1}<={2}){{pop();push(false);}}}}}}',
+    'OTE' : '{0}=acc();',
+    'OTU' : 'if(acc()){0}=0;',
+    'OTL' : 'if(acc()){0}=1;',
+    'RES' : 'if(acc()){0}.ACC=0;',
+    'MOV' : 'if(acc()){1}={0};',
+    'TON' : 'ton(acc(), &{0});',
+    'TOF' : 'tof(acc(), &{0});',
+    'CTU' : 'ctu(acc(), &{0});',
+    'JSR' : 'if(acc()){0}();',
+    'ADD' : 'if(acc()){{{2}={0}+{1};}};',
+    'SUB' : 'if(acc()){{{2}={0}-{1};}};',
+    'DIV' : 'if(acc()){{{2}={0}/{1};}};',
+    'CLR' : 'if(acc()){{{0}=0;}};',
+    'COP' : '',
+    'BTD' : '',
+    'MSG' : '',
+}
+
+for name in conditions:
+    templates[name] = 'push(' + conditions[name] + ');and();'
+
+
+####################################################
+#
+# CODE GENERATION
+# obs: every node is visited once and its code is
+#      appended to out, so long rungs stay linear
+###################################################
+def emit_nodes(nodes, out):
+    for node in nodes:
+        emitters[type(node)](node, out)
+
+def emit_instruction(node, out):
+    if node.name == 'CPT':
+        out.append('if(acc()){%s=' % (node.operands[0]))
+        emit_expression(node.operands[1], out)
+        out.append(';};')
+    else:
+        out.append(templates[node.name].format(*node.operands))
+
+def emit_input_branch(node, out):
+    out.append('push(false);push(true);')
+    for i, level in enumerate(node.levels):
+        if i > 0:
+            out.append('or();push(true);')
+        emit_nodes(level, out)
+    out.append('or();and();')
+
+def emit_output_branch(node, out):
+    out.append('push(acc());')
+    for i, (inputs, outputs) in enumerate(node.levels):
+        if i > 0:
+            out.append('pop();push(acc());')
+        emit_nodes(inputs, out)
+        emit_nodes(outputs, out)
+    out.append('pop();')
+
+def emit_expression(node, out):
+    if isinstance(node, Operation):
+        emit_expression(node.left, out)
+        out.append(node.operator)
+        emit_expression(node.right, out)
+    elif isinstance(node, Group):
+        out.append('(')
+        emit_expression(node.expression, out)
+        out.append(')')
+    else:
+        out.append(node)
+
+emitters = {
+    Instruction : emit_instruction,
+    InputBranch : emit_input_branch,
+    OutputBranch : emit_output_branch,
+}
+
+####################################################
+#
+# GENERATE THE C CODE OF A RUNG
+#
+###################################################
+def generate(rung):
+    out = ['clear();push(true);']
+    emit_nodes(rung.inputs, out)
+    emit_nodes(rung.outputs, out)
+    return ''.join(out)
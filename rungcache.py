@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from rungyacc import translator_version
+
+####################################################
+#
+# CONTENT-ADDRESSED CACHE OF RUNG TRANSLATIONS
+# obs: rungs are keyed by their normalized text and
+#      the version of the translator. Recent
+#      translations are kept in a bounded LRU and,
+#      optionally, in a sqlite file shared by
+#      later runs. Syntax errors are cached as well
+###################################################
+class RungCache():
+    def __init__(self, translator, size=10000, path=None, version=translator_version):
+        self.translator = translator
+        self.size = size
+        self.version = version
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.store = None
+        if path is not None:
+            self.store = sqlite3.connect(path)
+            self.store.execute('CREATE TABLE IF NOT EXISTS rungs '
+                               '(key TEXT PRIMARY KEY, code TEXT)')
+
+    ####################################################
+    #
+    # KEY OF A RUNG
+    # obs: whitespace only separates tokens, so runs of
+    #      whitespace are collapsed
+    ###################################################
+    def key(self, rung):
+        normalized = ' '.join(rung.split())
+        text = self.version + '\0' + normalized
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def remember(self, key, code):
+        self.memory[key] = code
+        if len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    ####################################################
+    #
+    # TRANSLATE A RUNG USING THE CACHE
+    # obs: raises SyntaxError like the translator and
+    #      counts the rungs that raised it
+    ###################################################
+    def translate(self, rung):
+        key = self.key(rung)
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            code = self.memory[key]
+        else:
+            row = None
+            if self.store is not None:
+                row = self.store.execute('SELECT code FROM rungs WHERE key = ?',
+                                         (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                code = row[0]
+            else:
+                self.misses += 1
+                try:
+                    code = self.translator.translate(rung)
+                except SyntaxError:
+                    code = None
+                if self.store is not None:
+                    self.store.execute('INSERT OR REPLACE INTO rungs VALUES (?, ?)',
+                                       (key, code))
+            if self.size > 0:
+                self.remember(key, code)
+        
+        if code is None:
+            self.errors += 1
+            raise SyntaxError
+        return code
+
+    def close(self):
+        if self.store is not None:
+            self.store.commit()
+            self.store.close()
+            self.store = None
+
+    def report(self):
+        return ('Rung cache: %d hits, %d disk hits, %d misses' %
+                (self.hits, self.disk_hits, self.misses))
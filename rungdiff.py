@@ -0,0 +1,273 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import sys
+import time
+import random
+import logging
+import argparse
+import rungfast
+from rungyacc import RungTranslator
+from l5xparser import l5xparser
+from rungfast import input_instructions
+from rungfast import output_instructions
+
+####################################################
+#
+# RANDOM RUNGS FOLLOWING THE GRAMMAR
+# obs: the tokens are joined with random spacing
+###################################################
+tags = ['a', 'b', 'Local:1:I.Data.0', 't.DN', 'x[3].y', 'M.N.2', 'XICA']
+numbers = ['0', '1', '25', '3.5', '.5', '1e3', '2E-2']
+punctuation = ['(', ')', '[', ']', ',', ';', '?', '-', '+', '*', '/']
+parameter_counts = {
+    'XIC' : 1, 'XIO' : 1, 'ONS' : 1, 'LIM' : 3, 'OTE' : 1, 'OTU' : 1,
+    'OTL' : 1, 'RES' : 1, 'MOV' : 2, 'ADD' : 3, 'SUB' : 3, 'DIV' : 3,
+    'CLR' : 1, 'COP' : 3, 'MSG' : 1,
+}
+
+def random_parameter(rng):
+    choice = rng.random()
+    if choice < 0.7:
+        return [rng.choice(tags)]
+    if choice < 0.9:
+        return [rng.choice(numbers)]
+    return ['-', rng.choice(numbers)]
+
+def random_parameters(rng, count):
+    tokens = ['(']
+    for i in range(count):
+        if i > 0:
+            tokens.append(',')
+        tokens += random_parameter(rng)
+    return tokens + [')']
+
+def random_cpt_expression(rng, depth):
+    if depth > 0 and rng.random() < 0.3:
+        tokens = ['('] + random_cpt_expression(rng, depth - 1) + [')']
+    else:
+        tokens = random_parameter(rng)
+    while rng.random() < 0.4:
+        tokens += [rng.choice(['+', '-', '*', '/'])] + random_cpt_expression(rng, depth - 1)
+    return tokens
+
+def random_input_instruction(rng):
+    name = rng.choice(input_instructions)
+    return [name] + random_parameters(rng, parameter_counts.get(name, 2))
+
+def random_output_instruction(rng):
+    name = rng.choice(output_instructions)
+    if name in ('TON', 'TOF', 'CTU'):
+        return [name, '('] + random_parameter(rng) + [',', '?', ',', '?', ')']
+    if name == 'JSR':
+        return [name, '('] + random_parameter(rng) + [',', rng.choice(numbers), ')']
+    if name == 'CPT':
+        return [name, '('] + random_parameter(rng) + [','] + random_cpt_expression(rng, 2) + [')']
+    if name == 'BTD':
+        return [name, '('] + random_parameter(rng) + [',', '0', ','] + random_parameter(rng) + [',', '0', ',', '1', ')']
+    return [name] + random_parameters(rng, parameter_counts[name])
+
+def random_input_list(rng, depth):
+    tokens = []
+    while not tokens or rng.random() < 0.4:
+        if depth > 0 and rng.random() < 0.3:
+            tokens += ['['] + random_input_level(rng, depth - 1) + [']']
+        else:
+            tokens += random_input_instruction(rng)
+    return tokens
+
+def random_input_level(rng, depth):
+    tokens = []
+    while True:
+        if rng.random() < 0.15:
+            tokens.append(',')
+            if rng.random() < 0.5:
+                return tokens
+            continue
+        tokens += random_input_list(rng, depth)
+        if rng.random() < 0.5:
+            return tokens
+        tokens.append(',')
+
+def random_output_list(rng, depth):
+    if depth > 0 and rng.random() < 0.3:
+        tokens = ['[']
+        while True:
+            if rng.random() < 0.5:
+                tokens += random_input_list(rng, depth - 1)
+            tokens += random_output_list(rng, depth - 1)
+            if rng.random() < 0.5:
+                return tokens + [']']
+            tokens.append(',')
+    tokens = random_output_instruction(rng)
+    while rng.random() < 0.3:
+        tokens += random_output_instruction(rng)
+    return tokens
+
+def random_rung(rng):
+    tokens = []
+    if rng.random() < 0.8:
+        tokens += random_input_list(rng, 3)
+    tokens += random_output_list(rng, 3) + [';']
+    return tokens
+
+####################################################
+#
+# MUTATE A RUNG TO EXERCISE THE ERROR PATHS
+#
+###################################################
+def mutate(rng, tokens):
+    tokens = list(tokens)
+    position = rng.randrange(len(tokens))
+    choice = rng.random()
+    if choice < 0.3:
+        del tokens[position]
+    elif choice < 0.6:
+        tokens.insert(position, rng.choice(punctuation + tags + input_instructions + output_instructions))
+    elif choice < 0.8:
+        tokens[position] = rng.choice(punctuation + numbers)
+    elif choice < 0.9:
+        tokens.insert(position, rng.choice(['$', '[]', '@', '1a']))
+    else:
+        tokens = tokens[:position] + tokens[position + 1:] + tokens[position:position + 1]
+    return tokens
+
+def join(rng, tokens):
+    return ''.join(token + rng.choice(['', '', '', ' ', '\t', '\n']) for token in tokens)
+
+def random_corpus(count, seed):
+    rng = random.Random(seed)
+    rungs = []
+    for i in range(count):
+        tokens = random_rung(rng)
+        if rng.random() < 0.3:
+            tokens = mutate(rng, tokens)
+        rungs.append(join(rng, tokens))
+    return rungs
+
+####################################################
+#
+# RUNGS OF THE ROUTINES IN AN L5X FILE
+#
+###################################################
+def l5x_corpus(filename):
+    rungs = []
+    for record in l5xparser().iterparse_l5x(filename, kinds=('routine',)):
+        rungs += [rung for rung in record[3] if rung is not None]
+    return rungs
+
+####################################################
+#
+# TRANSLATE WITH PLY, KEEPING THE ERRORS
+#
+###################################################
+def reference(translator, rung):
+    try:
+        return translator.translate(rung)
+    except Exception as e:
+        return e
+
+####################################################
+#
+# COMPARE THE FAST PATH AGAINST PLY
+# obs: the fast path may give up on a rung, but when
+#      it translates one the result must be the same
+#      string PLY produces, from the same syntax tree
+###################################################
+def compare(rungs):
+    translator = RungTranslator(fast=False)
+    mismatches = []
+    fallbacks = 0
+
+    start = time.perf_counter()
+    expected = [reference(translator, rung) for rung in rungs]
+    ply_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [rungfast.translate(rung) for rung in rungs]
+    fast_time = time.perf_counter() - start
+
+    for rung, result, reference_result in zip(rungs, results, expected):
+        if result is None:
+            fallbacks += 1
+        elif result != reference_result:
+            mismatches.append((rung, result, reference_result))
+        elif rungfast.parse(rung) != translator.parse(rung):
+            mismatches.append((rung, rungfast.parse(rung), translator.parse(rung)))
+
+    return {
+        'rungs': len(rungs),
+        'mismatches': mismatches,
+        'fallbacks': fallbacks,
+        'ply_rate': len(rungs) / ply_time if ply_time else 0,
+        'fast_rate': len(rungs) / fast_time if fast_time else 0,
+    }
+
+####################################################
+#
+# MAIN SCRIPT FOR COMMAND LINE EXECUTION
+#
+###################################################
+def main():
+    description = "Compares the fast path rung translator against the PLY parser"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('input', nargs='*',
+                            help="L5X files whose rungs are compared")
+    parser.add_argument('--random', type=int, default=10000,
+                            help="number of random rungs to compare")
+    parser.add_argument('--seed', type=int, default=0,
+                            help="seed for the random rungs")
+    parser.add_argument('--show', type=int, default=10,
+                            help="number of mismatches to show")
+
+    args = vars(parser.parse_args())
+
+    # syntax errors are expected from the mutated rungs
+    logging.getLogger('l5x2c').setLevel(logging.CRITICAL)
+
+    rungs = random_corpus(args['random'], args['seed'])
+    for filename in args['input']:
+        rungs += l5x_corpus(filename)
+
+    report = compare(rungs)
+    for rung, result, reference_result in report['mismatches'][:args['show']]:
+        print('rung:     %r' % (rung))
+        print('fast:     %r' % (result))
+        print('PLY:      %r' % (reference_result))
+    print('rungs:      %d' % (report['rungs']))
+    print('mismatches: %d' % (len(report['mismatches'])))
+    print('fallbacks:  %d (%.1f%%)' % (report['fallbacks'],
+                                     100.0 * report['fallbacks'] / max(report['rungs'], 1)))
+    print('PLY:        %.0f rungs/s' % (report['ply_rate']))
+    print('fast path:  %.0f rungs/s' % (report['fast_rate']))
+
+    if report['mismatches']:
+        sys.exit(1)
+
+if __name__== "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+
+################################################################################
+#
+#   STACKLESS CODE GENERATION
+#
+#   Translates the syntax tree of a rung into C boolean expressions instead of
+#   accumulator machine calls. Each rung becomes a block where the rails of the
+#   branches are kept in local bool temporaries:
+#
+#       XIC(A)XIO(B)OTE(C);         ->  {bool r0=A&&!B;C=r0;}
+#
+#   The rails the stack machine would keep on its stack are tracked at
+#   generation time. A rail is an expression until an instruction needs its
+#   value, and every rail that depends on tags is stored in a temporary
+#   before any instruction that may change a tag, so it keeps the value the
+#   stack machine would have pushed.
+#
+################################################################################
+from rungast import InputBranch
+from rungast import OutputBranch
+from rungast import conditions
+from rungast import emit_instruction
+from rungopt import ATOM
+from rungopt import AND
+from rungopt import OR
+
+constants = ('true', 'false')
+
+
+####################################################
+#
+# VALUE OF A RAIL
+# obs: stable rails are temporaries or constants and
+#      do not change when tags are written. A rail
+#      owns its temporary unless it is a copy made
+#      for a level of an output branch
+###################################################
+class Rail():
+    __slots__ = ('expression', 'kind', 'stable', 'owned')
+    
+    def __init__(self, expression, kind=ATOM, stable=False, owned=False):
+        self.expression = expression
+        self.kind = kind
+        self.stable = stable
+        self.owned = owned
+
+def constant(value):
+    return Rail(value, ATOM, True)
+
+####################################################
+#
+# COMBINE TWO RAILS WITH && OR ||
+# obs: rails are free of side effects, so constant
+#      operands can drop the other one
+###################################################
+def combine(operator, left, right):
+    absorbing, neutral = ('false', 'true') if operator == AND else ('true', 'false')
+    if left.expression == absorbing or right.expression == absorbing:
+        return constant(absorbing)
+    if left.expression == neutral:
+        return Rail(right.expression, right.kind, right.stable)
+    if right.expression == neutral:
+        return Rail(left.expression, left.kind, left.stable)
+    return Rail('%s%s%s' % (operand(left, operator), '&&' if operator == AND else '||',
+                            operand(right, operator)), operator)
+
+def operand(rail, operator):
+    if rail.kind > operator:
+        return '(' + rail.expression + ')'
+    return rail.expression
+
+
+####################################################
+#
+# GENERATOR OF THE CODE OF ONE RUNG
+#
+###################################################
+class ExpressionGenerator():
+    def __init__(self):
+        self.out = []
+        self.rails = []
+        self.temporaries = 0
+
+    def temporary(self, expression):
+        name = 'r%d' % (self.temporaries)
+        self.temporaries += 1
+        self.out.append('bool %s=%s;' % (name, expression))
+        return Rail(name, ATOM, True, True)
+
+    ####################################################
+    #
+    # STORE THE RAILS THAT DEPEND ON TAGS
+    # obs: called before instructions that write tags
+    ###################################################
+    def settle(self):
+        for i, rail in enumerate(self.rails):
+            if not rail.stable:
+                self.rails[i] = self.temporary(rail.expression)
+
+    ####################################################
+    #
+    # CODE OF AN INSTRUCTION THAT READS THE TOP RAIL
+    # obs: ONS and LIM replace the top, so it gets a
+    #      temporary of its own
+    ###################################################
+    def statement(self, node):
+        self.settle()
+        top = self.rails[-1]
+        out = []
+        emit_instruction(node, out)
+        code = ''.join(out)
+        if 'pop();push(false);' in code:
+            if not top.owned:
+                top = self.rails[-1] = self.temporary(top.expression)
+            code = code.replace('pop();push(false);', '%s=false;' % (top.expression))
+        self.out.append(code.replace('acc()', top.expression))
+
+    def nodes(self, nodes):
+        for node in nodes:
+            if isinstance(node, InputBranch):
+                self.input_branch(node)
+            elif isinstance(node, OutputBranch):
+                self.output_branch(node)
+            elif node.name in conditions:
+                condition = Rail(conditions[node.name].format(*node.operands))
+                self.rails[-1] = combine(AND, self.rails[-1], condition)
+            elif node.name not in ('COP', 'BTD', 'MSG'):
+                self.statement(node)
+
+    ####################################################
+    #
+    # INPUT BRANCH
+    # obs: each level starts from true and the levels
+    #      are ORed before being ANDed with the rail
+    ###################################################
+    def input_branch(self, node):
+        self.rails.append(constant('false'))
+        for level in node.levels:
+            self.rails.append(constant('true'))
+            self.nodes(level)
+            rail = self.rails.pop()
+            self.rails[-1] = combine(OR, self.rails[-1], rail)
+        rail = self.rails.pop()
+        self.rails[-1] = combine(AND, self.rails[-1], rail)
+
+    ####################################################
+    #
+    # OUTPUT BRANCH
+    # obs: each level starts from a copy of the rail
+    ###################################################
+    def output_branch(self, node):
+        if not self.rails[-1].stable:
+            self.rails[-1] = self.temporary(self.rails[-1].expression)
+        top = self.rails[-1]
+        for inputs, outputs in node.levels:
+            self.rails.append(Rail(top.expression, top.kind, True))
+            self.nodes(inputs)
+            self.nodes(outputs)
+            self.rails.pop()
+
+    def rung(self, rung):
+        self.rails.append(constant('true'))
+        self.nodes(rung.inputs)
+        self.nodes(rung.outputs)
+        return '{' + ''.join(self.out) + '}'
+
+####################################################
+#
+# GENERATE THE STACKLESS C CODE OF A RUNG
+#
+###################################################
+def generate(rung):
+    return ExpressionGenerator().rung(rung)
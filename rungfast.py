@@ -0,0 +1,435 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+
+################################################################################
+#
+#   FAST PATH RUNG TRANSLATOR
+#
+#   Hand-written tokenizer and recursive descent parser for the rung grammar
+#   described in rungyacc.py. It builds exactly the same syntax tree as the
+#   PLY parser and gives up (returns None) on anything it does not understand,
+#   so the caller can fall back to PLY, which also reports the errors.
+#
+#   The tokenizer tries the same rules in the same order as the PLY master
+#   regular expression: COMM_TAG, TAG (or reserved word), NUMBER and then the
+#   single character tokens.
+#
+################################################################################
+import re
+import logging
+from runglex import reserved
+from runglex import COMM_TAG
+from runglex import TAG
+from runglex import NUMBER
+from runglex import IGNORE
+from rungast import Rung
+from rungast import InputBranch
+from rungast import OutputBranch
+from rungast import Instruction
+from rungast import Operation
+from rungast import Group
+from rungast import generate
+
+token_re = re.compile(
+    r'[' + re.escape(IGNORE) + r']* (?: (?P<COMM_TAG>' + COMM_TAG + r')'
+    r' | (?P<TAG>' + TAG + r') | (?P<NUMBER>' + NUMBER + r')'
+    r' | (?P<CHAR>[()\[\],;?+\-*/]) )', re.VERBOSE)
+
+char_tokens = {
+    '(' : 'LPAR',
+    ')' : 'RPAR',
+    '[' : 'LBRA',
+    ']' : 'RBRA',
+    ',' : 'COMMA',
+    ';' : 'SEMICOLON',
+    '?' : 'UNDEF_VAL',
+    '-' : 'CPT_MINUS',
+    '+' : 'CPT_PLUS',
+    '*' : 'CPT_TIMES',
+    '/' : 'CPT_DIV',
+}
+
+input_instructions = ['XIC', 'XIO', 'ONS', 'EQU', 'GEQ', 'NEQ', 'LEQ', 'GRT', 'LIM']
+
+output_instructions = ['OTE', 'OTU', 'OTL', 'RES', 'MOV', 'TON', 'TOF', 'CTU',
+                       'JSR', 'ADD', 'SUB', 'DIV', 'CLR', 'CPT', 'COP', 'BTD', 'MSG']
+
+comparisons = ['EQU', 'GEQ', 'NEQ', 'LEQ', 'GRT']
+
+arithmetics = ['ADD', 'SUB', 'DIV']
+
+unsupported_instructions = ['COP', 'BTD', 'MSG']
+
+
+####################################################
+#
+# RAISED WHEN THE FAST PATH GIVES UP
+#
+###################################################
+class NoFastPath(Exception):
+    pass
+
+
+####################################################
+#
+# SPLIT A RUNG INTO (TYPE, VALUE) TOKENS
+# obs: returns None on characters the lexer would
+#      report as illegal. The list ends with a
+#      (None, None) token
+###################################################
+def tokenize(rung):
+    tokens = []
+    position = 0
+    for match in token_re.finditer(rung):
+        if match.start() != position:
+            return None
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'TAG':
+            kind = reserved.get(value, 'TAG')
+        elif kind == 'CHAR':
+            kind = char_tokens[value]
+        tokens.append((kind, value))
+        position = match.end()
+    if rung[position:].strip(IGNORE):
+        return None
+    tokens.append((None, None))
+    return tokens
+
+
+####################################################
+#
+# RECURSIVE DESCENT PARSER
+# obs: branches starting with '[' are tried as input
+#      branches first. Results are memoized by
+#      position so nested branches stay linear
+###################################################
+class RungParser():
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.warnings = []
+        self.input_branches = {}
+
+    def peek(self):
+        return self.tokens[self.position][0]
+
+    def expect(self, kind):
+        if self.peek() != kind:
+            raise NoFastPath()
+        value = self.tokens[self.position][1]
+        self.position += 1
+        return value
+
+    ####################################################
+    #
+    #   RUNG            :      INPUT_LIST OUTPUT_LIST ;
+    #                           | OUTPUT_LIST ;
+    #
+    ###################################################
+    def rung(self):
+        tree = Rung(self.input_list(False), self.output_list())
+        self.expect('SEMICOLON')
+        if self.peek() is not None:
+            raise NoFastPath()
+        return tree
+
+    ####################################################
+    #
+    #   INPUT_LIST      :      ( INPUT_INSTRUCTION | INPUT_BRANCH )+
+    #
+    ###################################################
+    def input_list(self, required):
+        nodes = []
+        while True:
+            kind = self.peek()
+            if kind in input_instructions:
+                nodes.append(self.input_instruction())
+            elif kind == 'LBRA' and self.try_input_branch():
+                nodes.append(self.input_branch())
+            else:
+                break
+        if required and not nodes:
+            raise NoFastPath()
+        return nodes
+
+    def try_input_branch(self):
+        start = self.position
+        if start not in self.input_branches:
+            try:
+                node = self.parse_input_branch()
+                self.input_branches[start] = (node, self.position)
+            except NoFastPath:
+                self.input_branches[start] = None
+            self.position = start
+        return self.input_branches[start] is not None
+
+    def input_branch(self):
+        node, self.position = self.input_branches[self.position]
+        return node
+
+    ####################################################
+    #
+    #   INPUT_BRANCH    :      [ INPUT_LEVEL ]
+    #
+    #   obs: the empty branch [] makes the PLY actions
+    #        fail, so it is left to PLY
+    ###################################################
+    def parse_input_branch(self):
+        self.expect('LBRA')
+        if self.peek() == 'RBRA':
+            raise NoFastPath()
+        node = InputBranch(self.input_level())
+        self.expect('RBRA')
+        return node
+
+    ####################################################
+    #
+    #   INPUT_LEVEL     :      INPUT_LIST , INPUT_LEVEL
+    #                           | INPUT_LIST
+    #                           | ,
+    #                           | , INPUT_LEVEL
+    #
+    #   obs: a comma followed by ']' adds an empty
+    #        level and is only valid after another
+    #        empty level, as in [,] or [XIC(A),,]
+    ###################################################
+    def input_level(self):
+        levels = []
+        while True:
+            if self.peek() == 'COMMA':
+                levels.append([])
+            else:
+                levels.append(self.input_list(True))
+                if self.peek() != 'COMMA':
+                    return levels
+            self.position += 1
+            if self.peek() == 'RBRA':
+                if levels[-1]:
+                    raise NoFastPath()
+                levels.append([])
+                return levels
+    ####################################################
+    #
+    #   OUTPUT_LIST     :      OUTPUT_SEQ
+    #                           | OUTPUT_BRANCH
+    #
+    ###################################################
+    def output_list(self):
+        if self.peek() == 'LBRA':
+            return [self.output_branch()]
+        nodes = [self.output_instruction()]
+        while self.peek() not in ('SEMICOLON', 'COMMA', 'RBRA', None):
+            nodes.append(self.output_instruction())
+        return nodes
+
+    ####################################################
+    #
+    #   OUTPUT_BRANCH   :      [ OUTPUT_LEVEL ]
+    #
+    ###################################################
+    def output_branch(self):
+        self.expect('LBRA')
+        node = OutputBranch(self.output_level())
+        self.expect('RBRA')
+        return node
+
+    ####################################################
+    #
+    #   OUTPUT_LEVEL    :      INPUT_LIST OUTPUT_LIST , OUTPUT_LEVEL
+    #                           | OUTPUT_LIST , OUTPUT_LEVEL
+    #                           | INPUT_LIST OUTPUT_LIST
+    #                           | OUTPUT_LIST
+    #
+    ###################################################
+    def output_level(self):
+        levels = [(self.input_list(False), self.output_list())]
+        while self.peek() == 'COMMA':
+            self.position += 1
+            levels.append((self.input_list(False), self.output_list()))
+        return levels
+
+    ####################################################
+    #
+    #   PARAMETER       :      TAG | COMM_TAG | NUMBER | - NUMBER
+    #
+    #   obs: like the PLY action, '- NUMBER' gives '-'
+    ###################################################
+    def parameter(self):
+        kind = self.peek()
+        if kind in ('TAG', 'COMM_TAG', 'NUMBER'):
+            return self.expect(kind)
+        if kind == 'CPT_MINUS':
+            value = self.expect('CPT_MINUS')
+            self.expect('NUMBER')
+            return value
+        raise NoFastPath()
+
+    def parameters(self, count):
+        self.expect('LPAR')
+        values = [self.parameter()]
+        for i in range(count - 1):
+            self.expect('COMMA')
+            values.append(self.parameter())
+        self.expect('RPAR')
+        return tuple(values)
+
+    ####################################################
+    #
+    #   INPUT INSTRUCTIONS
+    #
+    ###################################################
+    def input_instruction(self):
+        kind = self.expect(self.peek())
+        if kind in comparisons:
+            return Instruction(kind, self.parameters(2))
+        elif kind == 'LIM':
+            return Instruction(kind, self.parameters(3))
+        return Instruction(kind, self.parameters(1))
+
+    ####################################################
+    #
+    #   OUTPUT INSTRUCTIONS
+    #
+    ###################################################
+    def output_instruction(self):
+        kind = self.peek()
+        self.position += 1
+        if kind in ('OTE', 'OTU', 'OTL', 'RES', 'CLR', 'MSG'):
+            node = Instruction(kind, self.parameters(1))
+        elif kind == 'MOV':
+            node = Instruction(kind, self.parameters(2))
+        elif kind in arithmetics or kind == 'COP':
+            node = Instruction(kind, self.parameters(3))
+        elif kind in ('TON', 'TOF', 'CTU'):
+            self.expect('LPAR')
+            p = self.parameter()
+            self.expect('COMMA')
+            self.expect('UNDEF_VAL')
+            self.expect('COMMA')
+            self.expect('UNDEF_VAL')
+            self.expect('RPAR')
+            node = Instruction(kind, (p,))
+        elif kind == 'JSR':
+            self.expect('LPAR')
+            p = self.parameter()
+            self.expect('COMMA')
+            n = self.expect('NUMBER')
+            self.expect('RPAR')
+            node = Instruction(kind, (p, n))
+        elif kind == 'CPT':
+            self.expect('LPAR')
+            p = self.parameter()
+            self.expect('COMMA')
+            expression = self.cpt_expression()
+            self.expect('RPAR')
+            node = Instruction(kind, (p, expression))
+        elif kind == 'BTD':
+            self.expect('LPAR')
+            source = self.parameter()
+            self.expect('COMMA')
+            source_bit = self.expect('NUMBER')
+            self.expect('COMMA')
+            destination = self.parameter()
+            self.expect('COMMA')
+            destination_bit = self.expect('NUMBER')
+            self.expect('COMMA')
+            length = self.expect('NUMBER')
+            self.expect('RPAR')
+            node = Instruction(kind, (source, source_bit, destination, destination_bit, length))
+        else:
+            raise NoFastPath()
+        if kind in unsupported_instructions:
+            self.warnings.append("Instruction %s is not supported. Instruction was ignored." % (kind))
+        return node
+
+    ####################################################
+    #
+    #   CPT EXPRESSION  :      CPT_TERM ( OPERATOR CPT_TERM )*
+    #
+    #   CPT_TERM        :      ( CPT_EXPRESSION ) | PARAMETER
+    #
+    #   obs: the operations are nested following the
+    #        precedence declared in rungyacc.py
+    ###################################################
+    def cpt_expression(self):
+        left = self.cpt_product()
+        while self.peek() in ('CPT_PLUS', 'CPT_MINUS'):
+            operator = self.expect(self.peek())
+            left = Operation(operator, left, self.cpt_product())
+        return left
+
+    def cpt_product(self):
+        left = self.cpt_term()
+        while self.peek() in ('CPT_TIMES', 'CPT_DIV'):
+            operator = self.expect(self.peek())
+            left = Operation(operator, left, self.cpt_term())
+        return left
+
+    def cpt_term(self):
+        if self.peek() == 'LPAR':
+            self.position += 1
+            node = Group(self.cpt_expression())
+            self.expect('RPAR')
+            return node
+        return self.parameter()
+
+
+####################################################
+#
+# PARSE A RUNG WITH THE FAST PATH
+# obs: returns None if PLY has to parse it. The
+#      tokens of the rung can be given if they were
+#      already split by tokenize
+###################################################
+def parse(rung, tokens=None):
+    if tokens is None:
+        tokens = tokenize(rung)
+    if tokens is None:
+        return None
+    parser = RungParser(tokens)
+    try:
+        tree = parser.rung()
+    except NoFastPath:
+        return None
+    log = logging.getLogger('l5x2c')
+    for warning in parser.warnings:
+        log.warning(warning)
+    return tree
+
+####################################################
+#
+# TRANSLATE A RUNG WITH THE FAST PATH
+# obs: returns None if PLY has to translate it
+###################################################
+def translate(rung):
+    tree = parse(rung)
+    if tree is None:
+        return None
+    return generate(tree)
@@ -80,16 +80,20 @@ tokens = [
 
 
 
-def runglex(debug=False):
+# basic regular expressions for creating tokens
+# obs: compiled in verbose mode, so spaces are ignored
+ID          = r'([a-zA-Z_] ( [a-zA-Z0-9_] )*)'
+OBJ_ID      = r'(' + ID + '(\.' + ID + ')*)'
+INDEX       = r'(\[ (([0-9])+ | (' + OBJ_ID + '))\])' 
+OBJ_INDEX   = r'(' + OBJ_ID + '(' + INDEX + ')?)'
+TAG         = r'(' + OBJ_INDEX + '(\.' + OBJ_INDEX + ')*(\.([0-9])+)?)'
+COMM_TAG    = r'(' + ID + ':([0-9])+:' + ID + '\.' + TAG + ')'
+NUMBER      = r'[0-9]*\.?[0-9]+([eE][\-\+]?[0-9]+)?'
+IGNORE      = ' \t\n\r'
+
+
+def runglex(debug=False, lextab=None):
     log = logging.getLogger('l5x2c')
-        
-    # basic regular expressions for creating tokens
-    ID          = r'([a-zA-Z_] ( [a-zA-Z0-9_] )*)'
-    OBJ_ID      = r'(' + ID + '(\.' + ID + ')*)'
-    INDEX       = r'(\[ (([0-9])+ | (' + OBJ_ID + '))\])' 
-    OBJ_INDEX   = r'(' + OBJ_ID + '(' + INDEX + ')?)'
-    TAG         = r'(' + OBJ_INDEX + '(\.' + OBJ_INDEX + ')*(\.([0-9])+)?)'
-    COMM_TAG    = r'(' + ID + ':([0-9])+:' + ID + '\.' + TAG + ')'
 
     # Regular expression rules for simple tokens
     t_LPAR      = r'\('
@@ -129,7 +133,7 @@ def runglex(debug=False):
     t_CPT_PLUS  = r'\+'
     t_CPT_TIMES = r'\*'
     t_CPT_DIV   = r'/'
-    t_NUMBER    = r'[0-9]*\.?[0-9]+([eE][\-\+]?[0-9]+)?'
+    t_NUMBER    = NUMBER
 
     @TOKEN(COMM_TAG)
     def t_COMM_TAG(t):
@@ -142,7 +146,7 @@ def runglex(debug=False):
         return t
 
     # A string containing ignored characters 
-    t_ignore  = ' \t\n\r'
+    t_ignore  = IGNORE
 
 
     # Define a rule so we can track line numbers
@@ -155,6 +159,9 @@ def runglex(debug=False):
         log.error("Illegal character '%s'" % t.value[0])
         t.lexer.skip(1)
 
+    # prebuilt tables skip the validation of the rules
+    if lextab is not None:
+        return lex.lex(debug=debug,errorlog=log,optimize=True,lextab=lextab)
     return lex.lex(debug=debug,errorlog=log)
 
 ####################################################
@@ -0,0 +1,11 @@
+# runglextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ADD', 'BTD', 'CLR', 'COMMA', 'COMM_TAG', 'COP', 'CPT', 'CPT_DIV', 'CPT_MINUS', 'CPT_PLUS', 'CPT_TIMES', 'CTU', 'DIV', 'EQU', 'GEQ', 'GRT', 'JSR', 'LBRA', 'LEQ', 'LIM', 'LPAR', 'MOV', 'MSG', 'NEQ', 'NUMBER', 'ONS', 'OTE', 'OTL', 'OTU', 'RBRA', 'RES', 'RPAR', 'SEMICOLON', 'SUB', 'TAG', 'TOF', 'TON', 'UNDEF_VAL', 'XIC', 'XIO'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMM_TAG>(([a-zA-Z_] ( [a-zA-Z0-9_] )*):([0-9])+:([a-zA-Z_] ( [a-zA-Z0-9_] )*)\\.(((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)((\\[ (([0-9])+ | ((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)))\\]))?)(\\.((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)((\\[ (([0-9])+ | ((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)))\\]))?))*(\\.([0-9])+)?)))|(?P<t_TAG>(((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)((\\[ (([0-9])+ | ((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)))\\]))?)(\\.((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)((\\[ (([0-9])+ | ((([a-zA-Z_] ( [a-zA-Z0-9_] )*)(\\.([a-zA-Z_] ( [a-zA-Z0-9_] )*))*)))\\]))?))*(\\.([0-9])+)?))|(?P<t_newline>\\n+)|(?P<t_NUMBER>[0-9]*\\.?[0-9]+([eE][\\-\\+]?[0-9]+)?)|(?P<t_XIC>XIC)|(?P<t_XIO>XIO)|(?P<t_OTE>OTE)|(?P<t_OTU>OTU)|(?P<t_OTL>OTL)|(?P<t_TON>TON)|(?P<t_TOF>TOF)|(?P<t_ONS>ONS)|(?P<t_RES>RES)|(?P<t_MOV>MOV)|(?P<t_CTU>CTU)|(?P<t_EQU>EQU)|(?P<t_GEQ>GEQ)|(?P<t_NEQ>NEQ)|(?P<t_LEQ>LEQ)|(?P<t_GRT>GRT)|(?P<t_COP>COP)|(?P<t_CPT>CPT)|(?P<t_ADD>ADD)|(?P<t_SUB>SUB)|(?P<t_CLR>CLR)|(?P<t_LIM>LIM)|(?P<t_DIV>DIV)|(?P<t_BTD>BTD)|(?P<t_JSR>JSR)|(?P<t_MSG>MSG)|(?P<t_LPAR>\\()|(?P<t_RPAR>\\))|(?P<t_LBRA>\\[)|(?P<t_RBRA>\\])|(?P<t_UNDEF_VAL>\\?)|(?P<t_CPT_MINUS>\\-)|(?P<t_CPT_PLUS>\\+)|(?P<t_CPT_TIMES>\\*)|(?P<t_COMMA>,)|(?P<t_SEMICOLON>;)|(?P<t_CPT_DIV>/)', [None, ('t_COMM_TAG', 'COMM_TAG'), None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, ('t_TAG', 'TAG'), None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, ('t_newline', 'newline'), (None, 'NUMBER'), None, (None, 'XIC'), (None, 'XIO'), (None, 'OTE'), (None, 'OTU'), (None, 'OTL'), (None, 'TON'), (None, 'TOF'), (None, 'ONS'), (None, 'RES'), (None, 'MOV'), (None, 'CTU'), (None, 'EQU'), (None, 'GEQ'), (None, 'NEQ'), (None, 'LEQ'), (None, 'GRT'), (None, 'COP'), (None, 'CPT'), (None, 'ADD'), (None, 'SUB'), (None, 'CLR'), (None, 'LIM'), (None, 'DIV'), (None, 'BTD'), (None, 'JSR'), (None, 'MSG'), (None, 'LPAR'), (None, 'RPAR'), (None, 'LBRA'), (None, 'RBRA'), (None, 'UNDEF_VAL'), (None, 'CPT_MINUS'), (None, 'CPT_PLUS'), (None, 'CPT_TIMES'), (None, 'COMMA'), (None, 'SEMICOLON'), (None, 'CPT_DIV')])]}
+_lexstateignore = {'INITIAL': ' \t\n\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+grammar_version = 'b15761a52a0f91a3541e190d882bc68972c7915e'
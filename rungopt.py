@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+
+################################################################################
+#
+#   PEEPHOLE OPTIMIZER FOR THE ACCUMULATOR MACHINE
+#
+#   The syntax tree of a rung is lowered to a list of stack operations:
+#
+#       ('clear',)                      clear();
+#       ('push', expression, flags)     push(expression);
+#       ('and',) ('or',) ('pop',)       and(); or(); pop();
+#       ('statement', code, effect)     code of the other instructions
+#
+#   and the list is rewritten with the rules below, which keep the contents
+#   of the stack at the end of the rung and the value of acc() seen by every
+#   statement:
+#
+#       push(X);push(Y);and();          ->  push(X&&Y);
+#       push(X);push(Y);or();           ->  push(X||Y);
+#       push(true);and();               ->  (nothing)
+#       push(false);or();               ->  (nothing)
+#       push(X);pop();                  ->  (nothing)
+#       push(acc());S;pop();            ->  S   (if S only reads acc())
+#
+#   The operands of and()/or() are folded when they are true or false, so
+#   clear();push(true);push(A);and(); becomes clear();push(A); and an input
+#   branch with a single level becomes a plain condition. Y is never merged
+#   if it reads acc(), since its value depends on X being on the stack.
+#
+################################################################################
+from rungast import InputBranch
+from rungast import OutputBranch
+from rungast import conditions
+from rungast import emit_instruction
+
+####################################################
+#
+# EFFECT OF A STATEMENT ON THE STACK
+# obs: READ statements only read acc(). TOP ones may
+#      replace the top (ONS and LIM). A BARRIER may do
+#      anything: JSR calls a routine that clears the
+#      stack, so the rest of the rung is kept as is
+###################################################
+READ = 'read'
+TOP = 'top'
+BARRIER = 'barrier'
+
+statement_effects = {
+    'ONS' : TOP,
+    'LIM' : TOP,
+    'JSR' : BARRIER,
+}
+
+####################################################
+#
+# FLAGS OF A PUSHED EXPRESSION
+# obs: the kind of the outermost operator decides
+#      when the expression needs parentheses
+###################################################
+ATOM = 0
+AND = 1
+OR = 2
+
+class Flags():
+    __slots__ = ('kind', 'reads')
+    
+    def __init__(self, kind, reads):
+        self.kind = kind
+        self.reads = reads
+
+constant = Flags(ATOM, False)
+condition = Flags(ATOM, False)
+duplicate = Flags(ATOM, True)
+
+
+####################################################
+#
+# LOWER THE SYNTAX TREE TO STACK OPERATIONS
+#
+###################################################
+def lower_nodes(nodes, ops):
+    for node in nodes:
+        if isinstance(node, InputBranch):
+            lower_input_branch(node, ops)
+        elif isinstance(node, OutputBranch):
+            lower_output_branch(node, ops)
+        elif node.name in conditions:
+            ops.append(('push', conditions[node.name].format(*node.operands), condition))
+            ops.append(('and',))
+        else:
+            out = []
+            emit_instruction(node, out)
+            code = ''.join(out)
+            if code:
+                ops.append(('statement', code, statement_effects.get(node.name, READ)))
+
+def lower_input_branch(node, ops):
+    ops.append(('push', 'false', constant))
+    ops.append(('push', 'true', constant))
+    for i, level in enumerate(node.levels):
+        if i > 0:
+            ops.append(('or',))
+            ops.append(('push', 'true', constant))
+        lower_nodes(level, ops)
+    ops.append(('or',))
+    ops.append(('and',))
+
+def lower_output_branch(node, ops):
+    ops.append(('push', 'acc()', duplicate))
+    for i, (inputs, outputs) in enumerate(node.levels):
+        if i > 0:
+            ops.append(('pop',))
+            ops.append(('push', 'acc()', duplicate))
+        lower_nodes(inputs, ops)
+        lower_nodes(outputs, ops)
+    ops.append(('pop',))
+
+####################################################
+#
+# COMBINE TWO PUSHED EXPRESSIONS
+# obs: both are free of side effects, so constant
+#      operands can drop the other one
+###################################################
+def combine(operator, left, right):
+    absorbing, neutral = ('false', 'true') if operator == 'and' else ('true', 'false')
+    if left[1] == absorbing or right[1] == absorbing:
+        return ('push', absorbing, constant)
+    if left[1] == neutral:
+        return right
+    if right[1] == neutral:
+        return left
+    kind = AND if operator == 'and' else OR
+    reads = left[2].reads or right[2].reads
+    return ('push', '%s%s%s' % (operand(left, kind), '&&' if kind == AND else '||',
+                                operand(right, kind)), Flags(kind, reads))
+
+def operand(push, kind):
+    if push[2].kind > kind:
+        return '(' + push[1] + ')'
+    return push[1]
+
+####################################################
+#
+# APPLY THE RULES TO THE END OF THE LIST
+# obs: returns True if the list was rewritten
+###################################################
+def reduce(ops):
+    last = ops[-1][0]
+    if last in ('and', 'or') and len(ops) >= 3:
+        left, right = ops[-3], ops[-2]
+        if left[0] == 'push' and right[0] == 'push' and not right[2].reads:
+            ops[-3:] = [combine(last, left, right)]
+            return True
+        if right[0] == 'push' and right[1] == ('true' if last == 'and' else 'false'):
+            del ops[-2:]
+            return True
+    elif last == 'pop' and len(ops) >= 2:
+        if ops[-2][0] == 'push':
+            del ops[-2:]
+            return True
+        position = len(ops) - 2
+        while position >= 0 and ops[position][0] == 'statement' and ops[position][2] == READ:
+            position -= 1
+        if position >= 0 and ops[position][0] == 'push' and ops[position][2] is duplicate:
+            del ops[-1]
+            del ops[position]
+            return True
+    return False
+
+def peephole(ops):
+    optimized = []
+    for position, op in enumerate(ops):
+        optimized.append(op)
+        if op[0] == 'statement' and op[2] == BARRIER:
+            return optimized + ops[position + 1:]
+        while reduce(optimized):
+            pass
+    return optimized
+
+####################################################
+#
+# WRITE THE STACK OPERATIONS AS C CODE
+#
+###################################################
+def render(ops):
+    out = []
+    for op in ops:
+        if op[0] == 'push':
+            out.append('push(%s);' % (op[1]))
+        elif op[0] == 'statement':
+            out.append(op[1])
+        else:
+            out.append(op[0] + '();')
+    return ''.join(out)
+
+####################################################
+#
+# GENERATE THE OPTIMIZED C CODE OF A RUNG
+#
+###################################################
+def optimize(rung):
+    ops = [('clear',), ('push', 'true', constant)]
+    lower_nodes(rung.inputs, ops)
+    lower_nodes(rung.outputs, ops)
+    return render(peephole(ops))
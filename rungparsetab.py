@@ -0,0 +1,89 @@
+
+# rungparsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftCPT_PLUSCPT_MINUSleftCPT_TIMESCPT_DIVADD BTD CLR COMMA COMM_TAG COP CPT CPT_DIV CPT_MINUS CPT_PLUS CPT_TIMES CTU DIV EQU GEQ GRT JSR LBRA LEQ LIM LPAR MOV MSG NEQ NUMBER ONS OTE OTL OTU RBRA RES RPAR SEMICOLON SUB TAG TOF TON UNDEF_VAL XIC XIOrung : input_list output_list SEMICOLONrung : output_list SEMICOLONinput_list : input_instructioninput_list : input_list input_instructioninput_list : input_branchinput_list : input_list input_branchinput_branch : LBRA input_level RBRAinput_branch : LBRA RBRAinput_level : input_list COMMA input_levelinput_level : input_listinput_level : COMMAinput_level : COMMA input_leveloutput_list : output_seqoutput_list : output_branchoutput_seq : output_instructionoutput_seq : output_seq output_instructionoutput_branch : LBRA output_level RBRAoutput_level : input_list output_list COMMA output_leveloutput_level : output_list COMMA output_leveloutput_level : input_list output_listoutput_level : output_listinput_instruction : XIC LPAR parameter RPARinput_instruction : XIO LPAR parameter RPARinput_instruction : ONS LPAR parameter RPARinput_instruction : EQU LPAR parameter COMMA parameter RPARinput_instruction : GEQ LPAR parameter COMMA parameter RPARinput_instruction : NEQ LPAR parameter COMMA parameter RPARinput_instruction : LEQ LPAR parameter COMMA parameter RPARinput_instruction : GRT LPAR parameter COMMA parameter RPARinput_instruction : LIM LPAR parameter COMMA parameter COMMA parameter RPARoutput_instruction : OTE LPAR parameter RPARoutput_instruction : OTU LPAR parameter RPARoutput_instruction : OTL LPAR parameter RPARoutput_instruction : RES LPAR parameter RPARoutput_instruction : MOV LPAR parameter COMMA parameter RPARoutput_instruction : COP LPAR parameter COMMA parameter COMMA parameter RPARoutput_instruction : TON LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPARoutput_instruction : TOF LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPARoutput_instruction : CTU LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPARoutput_instruction : JSR LPAR parameter COMMA NUMBER RPARoutput_instruction : BTD LPAR parameter COMMA NUMBER COMMA parameter COMMA NUMBER COMMA NUMBER RPARoutput_instruction : ADD LPAR parameter COMMA parameter COMMA parameter RPARoutput_instruction : SUB LPAR parameter COMMA parameter COMMA parameter RPARoutput_instruction : CLR LPAR parameter RPARoutput_instruction : DIV LPAR parameter COMMA parameter COMMA parameter RPARoutput_instruction : CPT LPAR parameter COMMA cpt_expression RPARoutput_instruction : MSG LPAR parameter RPARparameter : TAGparameter : COMM_TAGparameter : NUMBERparameter : CPT_MINUS NUMBERcpt_expression : cpt_expression CPT_PLUS cpt_expressioncpt_expression : cpt_expression CPT_MINUS cpt_expressioncpt_expression : cpt_expression CPT_TIMES cpt_expressioncpt_expression : cpt_expression CPT_DIV cpt_expressioncpt_expression : LPAR cpt_expression RPARcpt_expression : NUMBERcpt_expression : parameter'
+    
+_lr_action_items = {'XIC':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[8,8,-3,-5,8,-4,-6,-8,8,8,-7,8,8,8,8,-22,-23,-24,8,8,-25,-26,-27,-28,-29,-30,]),'XIO':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[9,9,-3,-5,9,-4,-6,-8,9,9,-7,9,9,9,9,-22,-23,-24,9,9,-25,-26,-27,-28,-29,-30,]),'ONS':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[10,10,-3,-5,10,-4,-6,-8,10,10,-7,10,10,10,10,-22,-23,-24,10,10,-25,-26,-27,-28,-29,-30,]),'EQU':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[11,11,-3,-5,11,-4,-6,-8,11,11,-7,11,11,11,11,-22,-23,-24,11,11,-25,-26,-27,-28,-29,-30,]),'GEQ':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[12,12,-3,-5,12,-4,-6,-8,12,12,-7,12,12,12,12,-22,-23,-24,12,12,-25,-26,-27,-28,-29,-30,]),'NEQ':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[13,13,-3,-5,13,-4,-6,-8,13,13,-7,13,13,13,13,-22,-23,-24,13,13,-25,-26,-27,-28,-29,-30,]),'LEQ':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[14,14,-3,-5,14,-4,-6,-8,14,14,-7,14,14,14,14,-22,-23,-24,14,14,-25,-26,-27,-28,-29,-30,]),'GRT':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[15,15,-3,-5,15,-4,-6,-8,15,15,-7,15,15,15,15,-22,-23,-24,15,15,-25,-26,-27,-28,-29,-30,]),'LIM':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[16,16,-3,-5,16,-4,-6,-8,16,16,-7,16,16,16,16,-22,-23,-24,16,16,-25,-26,-27,-28,-29,-30,]),'LBRA':([0,2,4,5,17,37,38,51,53,54,87,89,92,93,94,112,114,115,123,125,164,165,166,167,168,200,],[17,17,-3,-5,17,-4,-6,-8,17,93,-7,93,93,93,17,-22,-23,-24,17,17,-25,-26,-27,-28,-29,-30,]),'OTE':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[19,19,-3,-5,19,19,-15,-4,-6,-16,-8,19,-7,19,-22,-23,-24,19,19,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'OTU':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[20,20,-3,-5,20,20,-15,-4,-6,-16,-8,20,-7,20,-22,-23,-24,20,20,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'OTL':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[21,21,-3,-5,21,21,-15,-4,-6,-16,-8,21,-7,21,-22,-23,-24,21,21,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'RES':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[22,22,-3,-5,22,22,-15,-4,-6,-16,-8,22,-7,22,-22,-23,-24,22,22,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'MOV':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[23,23,-3,-5,23,23,-15,-4,-6,-16,-8,23,-7,23,-22,-23,-24,23,23,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'COP':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[24,24,-3,-5,24,24,-15,-4,-6,-16,-8,24,-7,24,-22,-23,-24,24,24,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'TON':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[25,25,-3,-5,25,25,-15,-4,-6,-16,-8,25,-7,25,-22,-23,-24,25,25,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'TOF':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[26,26,-3,-5,26,26,-15,-4,-6,-16,-8,26,-7,26,-22,-23,-24,26,26,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'CTU':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[27,27,-3,-5,27,27,-15,-4,-6,-16,-8,27,-7,27,-22,-23,-24,27,27,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'JSR':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[28,28,-3,-5,28,28,-15,-4,-6,-16,-8,28,-7,28,-22,-23,-24,28,28,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'BTD':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[29,29,-3,-5,29,29,-15,-4,-6,-16,-8,29,-7,29,-22,-23,-24,29,29,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'ADD':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[30,30,-3,-5,30,30,-15,-4,-6,-16,-8,30,-7,30,-22,-23,-24,30,30,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'SUB':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[31,31,-3,-5,31,31,-15,-4,-6,-16,-8,31,-7,31,-22,-23,-24,31,31,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'CLR':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[32,32,-3,-5,32,32,-15,-4,-6,-16,-8,32,-7,32,-22,-23,-24,32,32,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'DIV':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[33,33,-3,-5,33,33,-15,-4,-6,-16,-8,33,-7,33,-22,-23,-24,33,33,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'CPT':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[34,34,-3,-5,34,34,-15,-4,-6,-16,-8,34,-7,34,-22,-23,-24,34,34,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'MSG':([0,2,4,5,6,17,18,37,38,40,51,53,87,94,112,114,115,123,125,126,127,128,129,139,142,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[35,35,-3,-5,35,35,-15,-4,-6,-16,-8,35,-7,35,-22,-23,-24,35,35,-31,-32,-33,-34,-44,-47,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'$end':([1,39,73,],[0,-2,-1,]),'SEMICOLON':([3,6,7,18,36,40,88,126,127,128,129,139,142,170,175,181,201,202,203,204,206,207,208,212,],[39,-13,-14,-15,73,-16,-17,-31,-32,-33,-34,-44,-47,-35,-40,-46,-36,-37,-38,-39,-42,-43,-45,-41,]),'COMMA':([4,5,6,7,17,18,37,38,40,51,53,54,55,75,76,77,81,82,83,84,85,86,87,88,89,90,92,93,99,100,101,102,103,104,105,106,107,109,110,112,113,114,115,126,127,128,129,139,142,148,151,152,153,154,156,157,158,159,164,165,166,167,168,170,175,181,191,200,201,202,203,204,206,207,208,209,212,],[-3,-5,-13,-14,54,-15,-4,-6,-16,-8,89,54,94,-48,-49,-50,116,117,118,119,120,121,-7,-17,54,123,89,54,130,131,132,133,134,135,136,137,138,140,141,-22,-51,-23,-24,-31,-32,-33,-34,-44,-47,169,171,172,173,174,176,177,178,179,-25,-26,-27,-28,-29,-35,-40,-46,205,-30,-36,-37,-38,-39,-42,-43,-45,210,-41,]),'RBRA':([4,5,6,7,17,18,37,38,40,50,51,52,53,54,55,87,88,90,91,92,93,112,114,115,122,124,126,127,128,129,139,142,149,164,165,166,167,168,170,175,181,200,201,202,203,204,206,207,208,212,],[-3,-5,-13,-14,51,-15,-4,-6,-16,87,-8,88,-10,-11,-21,-7,-17,-20,-12,-10,51,-22,-23,-24,-9,-19,-31,-32,-33,-34,-44,-47,-18,-25,-26,-27,-28,-29,-35,-40,-46,-30,-36,-37,-38,-39,-42,-43,-45,-41,]),'LPAR':([8,9,10,11,12,13,14,15,16,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,141,160,182,183,184,185,],[41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,160,160,160,160,160,160,]),'TAG':([41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,116,117,118,119,120,121,130,131,137,138,140,141,160,169,171,176,177,178,179,182,183,184,185,],[75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,75,]),'COMM_TAG':([41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,116,117,118,119,120,121,130,131,137,138,140,141,160,169,171,176,177,178,179,182,183,184,185,],[76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,76,]),'NUMBER':([41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,78,116,117,118,119,120,121,130,131,135,136,137,138,140,141,160,169,171,176,177,178,179,182,183,184,185,205,210,],[77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,77,113,77,77,77,77,77,77,77,77,155,156,77,77,77,163,163,77,77,77,77,77,77,163,163,163,163,209,211,]),'CPT_MINUS':([41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,75,76,113,116,117,118,119,120,121,130,131,137,138,140,141,160,161,162,163,169,171,176,177,178,179,180,182,183,184,185,195,196,197,198,199,],[78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,-48,-49,-51,78,78,78,78,78,78,78,78,78,78,78,78,78,-58,183,-50,78,78,78,78,78,78,183,78,78,78,78,-56,-52,-53,-54,-55,]),'RPAR':([74,75,76,77,79,80,95,96,97,98,108,111,113,143,144,145,146,147,150,155,161,162,163,180,186,187,188,189,190,192,193,194,195,196,197,198,199,211,],[112,-48,-49,-50,114,115,126,127,128,129,139,142,-51,164,165,166,167,168,170,175,-58,181,-50,195,200,201,202,203,204,206,207,208,-56,-52,-53,-54,-55,212,]),'CPT_PLUS':([75,76,113,161,162,163,180,195,196,197,198,199,],[-48,-49,-51,-58,182,-50,182,-56,-52,-53,-54,-55,]),'CPT_TIMES':([75,76,113,161,162,163,180,195,196,197,198,199,],[-48,-49,-51,-58,184,-50,184,-56,184,184,-54,-55,]),'CPT_DIV':([75,76,113,161,162,163,180,195,196,197,198,199,],[-48,-49,-51,-58,185,-50,185,-56,185,185,-54,-55,]),'UNDEF_VAL':([132,133,134,172,173,174,],[152,153,154,188,189,190,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'rung':([0,],[1,]),'input_list':([0,17,54,89,93,94,123,],[2,53,92,92,92,125,125,]),'output_list':([0,2,17,53,94,123,125,],[3,36,55,90,55,55,90,]),'input_instruction':([0,2,17,53,54,89,92,93,94,123,125,],[4,37,4,37,4,4,37,4,4,4,37,]),'input_branch':([0,2,17,53,54,89,92,93,94,123,125,],[5,38,5,38,5,5,38,5,5,5,38,]),'output_seq':([0,2,17,53,94,123,125,],[6,6,6,6,6,6,6,]),'output_branch':([0,2,17,53,94,123,125,],[7,7,7,7,7,7,7,]),'output_instruction':([0,2,6,17,53,94,123,125,],[18,18,40,18,18,18,18,18,]),'input_level':([17,54,89,93,],[50,91,122,50,]),'output_level':([17,94,123,],[52,124,149,]),'parameter':([41,42,43,44,45,46,47,48,49,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,116,117,118,119,120,121,130,131,137,138,140,141,160,169,171,176,177,178,179,182,183,184,185,],[74,79,80,81,82,83,84,85,86,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,143,144,145,146,147,148,150,151,157,158,159,161,161,186,187,191,192,193,194,161,161,161,161,]),'cpt_expression':([141,160,182,183,184,185,],[162,180,196,197,198,199,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> rung","S'",1,None,None,None),
+  ('rung -> input_list output_list SEMICOLON','rung',3,'p_rung_io','rungyacc.py',131),
+  ('rung -> output_list SEMICOLON','rung',2,'p_rung_o','rungyacc.py',135),
+  ('input_list -> input_instruction','input_list',1,'p_input_list_i','rungyacc.py',147),
+  ('input_list -> input_list input_instruction','input_list',2,'p_input_list_ii','rungyacc.py',151),
+  ('input_list -> input_branch','input_list',1,'p_input_list_b','rungyacc.py',156),
+  ('input_list -> input_list input_branch','input_list',2,'p_input_list_ib','rungyacc.py',160),
+  ('input_branch -> LBRA input_level RBRA','input_branch',3,'p_input_branch_l','rungyacc.py',173),
+  ('input_branch -> LBRA RBRA','input_branch',2,'p_input_branch_e','rungyacc.py',178),
+  ('input_level -> input_list COMMA input_level','input_level',3,'p_input_level_il','rungyacc.py',190),
+  ('input_level -> input_list','input_level',1,'p_input_level_i','rungyacc.py',195),
+  ('input_level -> COMMA','input_level',1,'p_input_level_c','rungyacc.py',199),
+  ('input_level -> COMMA input_level','input_level',2,'p_input_level_l','rungyacc.py',204),
+  ('output_list -> output_seq','output_list',1,'p_output_list_i','rungyacc.py',215),
+  ('output_list -> output_branch','output_list',1,'p_output_list_b','rungyacc.py',219),
+  ('output_seq -> output_instruction','output_seq',1,'p_output_seq_i','rungyacc.py',229),
+  ('output_seq -> output_seq output_instruction','output_seq',2,'p_output_seq_b','rungyacc.py',233),
+  ('output_branch -> LBRA output_level RBRA','output_branch',3,'p_output_branch_l','rungyacc.py',246),
+  ('output_level -> input_list output_list COMMA output_level','output_level',4,'p_output_level_iol','rungyacc.py',259),
+  ('output_level -> output_list COMMA output_level','output_level',3,'p_output_level_ol','rungyacc.py',264),
+  ('output_level -> input_list output_list','output_level',2,'p_output_level_io','rungyacc.py',269),
+  ('output_level -> output_list','output_level',1,'p_output_level_o','rungyacc.py',273),
+  ('input_instruction -> XIC LPAR parameter RPAR','input_instruction',4,'p_input_instruction_xic','rungyacc.py',282),
+  ('input_instruction -> XIO LPAR parameter RPAR','input_instruction',4,'p_input_instruction_xio','rungyacc.py',286),
+  ('input_instruction -> ONS LPAR parameter RPAR','input_instruction',4,'p_input_instruction_ons','rungyacc.py',290),
+  ('input_instruction -> EQU LPAR parameter COMMA parameter RPAR','input_instruction',6,'p_input_instruction_equ','rungyacc.py',294),
+  ('input_instruction -> GEQ LPAR parameter COMMA parameter RPAR','input_instruction',6,'p_input_instruction_geq','rungyacc.py',298),
+  ('input_instruction -> NEQ LPAR parameter COMMA parameter RPAR','input_instruction',6,'p_input_instruction_neq','rungyacc.py',302),
+  ('input_instruction -> LEQ LPAR parameter COMMA parameter RPAR','input_instruction',6,'p_input_instruction_leq','rungyacc.py',306),
+  ('input_instruction -> GRT LPAR parameter COMMA parameter RPAR','input_instruction',6,'p_input_instruction_grt','rungyacc.py',310),
+  ('input_instruction -> LIM LPAR parameter COMMA parameter COMMA parameter RPAR','input_instruction',8,'p_input_instruction_lim','rungyacc.py',314),
+  ('output_instruction -> OTE LPAR parameter RPAR','output_instruction',4,'p_output_instruction_ote','rungyacc.py',324),
+  ('output_instruction -> OTU LPAR parameter RPAR','output_instruction',4,'p_output_instruction_otu','rungyacc.py',328),
+  ('output_instruction -> OTL LPAR parameter RPAR','output_instruction',4,'p_output_instruction_otl','rungyacc.py',332),
+  ('output_instruction -> RES LPAR parameter RPAR','output_instruction',4,'p_output_instruction_res','rungyacc.py',336),
+  ('output_instruction -> MOV LPAR parameter COMMA parameter RPAR','output_instruction',6,'p_output_instruction_mov','rungyacc.py',340),
+  ('output_instruction -> COP LPAR parameter COMMA parameter COMMA parameter RPAR','output_instruction',8,'p_output_instruction_cop','rungyacc.py',344),
+  ('output_instruction -> TON LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR','output_instruction',8,'p_output_instruction_ton','rungyacc.py',349),
+  ('output_instruction -> TOF LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR','output_instruction',8,'p_output_instruction_tof','rungyacc.py',353),
+  ('output_instruction -> CTU LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR','output_instruction',8,'p_output_instruction_ctu','rungyacc.py',357),
+  ('output_instruction -> JSR LPAR parameter COMMA NUMBER RPAR','output_instruction',6,'p_output_instruction_jsr','rungyacc.py',361),
+  ('output_instruction -> BTD LPAR parameter COMMA NUMBER COMMA parameter COMMA NUMBER COMMA NUMBER RPAR','output_instruction',12,'p_output_instruction_btd','rungyacc.py',365),
+  ('output_instruction -> ADD LPAR parameter COMMA parameter COMMA parameter RPAR','output_instruction',8,'p_output_instruction_add','rungyacc.py',370),
+  ('output_instruction -> SUB LPAR parameter COMMA parameter COMMA parameter RPAR','output_instruction',8,'p_output_instruction_sub','rungyacc.py',374),
+  ('output_instruction -> CLR LPAR parameter RPAR','output_instruction',4,'p_output_instruction_clr','rungyacc.py',378),
+  ('output_instruction -> DIV LPAR parameter COMMA parameter COMMA parameter RPAR','output_instruction',8,'p_output_instruction_div','rungyacc.py',382),
+  ('output_instruction -> CPT LPAR parameter COMMA cpt_expression RPAR','output_instruction',6,'p_output_instruction_cpt','rungyacc.py',386),
+  ('output_instruction -> MSG LPAR parameter RPAR','output_instruction',4,'p_output_instruction_msg','rungyacc.py',390),
+  ('parameter -> TAG','parameter',1,'p_parameter_tag','rungyacc.py',400),
+  ('parameter -> COMM_TAG','parameter',1,'p_parameter_comm_tag','rungyacc.py',404),
+  ('parameter -> NUMBER','parameter',1,'p_parameter_number','rungyacc.py',408),
+  ('parameter -> CPT_MINUS NUMBER','parameter',2,'p_parameter_neg_number','rungyacc.py',412),
+  ('cpt_expression -> cpt_expression CPT_PLUS cpt_expression','cpt_expression',3,'p_cpt_expression_plus','rungyacc.py',433),
+  ('cpt_expression -> cpt_expression CPT_MINUS cpt_expression','cpt_expression',3,'p_cpt_expression_minus','rungyacc.py',437),
+  ('cpt_expression -> cpt_expression CPT_TIMES cpt_expression','cpt_expression',3,'p_cpt_expression_times','rungyacc.py',441),
+  ('cpt_expression -> cpt_expression CPT_DIV cpt_expression','cpt_expression',3,'p_cpt_expression_div','rungyacc.py',445),
+  ('cpt_expression -> LPAR cpt_expression RPAR','cpt_expression',3,'p_cpt_expression_par','rungyacc.py',449),
+  ('cpt_expression -> NUMBER','cpt_expression',1,'p_cpt_expression_number','rungyacc.py',453),
+  ('cpt_expression -> parameter','cpt_expression',1,'p_cpt_expression_parameter','rungyacc.py',457),
+]
+grammar_version = 'b15761a52a0f91a3541e190d882bc68972c7915e'
@@ -69,13 +69,56 @@
 #               OUTPUT_LIST : OUTPUT_INSTRUCTION | OUTPUT_BRANCH
 #
 ################################################################################
+import os
 import sys
 import logging
+import hashlib
+import argparse
+import threading
+import importlib.util
 from ply import yacc
 from runglex import tokens
 from runglex import runglex
+import rungfast
+from rungast import Rung
+from rungast import InputBranch
+from rungast import OutputBranch
+from rungast import Instruction
+from rungast import Operation
+from rungast import Group
+from rungast import generate
+from rungopt import optimize
+import rungexpr
 
-def rungyacc(debug=False):
+####################################################
+#
+# LOCATION AND VERSION OF THE PREBUILT TABLES
+# obs: tables are always read from the directory of
+#      this file, never from the working directory.
+#      The tables only depend on the lexer and the
+#      grammar, while the code generated for a rung
+#      also depends on the fast parser, the syntax
+#      tree and the code generators, which are hashed
+#      into the version of the translator
+###################################################
+tables_dir = os.path.dirname(os.path.abspath(__file__))
+lextab_name = 'runglextab'
+parsetab_name = 'rungparsetab'
+grammar_sources = ['runglex.py', 'rungyacc.py']
+translator_sources = grammar_sources + ['rungfast.py', 'rungast.py', 'rungopt.py',
+                                        'rungexpr.py']
+
+def get_version(sources):
+    digest = hashlib.sha1()
+    for source in sources:
+        with open(os.path.join(tables_dir, source), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+grammar_version = get_version(grammar_sources)
+translator_version = get_version(translator_sources)
+
+def rungyacc(debug=False, tabmodule=None, outputdir=None):
     log = logging.getLogger('l5x2c')
     
     ################################################################################
@@ -86,11 +129,11 @@ def rungyacc(debug=False):
     ################################################################################
     def p_rung_io(p):
         'rung : input_list output_list SEMICOLON'
-        p[0] = 'clear();push(true);' + p[1] + p[2]
+        p[0] = Rung(p[1], p[2])
         
     def p_rung_o(p):
         'rung : output_list SEMICOLON'
-        p[0] = 'clear();push(true);' + p[1]
+        p[0] = Rung([], p[1])
 
     ################################################################################
     #
@@ -102,29 +145,34 @@ def rungyacc(debug=False):
     ################################################################################
     def p_input_list_i(p):
         'input_list : input_instruction'
-        p[0] = p[1]
+        p[0] = [p[1]]
         
     def p_input_list_ii(p):
         'input_list : input_list input_instruction'
-        p[0] = p[1] + p[2]
+        p[1].append(p[2])
+        p[0] = p[1]
 
     def p_input_list_b(p):
         'input_list : input_branch'
-        p[0] = p[1]
+        p[0] = [p[1]]
 
     def p_input_list_ib(p):
         'input_list : input_list input_branch'
-        p[0] = p[1] + p[2]
+        p[1].append(p[2])
+        p[0] = p[1]
 
     ################################################################################
     #
     #   INPUT_BRANCH    :      [ INPUT_LEVEL ]
     #                           | []
     #
+    #   obs: the levels are collected from right to left
+    #
     ################################################################################
     def p_input_branch_l(p):
         'input_branch : LBRA input_level RBRA'
-        p[0] = 'push(false);push(true);' + p[2] + 'or();and();'
+        p[2].reverse()
+        p[0] = InputBranch(p[2])
 
     def p_input_branch_e(p):
         'input_branch : LBRA RBRA'
@@ -140,20 +188,22 @@ def rungyacc(debug=False):
     ################################################################################
     def p_input_level_il(p):
         'input_level : input_list COMMA input_level'
-        p[0] = p[1] + 'or();push(true);' + p[3]
+        p[3].append(p[1])
+        p[0] = p[3]
 
     def p_input_level_i(p):
         'input_level : input_list'
-        p[0] = p[1]
+        p[0] = [p[1]]
         
     def p_input_level_c(p):
         'input_level : COMMA'
-        p[0] = 'or();push(true);'
+        p[0] = [[], []]
         
         
     def p_input_level_l(p):
         'input_level : COMMA input_level'
-        p[0] = 'or();push(true);' + p[2]
+        p[2].append([])
+        p[0] = p[2]
         
     ################################################################################
     #
@@ -167,7 +217,7 @@ def rungyacc(debug=False):
         
     def p_output_list_b(p):
         'output_list : output_branch'
-        p[0] = p[1]
+        p[0] = [p[1]]
     
     ################################################################################
     #    
@@ -177,21 +227,25 @@ def rungyacc(debug=False):
     ################################################################################
     def p_output_seq_i(p):
         'output_seq : output_instruction'
-        p[0] = p[1]
+        p[0] = [p[1]]
         
     def p_output_seq_b(p):
         'output_seq : output_seq output_instruction'
-        p[0] = p[1] + p[2]
+        p[1].append(p[2])
+        p[0] = p[1]
     
     
     ################################################################################
     #
     #   OUTPUT_BRANCH   :      [ OUTPUT_LEVEL ]
     #
+    #   obs: the levels are collected from right to left
+    #
     ################################################################################
     def p_output_branch_l(p):
         'output_branch : LBRA output_level RBRA'
-        p[0] = 'push(acc());' + p[2] + 'pop();'
+        p[2].reverse()
+        p[0] = OutputBranch(p[2])
 
     ################################################################################
     #
@@ -203,19 +257,21 @@ def rungyacc(debug=False):
     ################################################################################
     def p_output_level_iol(p):
         'output_level : input_list output_list COMMA output_level'
-        p[0] = p[1] + p[2] + 'pop();push(acc());' + p[4]
+        p[4].append((p[1], p[2]))
+        p[0] = p[4]
 
     def p_output_level_ol(p):
         'output_level : output_list COMMA output_level'
-        p[0] = p[1] + 'pop();push(acc());' + p[3]
+        p[3].append(([], p[1]))
+        p[0] = p[3]
 
     def p_output_level_io(p):
         'output_level : input_list output_list'
-        p[0] = p[1] + p[2]
+        p[0] = [(p[1], p[2])]
         
     def p_output_level_o(p):
         'output_level : output_list'
-        p[0] = p[1]
+        p[0] = [([], p[1])]
         
     ################################################################################
     #
@@ -224,39 +280,39 @@ def rungyacc(debug=False):
     ################################################################################
     def p_input_instruction_xic(p):
         'input_instruction : XIC LPAR parameter RPAR'
-        p[0] = 'push(' + p[3] + ');and();'
+        p[0] = Instruction('XIC', (p[3],))
         
     def p_input_instruction_xio(p):
         'input_instruction : XIO LPAR parameter RPAR'
-        p[0] = 'push(!' + p[3] + ');and();'
+        p[0] = Instruction('XIO', (p[3],))
     
     def p_input_instruction_ons(p):
         'input_instruction : ONS LPAR parameter RPAR'
-        p[0] = 'if(' + p[3] + '==acc()){if(acc()){pop();push(false);}}else{' + p[3] + '=acc();}'
+        p[0] = Instruction('ONS', (p[3],))
     
     def p_input_instruction_equ(p):
         'input_instruction : EQU LPAR parameter COMMA parameter RPAR'
-        p[0] = 'push(%s==%s);and();' % (p[3],p[5])
+        p[0] = Instruction('EQU', (p[3],p[5]))
     
     def p_input_instruction_geq(p):
         'input_instruction : GEQ LPAR parameter COMMA parameter RPAR'
-        p[0] = 'push(%s>=%s);and();' % (p[3],p[5])
+        p[0] = Instruction('GEQ', (p[3],p[5]))
     
     def p_input_instruction_neq(p):
         'input_instruction : NEQ LPAR parameter COMMA parameter RPAR'
-        p[0] = 'push(%s!=%s);and();' % (p[3],p[5])
+        p[0] = Instruction('NEQ', (p[3],p[5]))
         
     def p_input_instruction_leq(p):
         'input_instruction : LEQ LPAR parameter COMMA parameter RPAR'
-        p[0] = 'push(%s<%s);and();' % (p[3],p[5])
+        p[0] = Instruction('LEQ', (p[3],p[5]))
         
     def p_input_instruction_grt(p):
         'input_instruction : GRT LPAR parameter COMMA parameter RPAR'
-        p[0] = 'push(%s>%s);and();' % (p[3],p[5])
+        p[0] = Instruction('GRT', (p[3],p[5]))
 
     def p_input_instruction_lim(p):
         'input_instruction : LIM LPAR parameter COMMA parameter COMMA parameter RPAR'
-        p[0] = 'if(acc()){{if({low}<={high}){{if({low}>={value}||{value}>={high}){{pop();push(false);}}}}else{{if({low}<={value}||{value}<={high}){{pop();push(false);}}}}}}'.format(low=p[3], value=p[5], high=p[7])
+        p[0] = Instruction('LIM', (p[3],p[5],p[7]))
     
         
     ################################################################################
@@ -266,74 +322,74 @@ def rungyacc(debug=False):
     ################################################################################
     def p_output_instruction_ote(p):
         'output_instruction : OTE LPAR parameter RPAR'
-        p[0] = p[3] + '=acc();'
+        p[0] = Instruction('OTE', (p[3],))
         
     def p_output_instruction_otu(p):
         'output_instruction : OTU LPAR parameter RPAR'
-        p[0] = 'if(acc())' + p[3] + '=0;'
+        p[0] = Instruction('OTU', (p[3],))
         
     def p_output_instruction_otl(p):
         'output_instruction : OTL LPAR parameter RPAR'
-        p[0] = 'if(acc())' + p[3] + '=1;'
+        p[0] = Instruction('OTL', (p[3],))
     
     def p_output_instruction_res(p):
         'output_instruction : RES LPAR parameter RPAR'
-        p[0] = 'if(acc())' + p[3] + '.ACC=0;'
+        p[0] = Instruction('RES', (p[3],))
         
     def p_output_instruction_mov(p):
         'output_instruction : MOV LPAR parameter COMMA parameter RPAR'
-        p[0] = 'if(acc())' + p[5] + '=' + p[3] + ';'
+        p[0] = Instruction('MOV', (p[3],p[5]))
     
     def p_output_instruction_cop(p):
         'output_instruction : COP LPAR parameter COMMA parameter COMMA parameter RPAR'
         log.warning("Instruction COP is not supported. Instruction was ignored.")
-        p[0] = ''  
+        p[0] = Instruction('COP', (p[3],p[5],p[7]))
     
     def p_output_instruction_ton(p):
         'output_instruction : TON LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR'
-        p[0] = 'ton(acc(), &' + p[3] + ');'
+        p[0] = Instruction('TON', (p[3],))
     
     def p_output_instruction_tof(p):
         'output_instruction : TOF LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR'
-        p[0] = 'tof(acc(), &' + p[3] + ');'
+        p[0] = Instruction('TOF', (p[3],))
         
     def p_output_instruction_ctu(p):
         'output_instruction : CTU LPAR parameter COMMA UNDEF_VAL COMMA UNDEF_VAL RPAR'
-        p[0] = 'ctu(acc(), &' + p[3] + ');'
+        p[0] = Instruction('CTU', (p[3],))
         
     def p_output_instruction_jsr(p):
         'output_instruction : JSR LPAR parameter COMMA NUMBER RPAR'
-        p[0] = 'if(acc())%s();' % (p[3])
+        p[0] = Instruction('JSR', (p[3],p[5]))
         
     def p_output_instruction_btd(p):
         'output_instruction : BTD LPAR parameter COMMA NUMBER COMMA parameter COMMA NUMBER COMMA NUMBER RPAR'
         log.warning("Instruction BTD is not supported. Instruction was ignored.")
-        p[0] = ''
+        p[0] = Instruction('BTD', (p[3],p[5],p[7],p[9],p[11]))
         
     def p_output_instruction_add(p):
         'output_instruction : ADD LPAR parameter COMMA parameter COMMA parameter RPAR'
-        p[0] = 'if(acc()){%s=%s+%s;};' % (p[7],p[3],p[5])
+        p[0] = Instruction('ADD', (p[3],p[5],p[7]))
         
     def p_output_instruction_sub(p):
         'output_instruction : SUB LPAR parameter COMMA parameter COMMA parameter RPAR'
-        p[0] = 'if(acc()){%s=%s-%s;};' % (p[7],p[3],p[5])
+        p[0] = Instruction('SUB', (p[3],p[5],p[7]))
     
     def p_output_instruction_clr(p):
         'output_instruction : CLR LPAR parameter RPAR'
-        p[0] = 'if(acc()){%s=0;};' % (p[3])
+        p[0] = Instruction('CLR', (p[3],))
     
     def p_output_instruction_div(p):
         'output_instruction : DIV LPAR parameter COMMA parameter COMMA parameter RPAR'
-        p[0] = 'if(acc()){%s=%s/%s;};' % (p[7],p[3],p[5])
+        p[0] = Instruction('DIV', (p[3],p[5],p[7]))
         
     def p_output_instruction_cpt(p):
         'output_instruction : CPT LPAR parameter COMMA cpt_expression RPAR'
-        p[0] = 'if(acc()){%s=%s;};' % (p[3],p[5])
+        p[0] = Instruction('CPT', (p[3],p[5]))
         
     def p_output_instruction_msg(p):
         'output_instruction : MSG LPAR parameter RPAR'
         log.warning("Instruction MSG is not supported. Instruction was ignored.")
-        p[0] = ''
+        p[0] = Instruction('MSG', (p[3],))
         
     ################################################################################
     #
@@ -375,23 +431,23 @@ def rungyacc(debug=False):
     )
     def p_cpt_expression_plus(p):
         'cpt_expression : cpt_expression CPT_PLUS cpt_expression'
-        p[0] = '%s+%s' % (p[1],p[3])
+        p[0] = Operation(p[2], p[1], p[3])
         
     def p_cpt_expression_minus(p):
         'cpt_expression : cpt_expression CPT_MINUS cpt_expression'
-        p[0] = '%s-%s' % (p[1],p[3])
+        p[0] = Operation(p[2], p[1], p[3])
         
     def p_cpt_expression_times(p):
         'cpt_expression : cpt_expression CPT_TIMES cpt_expression'
-        p[0] = '%s*%s' % (p[1],p[3])
+        p[0] = Operation(p[2], p[1], p[3])
         
     def p_cpt_expression_div(p):
         'cpt_expression : cpt_expression CPT_DIV cpt_expression'
-        p[0] = '%s/%s' % (p[1],p[3])
+        p[0] = Operation(p[2], p[1], p[3])
         
     def p_cpt_expression_par(p):
         'cpt_expression : LPAR cpt_expression RPAR'
-        p[0] = '(%s)' % (p[2])
+        p[0] = Group(p[2])
     
     def p_cpt_expression_number(p):
         'cpt_expression : NUMBER'
@@ -409,8 +465,119 @@ def rungyacc(debug=False):
     def p_error(p):
         log.error("Syntax error at '%s'" % repr(p))
         raise SyntaxError
-        
-    return yacc.yacc(debug=debug,errorlog=log)
+    
+    # prebuilt tables skip the validation of the grammar
+    if tabmodule is not None:
+        return yacc.yacc(debug=debug,errorlog=log,optimize=True,
+                         tabmodule=tabmodule,write_tables=False)
+    # tables are only written when building them
+    if outputdir is not None:
+        return yacc.yacc(debug=debug,errorlog=log,tabmodule=parsetab_name,
+                         outputdir=outputdir,write_tables=True)
+    return yacc.yacc(debug=debug,errorlog=log,tabmodule=parsetab_name,
+                     write_tables=False)
+
+
+####################################################
+#
+# LOAD A PREBUILT TABLE MODULE
+# obs: returns None if the table is missing or was
+#      built from another version of the grammar
+###################################################
+def load_table(name):
+    log = logging.getLogger('l5x2c')
+    path = os.path.join(tables_dir, name + '.py')
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if getattr(module, 'grammar_version', None) != grammar_version:
+        log.warning("Table %s is outdated. Run 'python rungyacc.py --build-tables'." % (name))
+        return None
+    return module
+
+####################################################
+#
+# BUILD THE LEXER AND PARSER TABLES
+# obs: run once after changing the grammar. The
+#      tables are written next to this file
+###################################################
+def build_tables():
+    for name in (lextab_name, parsetab_name):
+        path = os.path.join(tables_dir, name + '.py')
+        if os.path.exists(path):
+            os.remove(path)
+    
+    lexer = runglex()
+    lexer.writetab(lextab_name, tables_dir)
+    rungyacc(outputdir=tables_dir)
+    
+    for name in (lextab_name, parsetab_name):
+        with open(os.path.join(tables_dir, name + '.py'), 'a') as f:
+            f.write("grammar_version = '%s'\n" % (grammar_version))
+
+####################################################
+#
+# PROCESS-WIDE RUNG TRANSLATOR
+# obs: builds the lexer and parser once. PLY parsers
+#      keep state while parsing, so calls are
+#      serialized with a lock. Rungs go through the
+#      fast path first and PLY only gets the ones it
+#      gives up on. parse() returns the syntax tree,
+#      generate() the C code of a tree and translate()
+#      the C code of a rung, by the stack machine
+#      (passed through the peephole optimizer if
+#      optimize is set) or the stackless expression
+#      generator. version identifies the code the
+#      translator generates
+###################################################
+codegens = ['stack', 'expr']
+
+class RungTranslator():
+    def __init__(self, fast=True, optimize=False, codegen='stack'):
+        self.fast = fast
+        self.optimize = optimize
+        self.codegen = codegen
+        self.version = translator_version
+        if codegen != 'stack':
+            self.version += '-' + codegen
+        elif optimize:
+            self.version += '-O'
+        lextab = load_table(lextab_name)
+        parsetab = load_table(parsetab_name)
+        self.lexer = runglex(lextab=lextab)
+        self.parser = rungyacc(tabmodule=parsetab)
+        self.lock = threading.Lock()
+    
+    def parse(self, rung, tokens=None):
+        if self.fast:
+            tree = rungfast.parse(rung, tokens)
+            if tree is not None:
+                return tree
+        with self.lock:
+            return self.parser.parse(rung, lexer=self.lexer)
+    
+    def generate(self, tree):
+        if self.codegen == 'expr':
+            return rungexpr.generate(tree)
+        if self.optimize:
+            return optimize(tree)
+        return generate(tree)
+    
+    def translate(self, rung):
+        return self.generate(self.parse(rung))
+
+
+translators = {}
+translator_lock = threading.Lock()
+
+def get_translator(optimize=False, codegen='stack'):
+    with translator_lock:
+        if (optimize, codegen) not in translators:
+            translators[(optimize, codegen)] = RungTranslator(optimize=optimize,
+                                                              codegen=codegen)
+        return translators[(optimize, codegen)]
 
 
 
@@ -421,12 +588,21 @@ def rungyacc(debug=False):
 #
 ###################################################
 def main():
-    # build the lexer
-    lexer = runglex()
-    # Build the parser
-    parser = rungyacc()
+    description = "Translates a rung read from the standard input"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--build-tables', action='store_true',
+                            help="build the lexer and parser tables and exit")
+    parser.add_argument('-O', '--optimize', action='store_true',
+                            help="optimize the stack operations of the generated code")
+    parser.add_argument('--codegen', choices=codegens, default='stack',
+                            help="generate stack machine calls or plain C expressions")
+    
+    args = vars(parser.parse_args())
+    if args['build_tables']:
+        build_tables()
+        return
     
-    result = parser.parse(sys.stdin.readline())
+    result = get_translator(args['optimize'], args['codegen']).translate(sys.stdin.readline())
     print(result)
     
 if __name__== "__main__":
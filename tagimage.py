@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import ctypes
+import struct
+import logging
+import tempfile
+from array import array
+from tagmodel import ValueNode
+from tagmodel import StructNode
+from tagmodel import ArrayNode
+
+####################################################
+#
+# C TYPES OF THE ATOMIC AND BUILT-IN DATATYPES
+# obs: timer and counter follow plcmodel.template
+###################################################
+atomic_ctypes = {
+    'SINT'   : ctypes.c_int8,
+    'INT'    : ctypes.c_int16,
+    'DINT'   : ctypes.c_int32,
+    'BOOL'   : ctypes.c_bool,
+    'BIT'    : ctypes.c_bool,
+    'REAL'   : ctypes.c_float,
+    'LINT'   : ctypes.c_int64,
+    'USINT'  : ctypes.c_uint8,
+    'UINT'   : ctypes.c_uint16,
+    'UDINT'  : ctypes.c_uint32,
+    'LREAL'  : ctypes.c_double,
+    'ULINT'  : ctypes.c_uint64,
+}
+
+class timer(ctypes.Structure):
+    _fields_ = [('EN', ctypes.c_bool), ('TT', ctypes.c_bool), ('DN', ctypes.c_bool),
+                ('PRE', ctypes.c_long), ('ACC', ctypes.c_long)]
+
+class counter(ctypes.Structure):
+    _fields_ = [('CD', ctypes.c_bool), ('CU', ctypes.c_bool), ('DN', ctypes.c_bool),
+                ('OV', ctypes.c_bool), ('UN', ctypes.c_bool),
+                ('PRE', ctypes.c_long), ('ACC', ctypes.c_long)]
+
+builtin_ctypes = dict(atomic_ctypes, TIMER=timer, COUNTER=counter)
+
+####################################################
+#
+# BINARY IMAGE OF THE INITIAL VALUES OF THE TAGS
+# obs: each tag is packed in a ctypes object with the
+#      layout the C compiler of this machine gives to
+#      its declaration, so the loader can fread it
+#      straight into the global. The file is a header
+#      (magic, count, table offset), the tags aligned
+#      to 8 bytes and a table with the offset and size
+#      of each tag, in native byte order. It is
+#      written to a temporary file that replaces the
+#      image on close(). discard() removes it instead
+###################################################
+class TagImage():
+    magic = b'L5XTAGS\0'
+    header = struct.Struct('=8sQQ')
+    entry = struct.Struct('=QQ')
+    
+    def __init__(self, path):
+        self.path = path
+        self.datatypes = {}
+        self.ctypes = dict(builtin_ctypes)
+        self.names = []
+        self.entries = []
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, self.temporary = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+        self.file = open(fd, 'wb')
+        self.file.write(self.header.pack(self.magic, 0, 0))
+
+    ####################################################
+    #
+    # C TYPE OF A DATATYPE
+    # obs: user defined types are built from their
+    #      members, in the order of their typedef
+    ###################################################
+    def ctype(self, datatype):
+        if datatype not in self.ctypes:
+            if datatype not in self.datatypes:
+                raise KeyError("DataType %s is not in the export" % (datatype))
+            fields = []
+            members = self.datatypes[datatype].get('members', {})
+            for field in members:
+                member_type = self.ctype(members[field]['type'])
+                if members[field].get('dimension') and int(members[field]['dimension']) > 0:
+                    member_type = member_type * int(members[field]['dimension'])
+                fields.append((field, member_type))
+            self.ctypes[datatype] = type(datatype + '_t', (ctypes.Structure,),
+                                         {'_fields_': fields})
+        return self.ctypes[datatype]
+
+    def tag_ctype(self, node):
+        ctype = self.ctype(node.type)
+        if isinstance(node, ArrayNode):
+            for size in reversed(node.dimensions):
+                ctype = ctype * size
+        return ctype
+
+    ####################################################
+    #
+    # ADD A TAG TO THE IMAGE
+    #
+    ###################################################
+    def add(self, name, node):
+        value = self.tag_ctype(node)()
+        if isinstance(node, ValueNode):
+            value.value = self.scalar(name, node)
+        else:
+            self.fill(name, value, node)
+        data = bytes(value)
+        position = self.file.tell()
+        padding = -position % 8
+        self.file.write(b'\0' * padding)
+        self.entries.append((position + padding, len(data)))
+        self.names.append(name)
+        self.file.write(data)
+
+    def close(self):
+        table = self.file.tell()
+        for entry in self.entries:
+            self.file.write(self.entry.pack(*entry))
+        self.file.seek(0)
+        self.file.write(self.header.pack(self.magic, len(self.entries), table))
+        self.file.close()
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.temporary, 0o666 & ~umask)
+        os.replace(self.temporary, self.path)
+
+    def discard(self):
+        self.file.close()
+        os.remove(self.temporary)
+
+    ####################################################
+    #
+    # COPY A NODE INTO A CTYPES STRUCTURE OR ARRAY
+    # obs: atomic arrays are copied as raw memory when
+    #      the element sizes match
+    ###################################################
+    def fill(self, name, value, node):
+        if isinstance(node, StructNode):
+            for field in node.members:
+                member = node.members[field]
+                if member is None:
+                    continue
+                if not hasattr(value, field):
+                    logging.warning("Tag %s: %s has no member %s. Ignored." %
+                                    (name, node.type, field))
+                elif isinstance(member, ValueNode):
+                    self.assign(name, value, field, member)
+                else:
+                    self.fill(name + '.' + field, getattr(value, field), member)
+        elif isinstance(node, ArrayNode):
+            element_type = self.ctype(node.type)
+            flat = (element_type * len(node.elements)).from_buffer(value)
+            elements = node.elements
+            if isinstance(elements, array) and elements.itemsize == ctypes.sizeof(element_type):
+                ctypes.memmove(flat, elements.buffer_info()[0], len(elements) * elements.itemsize)
+            elif isinstance(elements, array):
+                for index, element in enumerate(elements):
+                    flat[index] = element
+            else:
+                for index, element in enumerate(elements):
+                    if element is None:
+                        continue
+                    elif isinstance(element, ValueNode):
+                        flat[index] = self.scalar(name, element)
+                    else:
+                        self.fill('%s[%d]' % (name, index), flat[index], element)
+
+    def assign(self, name, value, field, node):
+        try:
+            setattr(value, field, self.scalar(name, node))
+        except TypeError:
+            logging.warning("Tag %s: value %r of %s does not fit. Ignored." %
+                            (name, node.value, field))
+
+    def scalar(self, name, node):
+        if isinstance(node.value, str):
+            logging.warning("Tag %s: value %r is not a number. Using 0." % (name, node.value))
+            return 0
+        if atomic_ctypes.get(node.type) is ctypes.c_bool:
+            return bool(node.value)
+        return node.value
@@ -0,0 +1,277 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import sys
+import struct
+from array import array
+
+####################################################
+#
+# ARRAY TYPECODES FOR THE ATOMIC DATATYPES
+#
+###################################################
+atomic_typecodes = {
+    'SINT'   : 'b',
+    'INT'    : 'h',
+    'DINT'   : 'i',
+    'BOOL'   : 'B',
+    'BIT'    : 'B',
+    'REAL'   : 'f',
+    'LINT'   : 'q',
+    'USINT'  : 'B',
+    'UINT'   : 'H',
+    'UDINT'  : 'I',
+    'LREAL'  : 'd',
+    'ULINT'  : 'Q',
+}
+
+####################################################
+#
+# RADIX PREFIXES USED IN DECORATED DATA
+#
+###################################################
+radix_prefixes = {
+    '16#' : 16,
+    '8#'  : 8,
+    '2#'  : 2,
+}
+
+
+####################################################
+#
+# SCALAR TAG VALUE
+#
+###################################################
+class ValueNode():
+    __slots__ = ('type', 'value')
+    
+    def __init__(self, datatype, value):
+        self.type = datatype
+        self.value = value
+    
+    def __eq__(self, other):
+        return (isinstance(other, ValueNode) and self.type == other.type
+                and self.value == other.value)
+    
+    def __repr__(self):
+        return 'ValueNode(%r, %r)' % (self.type, self.value)
+
+
+####################################################
+#
+# STRUCTURE TAG VALUE
+# obs: members maps the member names to nodes
+###################################################
+class StructNode():
+    __slots__ = ('type', 'members')
+    
+    def __init__(self, datatype, members):
+        self.type = datatype
+        self.members = members
+    
+    def __eq__(self, other):
+        return (isinstance(other, StructNode) and self.type == other.type
+                and self.members == other.members)
+    
+    def __repr__(self):
+        return 'StructNode(%r, %r)' % (self.type, self.members)
+
+
+####################################################
+#
+# ARRAY TAG VALUE
+# obs: elements is an array.array for atomic types
+#      and a list of nodes (None if missing) otherwise
+###################################################
+class ArrayNode():
+    __slots__ = ('type', 'dimensions', 'elements')
+    
+    def __init__(self, datatype, dimensions, elements):
+        self.type = datatype
+        self.dimensions = dimensions
+        self.elements = elements
+    
+    def __len__(self):
+        return len(self.elements)
+    
+    def __eq__(self, other):
+        return (isinstance(other, ArrayNode) and self.type == other.type
+                and self.dimensions == other.dimensions
+                and self.elements == other.elements)
+    
+    def __repr__(self):
+        return 'ArrayNode(%r, %r, %r)' % (self.type, self.dimensions, self.elements)
+
+
+####################################################
+#
+# INTERN A TYPE OR MEMBER NAME
+#
+###################################################
+def intern(name):
+    if name is None:
+        return None
+    return sys.intern(name)
+
+####################################################
+#
+# PARSE THE DIMENSIONS ATTRIBUTE
+# obs: '10' -> (10,), '2 3' -> (2, 3)
+###################################################
+def parse_dimensions(text):
+    return tuple(int(d) for d in text.replace(',', ' ').split())
+
+####################################################
+#
+# CONVERT AN ELEMENT INDEX TO A FLAT INDEX
+# obs: '[1]' -> 1, '[1,2]' on (2, 3) -> 5
+###################################################
+def flat_index(text, dimensions):
+    index = 0
+    for position, value in enumerate(text.strip()[1:-1].split(',')):
+        size = dimensions[position] if position < len(dimensions) else 1
+        index = index * size + int(value)
+    return index
+
+####################################################
+#
+# PARSE A DECORATED VALUE
+# obs: returns the text unchanged if it can not be
+#      converted to a number of the given datatype
+###################################################
+def parse_value(datatype, text):
+    typecode = atomic_typecodes.get(datatype)
+    if typecode is None or text is None:
+        return text
+    try:
+        if typecode in 'fd':
+            return float(text)
+        for prefix in radix_prefixes:
+            if text.startswith(prefix):
+                bits = 8 * array(typecode).itemsize
+                value = int(text[len(prefix):].replace('_', ''), radix_prefixes[prefix])
+                value &= (1 << bits) - 1
+                if typecode.islower() and value >= 1 << (bits - 1):
+                    value -= 1 << bits
+                return value
+        return int(text)
+    except ValueError:
+        return text
+
+####################################################
+#
+# FORMAT A VALUE AS A C LITERAL
+# obs: REAL values use the shortest text that gives
+#      back the same single precision number
+###################################################
+def format_value(datatype, value):
+    if isinstance(value, float):
+        if atomic_typecodes.get(datatype) == 'f':
+            packed = struct.pack('<f', value)
+            for precision in range(1, 10):
+                shortest = float('%.*g' % (precision, value))
+                try:
+                    if struct.pack('<f', shortest) == packed:
+                        return repr(shortest)
+                except OverflowError:
+                    pass
+        return repr(value)
+    return str(value)
+
+####################################################
+#
+# BUILD AN ARRAY OF ATOMIC VALUES
+# obs: returns None if a value does not fit the
+#      typed buffer
+###################################################
+def build_atomic_elements(datatype, length, values):
+    elements = array(atomic_typecodes[datatype], bytes(length * array(atomic_typecodes[datatype]).itemsize))
+    try:
+        for index, value in values:
+            if isinstance(value, str):
+                return None
+            elements[index] = value
+    except (OverflowError, TypeError, IndexError):
+        return None
+    return elements
+
+####################################################
+#
+# ATOMIC DATATYPES STORED CONTIGUOUSLY IN RAW DATA
+# obs: BOOL arrays are packed in bits, so they are
+#      always read from the Decorated data
+###################################################
+raw_datatypes = ['SINT', 'INT', 'DINT', 'REAL', 'LINT',
+                 'USINT', 'UINT', 'UDINT', 'LREAL', 'ULINT']
+
+####################################################
+#
+# DECODE A RAW HEX DATA BLOCK INTO A TYPED BUFFER
+# obs: the raw block is little-endian and may be
+#      padded. Returns None if it is too short
+###################################################
+def decode_raw(datatype, length, text):
+    elements = array(atomic_typecodes[datatype])
+    size = length * elements.itemsize
+    try:
+        data = bytes.fromhex(text or '')
+    except ValueError:
+        return None
+    if len(data) < size:
+        return None
+    elements.frombytes(data[:size])
+    if sys.byteorder == 'big':
+        elements.byteswap()
+    return elements
+
+####################################################
+#
+# ADD A NODE TO A HASHLIB DIGEST
+# obs: walks the node once. Atomic arrays are hashed
+#      as raw bytes
+###################################################
+def update_digest(digest, node):
+    if node is None:
+        digest.update(b'N')
+    elif isinstance(node, ValueNode):
+        digest.update(('V%s=%r;' % (node.type, node.value)).encode('utf-8'))
+    elif isinstance(node, ArrayNode):
+        digest.update(('A%s%r' % (node.type, node.dimensions)).encode('utf-8'))
+        if isinstance(node.elements, array):
+            digest.update(node.elements.typecode.encode('utf-8'))
+            digest.update(node.elements.tobytes())
+        else:
+            for element in node.elements:
+                update_digest(digest, element)
+        digest.update(b';')
+    elif isinstance(node, StructNode):
+        digest.update(('S%s{' % (node.type)).encode('utf-8'))
+        for name in node.members:
+            digest.update(('%s:' % (name)).encode('utf-8'))
+            update_digest(digest, node.members[name])
+        digest.update(b'}')
@@ -27,12 +27,18 @@
 #
 ################################################################################
 import os
+import sys
+import json
+import time
 import logging
 import argparse
 from string import Template
-from runglex import tokens
-from runglex import runglex
-from rungyacc import rungyacc
+from rungyacc import get_translator
+from rungyacc import codegens
+import l5x2c
+from l5x2c import stack_models, stack_sizes, templates_digest
+from cbmcrunner import cbmc_command, cbmc_version, run_harnesses, verification_summary
+from verifycache import VerificationCache
 
 test_cases = [
     {
@@ -116,6 +122,7 @@ test_cases = [
     },
     {
         "rung" : "XIC(a)TON(t,?,?);",
+        "unwind" : 11,
         "template" : 
 '''
     bool a;
@@ -161,6 +168,7 @@ test_cases = [
     },
     {
         "rung" : "XIC(a)TOF(t,?,?);",
+        "unwind" : 11,
         "template" : 
 '''
     bool a;
@@ -210,16 +218,117 @@ test_cases = [
 ####################################################
 #
 # ADD TEMPLATES TO THE GENERATED FILE
-#
+# obs: the model of l5x2c and the nondet functions
+#      of cbmc
 ###################################################
 def addTemplates(f, parameters):
-    with open('plcmodel.template', 'r') as t:
-        text = t.read()
-        template = Template(text)
-        f.write(template.substitute(parameters))
-        f.write('int nondet_int(){ int x; return x; }\n')
-        f.write('bool nondet_bool(){ bool x; return x; }\n\n')
-        f.write('void assume (bool e) { while (!e) ; }\n\n')
+    l5x2c.addTemplates(f, parameters)
+    f.write('int nondet_int(){ int x; return x; }\n')
+    f.write('bool nondet_bool(){ bool x; return x; }\n\n')
+    f.write('void assume (bool e) { while (!e) ; }\n\n')
+
+####################################################
+#
+# ADD ONE TEST CASE TO THE GENERATED FILE
+#
+###################################################
+def addTest(f, number, case, rung):
+    f.write('void test_%d() {\n' % (number))
+    template = Template(case['template'])
+    f.write(template.substitute({'rung': rung}))
+    f.write('}\n\n')
+
+####################################################
+#
+# ADD THE MAIN FUNCTION THAT RUNS THE TESTS
+#
+###################################################
+def addMain(f, numbers):
+    f.write('int main() {\n')
+    for number in numbers:
+        f.write('    test_%d();\n' % (number))
+    f.write('}\n')
+
+####################################################
+#
+# WRITE THE TESTS
+# obs: every test goes to tests/tests.c and to a
+#      harness of its own, tests/test_<n>.c, so cbmc
+#      can verify the tests independently. Returns
+#      the number and harness path of each test
+###################################################
+def write_tests(translator, parameters, directory='tests'):
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    tests = []
+    with open(os.path.join(directory, 'tests.c'), 'w') as f:
+        addTemplates(f,parameters)
+        for i in range(0,len(test_cases)):
+            try:
+                rung = translator.translate(test_cases[i]['rung'])
+            except SyntaxError:
+                continue
+            addTest(f, i+1, test_cases[i], rung)
+            path = os.path.join(directory, 'test_%d.c' % (i+1))
+            with open(path, 'w') as harness:
+                addTemplates(harness, parameters)
+                addTest(harness, i+1, test_cases[i], rung)
+                addMain(harness, [i+1])
+            tests.append((i+1, path))
+        addMain(f, [number for number, path in tests])
+    return tests
+
+####################################################
+#
+# VERIFY THE HARNESSES WITH CBMC
+# obs: a test case can set its own unwind bound,
+#      which --unwind overrides. Harnesses with a
+#      cached verdict are not verified again
+###################################################
+def verify_tests(tests, args, parameters):
+    cache = None
+    if not args['no_cache']:
+        cache = VerificationCache(args['cache_file'])
+        dropped = cache.evict(args['cache_max_age'] and args['cache_max_age'] * 86400,
+                              args['cache_max_size'] and args['cache_max_size'] << 20)
+        if dropped > 0:
+            print('Verification cache: %d verdicts evicted' % (dropped), file=sys.stderr)
+        version = cbmc_version(args['cbmc'])
+        templates = templates_digest(parameters)
+    
+    start = time.perf_counter()
+    results = [None] * len(tests)
+    tasks = []
+    keys = []
+    for index, (number, path) in enumerate(tests):
+        unwind = args['unwind'] or test_cases[number-1].get('unwind')
+        command = cbmc_command(args['cbmc'], path, unwind)
+        if cache is not None:
+            with open(path, 'r') as f:
+                key = cache.key(f.read(), templates, command, version)
+            results[index] = cache.get(key)
+            if results[index] is not None:
+                continue
+            keys.append(key)
+        tasks.append(('test_%d' % (number), command, args['timeout']))
+    
+    pending = [index for index in range(len(results)) if results[index] is None]
+    for index, result in zip(pending, run_harnesses(tasks, args['jobs'])):
+        results[index] = result
+    wall = time.perf_counter() - start
+    
+    if cache is not None:
+        for index, key in zip(pending, keys):
+            cache.put(key, results[index])
+        print(cache.report(), file=sys.stderr)
+        cache.close()
+    
+    print(verification_summary(results, wall))
+    if args['report']:
+        with open(args['report'], 'w') as f:
+            json.dump({'wall_time': wall, 'results': results}, f, indent=2)
+    return all(result['verdict'] == 'pass' for result in results)
 
 ####################################################
 #
@@ -230,48 +339,57 @@ def main():
     description = "Generate tests for the runglex and rungyacc files"
     parser = argparse.ArgumentParser(description=description)
 
-    parser.add_argument('-ss', '--stack_size', type=int, default=1000,
-                            help="Stack size for the stack machine")
+    parser.add_argument('-ss', '--stack_size', type=int, default=None,
+                            help="Stack size for the stack machine (default: 1000 for "
+                                 "the array and 63 for the bit stack)")
     parser.add_argument('-st', '--scan_time', type=int, default=100,
                             help="Scan time for the PLC model")
+    parser.add_argument('-O', '--optimize', action='store_true',
+                            help="test the optimized code")
+    parser.add_argument('--codegen', choices=codegens, default='stack',
+                            help="test stack machine calls or plain C expressions")
+    parser.add_argument('--stack-model', choices=sorted(stack_models), default='array',
+                            help="test the stack machine on an array or on a bit register")
+    parser.add_argument('--run', action='store_true',
+                            help="verify each test harness with cbmc")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                            help="number of cbmc processes (default: one per core)")
+    parser.add_argument('--timeout', type=float, default=None, metavar='SECONDS',
+                            help="time limit of each cbmc run")
+    parser.add_argument('--unwind', type=int, default=None,
+                            help="unwind bound of every test, instead of their own")
+    parser.add_argument('--cbmc', default='cbmc',
+                            help="cbmc executable")
+    parser.add_argument('--cache-file', default=os.path.join('tests', 'verdicts.db'),
+                            help="sqlite file with the cached cbmc verdicts")
+    parser.add_argument('--no-cache', action='store_true',
+                            help="verify every harness again and do not cache the verdicts")
+    parser.add_argument('--cache-max-age', type=float, default=None, metavar='DAYS',
+                            help="evict the verdicts not used for DAYS days")
+    parser.add_argument('--cache-max-size', type=int, default=None, metavar='MB',
+                            help="evict the least recently used verdicts above MB megabytes")
+    parser.add_argument('--report', metavar='JSON',
+                            help="save the verdict and times of each test")
     
     args = vars(parser.parse_args())
     
     parameters = {
-        'stack_size': args['stack_size'],
-        'scan_time': args['scan_time']
+        'stack_size': args['stack_size'] or stack_sizes[args['stack_model']],
+        'scan_time': args['scan_time'],
+        'codegen': args['codegen'],
+        'stack_model': args['stack_model']
     }
     
     # supress syntax error messages
     logger = logging.getLogger('l5x2c')
     logger.setLevel(logging.CRITICAL)
     
-    # build the lexer
-    lexer = runglex()
-    # Build the parser
-    rungparser = rungyacc()
+    translator = get_translator(args['optimize'], args['codegen'])
     
-    if not os.path.exists('tests'):
-        os.makedirs('tests')
+    tests = write_tests(translator, parameters)
     
-    with open('tests/tests.c', 'w') as f:
-        addTemplates(f,parameters)
-        tests = []
-        for i in range(0,len(test_cases)):
-            try:
-                rung = rungparser.parse(test_cases[i]['rung'])
-                f.write('void test_%d() {\n' % (i+1))
-                template = Template(test_cases[i]['template'])
-                f.write(template.substitute({'rung': rung}))            
-                f.write('}\n\n')
-                tests.append(i)
-            except SyntaxError:
-                pass
-        
-        f.write('int main() {\n')
-        for test in tests:
-            f.write('    test_%d();\n' % (test+1))
-        f.write('}\n')
+    if args['run'] and not verify_tests(tests, args, parameters):
+        sys.exit(1)
     
 if __name__== "__main__":
     main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import sys
+import time
+import subprocess
+
+####################################################
+#
+# STAND-IN FOR CBMC
+# obs: the verdict is read from a comment of the
+#      harness: "// fakecbmc: pass 0.25", "fail 0.5"
+#      or "hang". A hanging run starts a child that
+#      sleeps too, and writes its pid to <harness>.pid
+#      so the tests can check that it was killed
+###################################################
+def main():
+    if '--version' in sys.argv:
+        print('5.11 (fakecbmc)')
+        return 0
+    path = sys.argv[1]
+    with open(path) as f:
+        words = f.read().split('// fakecbmc:')[1].split()
+    if words[0] == 'hang':
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        with open(path + '.pid', 'w') as f:
+            f.write(str(child.pid))
+        time.sleep(60)
+        return 6
+    print('Runtime decision procedure: %ss' % (words[1]))
+    if words[0] == 'fail':
+        print('Counterexample:')
+        print('  a=1')
+        print('VERIFICATION FAILED')
+        return 10
+    print('VERIFICATION SUCCESSFUL')
+    return 0
+
+if __name__== "__main__":
+    sys.exit(main())
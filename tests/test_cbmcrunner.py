@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import sys
+import time
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from cbmcrunner import cbmc_command
+from cbmcrunner import cbmc_version
+from cbmcrunner import run_harnesses
+from cbmcrunner import verification_summary
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="fakecbmc.py is a script")
+
+fakecbmc = os.path.join(root, 'tests', 'fakecbmc.py')
+
+####################################################
+#
+# HARNESS WITH THE VERDICT OF THE FAKE CBMC
+#
+###################################################
+def harness(tmp_path, name, verdict):
+    path = tmp_path / (name + '.c')
+    path.write_text('// fakecbmc: %s\nint main() {return 0;}\n' % (verdict))
+    return str(path)
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open('/proc/%d/stat' % (pid)) as f:
+            return f.read().split(')')[-1].split()[0] != 'Z'
+    except OSError:
+        return True
+
+@pytest.fixture(scope='module')
+def results(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('harnesses')
+    tasks = [(name, cbmc_command(fakecbmc, harness(tmp_path, name, verdict)), 2)
+             for name, verdict in [('test_1', 'pass 0.25'), ('test_2', 'fail 0.5'),
+                                   ('test_3', 'hang')]]
+    start = time.perf_counter()
+    results = run_harnesses(tasks, jobs=3)
+    return results, time.perf_counter() - start, tmp_path
+
+def test_verdicts(results):
+    results, wall, tmp_path = results
+    assert [result['test'] for result in results] == ['test_1', 'test_2', 'test_3']
+    assert [result['verdict'] for result in results] == ['pass', 'fail', 'timeout']
+    assert results[0]['trace'] is None
+    assert 'Counterexample' in results[1]['trace']
+
+def test_solver_time(results):
+    results, wall, tmp_path = results
+    assert [result['solver_time'] for result in results] == [0.25, 0.5, None]
+
+def test_timeout_kills_the_session(results):
+    results, wall, tmp_path = results
+    assert wall < 30
+    with open(str(tmp_path / 'test_3.c.pid')) as f:
+        pid = int(f.read())
+    deadline = time.time() + 5
+    while alive(pid) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not alive(pid)
+
+def test_summary(results):
+    results, wall, tmp_path = results
+    lines = verification_summary(results, wall).splitlines()
+    assert lines[1].split()[:2] == ['test_1', 'pass'] and lines[1].endswith('0.25s')
+    assert lines[2].split()[:2] == ['test_2', 'fail'] and lines[2].endswith('0.50s')
+    assert lines[3].split()[:2] == ['test_3', 'timeout'] and lines[3].endswith('-')
+    assert lines[4].endswith('1 fail, 1 pass, 1 timeout')
+
+def test_version():
+    assert cbmc_version(fakecbmc) == '5.11 (fakecbmc)'
@@ -0,0 +1,77 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import os
+import sys
+import subprocess
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from l5xparser import L5XProject
+from l5xparser import SelectionError
+
+example = os.path.join(root, 'examples', 'ex1.L5X')
+
+####################################################
+#
+# RUN l5x2c.py ON THE EXAMPLE WITH A FILTER
+#
+###################################################
+def translate(tmp_path, *options):
+    output = tmp_path / 'out.c'
+    process = subprocess.run([sys.executable, os.path.join(root, 'l5x2c.py'),
+                              example, str(output)] + list(options),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    return process, output
+
+def test_known_filters():
+    l5x_data = L5XProject(example).parse(['MainProgram'], ['MainRoutine'])
+    assert list(l5x_data['programs']['MainProgram']['routines']) == ['MainRoutine']
+
+def test_unknown_program():
+    with pytest.raises(SelectionError, match='Program Nope not found'):
+        L5XProject(example).parse(['Nope'])
+
+def test_unknown_routine():
+    with pytest.raises(SelectionError, match='Routine Nope not found'):
+        L5XProject(example).parse(None, ['Nope'])
+
+def test_unknown_routine_of_the_selected_programs():
+    with pytest.raises(SelectionError, match='Routine Nope not found'):
+        L5XProject(example).parse(['MainProgram'], ['MainRoutine', 'Nope'])
+
+@pytest.mark.parametrize('option', ['-p', '-r'])
+def test_unknown_filter_exits(tmp_path, option):
+    process, output = translate(tmp_path, option, 'Nope')
+    assert process.returncode == 1
+    assert 'Nope not found' in process.stderr
+    assert 'Traceback' not in process.stderr
+    assert not output.exists()
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import heapq
+import logging
+
+####################################################
+#
+# DEPENDENCY GRAPH OF THE DATATYPES OF AN EXPORT
+# obs: a type depends on the types of its members,
+#      which C needs complete before the typedef, and
+#      on the types in its Dependencies, which only
+#      fix the order. builtin are the types that are
+#      not defined by the export
+###################################################
+class TypeGraph():
+    def __init__(self, datatypes, builtin=()):
+        self.names = list(datatypes)
+        self.position = dict((name, i) for i, name in enumerate(self.names))
+        self.members = {}
+        self.dependencies = {}
+        self.missing = {}
+        self.cycles = []
+        for name in self.names:
+            datatype = datatypes[name]
+            members = set()
+            for member in datatype.get('members', {}).values():
+                members.add(member['type'])
+            dependencies = members | set(datatype.get('dependencies', {}))
+            self.members[name] = self.known(members)
+            self.dependencies[name] = self.known(dependencies)
+            missing = sorted(dependency for dependency in dependencies
+                             if dependency not in self.position and dependency not in builtin)
+            if len(missing) > 0:
+                self.missing[name] = missing
+                logging.warning("DataType %s uses %s, which is not in the export" %
+                                (name, ', '.join(missing)))
+
+    def known(self, names):
+        return sorted((name for name in names if name in self.position),
+                      key=self.position.get)
+
+    ####################################################
+    #
+    # TYPES NEEDED BY SOME TYPES
+    # obs: roots and everything they depend on
+    ###################################################
+    def closure(self, roots):
+        needed = set()
+        pending = [root for root in roots if root in self.position]
+        while len(pending) > 0:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.dependencies[name])
+        return needed
+
+    ####################################################
+    #
+    # ORDER THE TYPES BEFORE THE TYPES THAT USE THEM
+    # obs: Kahn's algorithm, always taking the first
+    #      ready type of the export, so the order only
+    #      changes when the dependencies change. On a
+    #      cycle the Dependencies are dropped and, if
+    #      the members still form a cycle, the types are
+    #      left in export order and reported. roots
+    #      limits the types to closure(roots)
+    ###################################################
+    def order(self, roots=None):
+        names = self.names
+        if roots is not None:
+            needed = self.closure(roots)
+            names = [name for name in names if name in needed]
+        self.cycles = []
+        
+        ordered = self.sort(names, self.dependencies)
+        if len(ordered) < len(names):
+            left = self.left(names, ordered)
+            self.report(left, self.dependencies, logging.warning,
+                        "DataType dependency cycle %s. Only the member types are ordered")
+            ordered += self.sort(left, self.members, set(ordered))
+            if len(ordered) < len(names):
+                left = self.left(names, ordered)
+                self.report(left, self.members, logging.error,
+                            "DataType member cycle %s can not be declared in C")
+                ordered += left
+        return ordered
+
+    def sort(self, names, edges, done=()):
+        waiting = {}
+        users = {}
+        ready = []
+        for name in names:
+            count = 0
+            for dependency in edges[name]:
+                if dependency not in done:
+                    users.setdefault(dependency, []).append(name)
+                    count += 1
+            waiting[name] = count
+            if count == 0:
+                heapq.heappush(ready, (self.position[name], name))
+        
+        ordered = []
+        while len(ready) > 0:
+            name = heapq.heappop(ready)[1]
+            ordered.append(name)
+            for user in users.get(name, []):
+                waiting[user] -= 1
+                if waiting[user] == 0:
+                    heapq.heappush(ready, (self.position[user], user))
+        return ordered
+
+    def left(self, names, ordered):
+        done = set(ordered)
+        return [name for name in names if name not in done]
+
+    ####################################################
+    #
+    # REPORT THE CYCLES AMONG THE TYPES LEFT
+    # obs: follows the first dependency left of each
+    #      type until a type repeats
+    ###################################################
+    def report(self, left, edges, log, message):
+        remaining = set(left)
+        for start in left:
+            if start not in remaining:
+                continue
+            path = []
+            seen = {}
+            name = start
+            while name in remaining and name not in seen:
+                seen[name] = len(path)
+                path.append(name)
+                name = next((dependency for dependency in edges[name]
+                             if dependency in remaining), None)
+            if name in seen:
+                cycle = path[seen[name]:] + [name]
+                self.cycles.append(cycle)
+                log(message % (' -> '.join(cycle)))
+            remaining.difference_update(path)
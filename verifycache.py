@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2019 Alair Dias Junior
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# This file is part of l5x2c. To know more about it, acccess:
+#    https://github.com/alairjunior/l5x2c
+#
+################################################################################
+import time
+import json
+import sqlite3
+import hashlib
+
+####################################################
+#
+# CACHE OF CBMC VERDICTS
+# obs: a verdict is keyed by the harness, the model
+#      templates, the cbmc command line and the cbmc
+#      version, so it is reused until one of them
+#      changes. Only passes and failures are stored,
+#      as timeouts and errors depend on the machine
+###################################################
+class VerificationCache():
+    cached_verdicts = ('pass', 'fail')
+
+    def __init__(self, path):
+        self.hits = 0
+        self.misses = 0
+        self.store = sqlite3.connect(path)
+        self.store.execute('CREATE TABLE IF NOT EXISTS verdicts '
+                           '(key TEXT PRIMARY KEY, result TEXT, size INTEGER, used REAL)')
+
+    ####################################################
+    #
+    # KEY OF A HARNESS
+    # obs: the harness path is left out of the command
+    #      line, as the harness text is already hashed
+    ###################################################
+    def key(self, harness, templates, command, version):
+        digest = hashlib.sha256()
+        for part in [harness, templates, command[0]] + command[2:] + [version]:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        row = self.store.execute('SELECT result FROM verdicts WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.store.execute('UPDATE verdicts SET used = ? WHERE key = ?', (time.time(), key))
+        result = json.loads(row[0])
+        result['cached'] = True
+        return result
+
+    def put(self, key, result):
+        if result['verdict'] not in self.cached_verdicts:
+            return
+        text = json.dumps(result)
+        self.store.execute('INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)',
+                           (key, text, len(text), time.time()))
+
+    ####################################################
+    #
+    # EVICT OLD VERDICTS
+    # obs: drops the verdicts not used for max_age
+    #      seconds and then the least recently used
+    #      ones until the cache fits in max_size bytes.
+    #      Returns the number of verdicts dropped
+    ###################################################
+    def evict(self, max_age=None, max_size=None):
+        dropped = 0
+        if max_age is not None:
+            cursor = self.store.execute('DELETE FROM verdicts WHERE used < ?',
+                                        (time.time() - max_age,))
+            dropped += cursor.rowcount
+        if max_size is not None:
+            total = self.store.execute('SELECT COALESCE(SUM(size), 0) FROM verdicts').fetchone()[0]
+            rows = self.store.execute('SELECT key, size FROM verdicts ORDER BY used').fetchall()
+            for key, size in rows:
+                if total <= max_size:
+                    break
+                self.store.execute('DELETE FROM verdicts WHERE key = ?', (key,))
+                total -= size
+                dropped += 1
+        return dropped
+
+    def close(self):
+        if self.store is not None:
+            self.store.commit()
+            self.store.close()
+            self.store = None
+
+    def report(self):
+        return 'Verification cache: %d hits, %d misses' % (self.hits, self.misses)